@@ -0,0 +1,29 @@
+import logging
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from app.api.v1.schemas.query_stats_schema import QueryStatsReport
+from app.db.session import query_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin")
+
+
+@router.get("/queries", response_model=QueryStatsReport, tags=["Admin"])
+async def slowest_queries(
+    limit: int = Query(10, ge=1, le=100),
+    order_by: Literal["mean_ms", "p95_ms", "p99_ms", "max_ms", "total_ms"] = "mean_ms",
+):
+    """Top-N SQL statements by latency since startup (or the last reset)."""
+    return {
+        "slow_query_ms": query_stats.slow_ms,
+        "statements": query_stats.slowest(limit, order_by),
+    }
+
+
+@router.delete("/queries", tags=["Admin"], status_code=204)
+async def reset_query_stats():
+    logger.info("Resetting query stats")
+    query_stats.reset()
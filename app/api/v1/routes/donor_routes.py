@@ -1,6 +1,9 @@
+import datetime
 import logging
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 # from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,17 +15,44 @@ from app.api.v1.schemas import (
     DonorCreate,
     DonorOut,
     DonorUpdate,
+    MatchRequest,
+    MatchResponse,
 )
-from app.api.v1.schemas.common import PaginatedResponse
-from app.db.session import get_db
+from app.api.v1.schemas.common import (
+    BatchDeleteRequest,
+    BatchDeleteResult,
+    BulkImportResult,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+)
+from app.api.v1.schemas.donor_schema import VALID_BLOOD_GROUPS
+from app.core.etag import etag_matches, make_etag
+from app.core.serialization import ORJSONResponse, dump_json
+from app.db.session import get_db, get_read_db
 from app.service import (
+    EXPORT_MEDIA_TYPES,
+    batch_delete_donations,
+    batch_delete_donors,
+    bulk_create_donors,
     create_donation,
     create_donor,
     delete_donation,
     delete_donor,
-    get_all_donors,
-    get_donor,
+    donor_field_names,
+    export_donations,
+    export_donors,
+    find_matching_donors,
+    get_cached_donor_count,
+    get_donation_page,
+    get_donor_out,
+    get_donor_page_rows,
+    get_donor_page_versions,
+    get_donor_version,
+    get_donors_by_ids,
+    get_eligible_donors,
     get_total_donor_count,
+    iter_lines,
     update_donation,
     update_donor,
 )
@@ -31,6 +61,8 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_MULTI_GET_IDS = 500
+
 
 # --- Donor Routes ---
 @router.post("/donors", response_model=DonorOut, tags=["Donors"], status_code=201)
@@ -39,29 +71,244 @@ async def create_donor_route(donor: DonorCreate, db: AsyncSession = Depends(get_
     return await create_donor(db, donor)
 
 
+@router.post("/donors:bulk", response_model=BulkImportResult, tags=["Donors"])
+async def bulk_import_donors_route(
+    request: Request, db: AsyncSession = Depends(get_db)
+):
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        fmt = "csv"
+    elif "ndjson" in content_type or "jsonl" in content_type:
+        fmt = "ndjson"
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Bulk import expects application/x-ndjson or text/csv",
+        )
+    logger.info(f"POST /donors:bulk ({fmt})")
+    return await bulk_create_donors(db, iter_lines(request.stream()), fmt=fmt)
+
+
 @router.get("/donors", response_model=PaginatedResponse[DonorOut], tags=["Donors"])
 async def list_donors(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor from a previous page; takes precedence over skip",
+    ),
+    total_mode: Literal["exact", "cached", "none"] = Query(
+        "exact",
+        description="exact counts every call, cached may be a few seconds stale, "
+        "none skips the count and returns total=null",
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description=f"Comma-separated donor ids (at most {MAX_MULTI_GET_IDS}); "
+        "returns those donors in the given order instead of a page",
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated DonorOut fields to return, e.g. "
+        "id,name,blood_group; only those columns are read",
+    ),
+    include: Optional[Literal["donations"]] = Query(
+        None, description="donations embeds each donor's donations, newest first"
+    ),
 ):
-    logger.info(f"GET /donors?skip={skip}&limit={limit}")
-    donors = await get_all_donors(db, skip=skip, limit=limit)
-    total = await get_total_donor_count(db)
+    if ids is not None:
+        return await _multi_get_donors(request, response, db, ids)
+    logger.info(
+        f"GET /donors?skip={skip}&limit={limit}&cursor={cursor}&total_mode={total_mode}"
+        f"&fields={fields}&include={include}"
+    )
+    requested = None
+    if fields is not None:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        try:
+            donor_field_names(requested)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    include_donations = include == "donations"
+    variant = (fields, include)
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = int(decode_cursor(cursor)["id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Invalid cursor: {cursor}")
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    total = None
+    if total_mode == "exact":
+        total = await get_total_donor_count(db)
+    elif total_mode == "cached":
+        total = await get_cached_donor_count(db)
+
+    # Both paths fetch one extra row to learn whether another page exists
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and not include_donations:
+        versions = await get_donor_page_versions(
+            db, skip=skip, limit=limit + 1, after_id=after_id
+        )
+        etag = _page_etag(total, versions, variant)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    rows = await get_donor_page_rows(
+        db,
+        skip=skip,
+        limit=limit + 1,
+        after_id=after_id,
+        fields=requested,
+        include_donations=include_donations,
+    )
+    versions = [(row["id"], row["version"]) for row in rows]
+    if include_donations:
+        # Donation edits do not bump the donor's version, so hash them too
+        versions += [
+            (f"d{d['id']}", d["version"]) for row in rows for d in row["donations"]
+        ]
+    etag = _page_etag(total, versions, variant)
+    if if_none_match and include_donations and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"id": rows[-1]["id"]})
+    if requested is not None:
+        keep = [*requested, "donations"]
+        rows = [{key: row[key] for key in keep if key in row} for row in rows]
+    # Rows are DonorOut-shaped already; skip response_model re-validation
+    return ORJSONResponse(
+        {"total": total, "items": rows, "next_cursor": next_cursor},
+        headers={"ETag": etag},
+    )
+
+
+async def _multi_get_donors(
+    request: Request, response: Response, db: AsyncSession, ids: str
+):
+    logger.info(f"GET /donors?ids={ids}")
+    try:
+        donor_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated ints")
+    if not donor_ids or len(donor_ids) > MAX_MULTI_GET_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"ids must list 1 to {MAX_MULTI_GET_IDS} donors"
+        )
+
+    donors = await get_donors_by_ids(db, donor_ids, read_only=True)
+    etag = _page_etag(None, [(donor.id, donor.version) for donor in donors])
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    donors_out = [
+        DonorOut.model_validate(donor, from_attributes=True) for donor in donors
+    ]
+    return PaginatedResponse[DonorOut](total=len(donors_out), items=donors_out)
+
+
+def _page_etag(total, versions, variant=()) -> str:
+    # versions includes the look-ahead row, so next_cursor is covered too;
+    # variant keeps differently shaped responses (fields, include) apart
+    return make_etag(
+        total, *variant, *(f"{id_}:{version}" for id_, version in versions)
+    )
+
+
+# Registered before /donors/{donor_id} so "export" is not parsed as an id
+@router.get("/donors/export", tags=["Donors"])
+async def export_donors_route(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(f"GET /donors/export?format={fmt}")
+    return StreamingResponse(
+        export_donors(db, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="donors.{fmt}"'},
+    )
+
+
+@router.get(
+    "/donors/eligible", response_model=PaginatedResponse[DonorOut], tags=["Donors"]
+)
+async def list_eligible_donors(
+    db: AsyncSession = Depends(get_db),
+    blood_group: str = Query(..., description="Blood group, e.g. O- (send + as %2B)"),
+    limit: int = Query(10, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page"),
+    as_of: Optional[datetime.date] = Query(
+        None, description="Date to check eligibility for; defaults to today"
+    ),
+):
+    # An unencoded "+" arrives as a space
+    blood_group = blood_group.replace(" ", "+")
+    logger.info(f"GET /donors/eligible?blood_group={blood_group}&cursor={cursor}")
+    if blood_group not in VALID_BLOOD_GROUPS:
+        raise HTTPException(
+            status_code=422, detail=f"Invalid blood group: {blood_group}"
+        )
+    after_last_donated, after_id = None, None
+    if cursor is not None:
+        try:
+            values = decode_cursor(cursor)
+            after_id = int(values["id"])
+            if values["last_donated"] is not None:
+                after_last_donated = datetime.date.fromisoformat(values["last_donated"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Invalid cursor: {cursor}")
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    donors = await get_eligible_donors(
+        db,
+        blood_group,
+        limit=limit + 1,
+        after_last_donated=after_last_donated,
+        after_id=after_id,
+        as_of=as_of,
+    )
+    next_cursor = None
+    if len(donors) > limit:
+        donors = donors[:limit]
+        last = donors[-1]
+        next_cursor = encode_cursor({"last_donated": last.last_donated, "id": last.id})
     donors_out = [
         DonorOut.model_validate(donor, from_attributes=True) for donor in donors
     ]
-    return PaginatedResponse[DonorOut](total=total, items=donors_out)
+    return PaginatedResponse[DonorOut](
+        total=None, items=donors_out, next_cursor=next_cursor
+    )
 
 
 @router.get("/donors/{donor_id}", response_model=DonorOut, tags=["Donors"])
-async def get_donor_by_id(donor_id: int, db: AsyncSession = Depends(get_db)):
+async def get_donor_by_id(
+    donor_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
     logger.info(f"GET /donors/{donor_id}")
-    donor = await get_donor(db, donor_id)
-    if donor is None:
-        logger.warning(f"Donor ID {donor_id} not found")
-        raise HTTPException(status_code=404, detail="Donor not found")
-    return donor
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await get_donor_version(db, donor_id)
+        etag = make_etag(donor_id, version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    donor = await get_donor_out(db, donor_id)
+    # Already a validated DonorOut; encode it without a second validation pass
+    return Response(
+        dump_json(DonorOut, donor),
+        media_type="application/json",
+        headers={"ETag": make_etag(donor.id, donor.version)},
+    )
 
 
 @router.put("/donors/{donor_id}", response_model=DonorOut, tags=["Donors"])
@@ -77,7 +324,69 @@ async def delete_donor_route(donor_id: int, db: AsyncSession = Depends(get_db)):
     return None  # 204: No Content
 
 
+@router.post("/donors:batchDelete", response_model=BatchDeleteResult, tags=["Donors"])
+async def batch_delete_donors_route(
+    batch: BatchDeleteRequest, db: AsyncSession = Depends(get_db)
+):
+    logger.info(f"POST /donors:batchDelete ({len(batch.ids)} ids)")
+    return await batch_delete_donors(db, batch.ids)
+
+
 # --- Donation Routes ---
+@router.get(
+    "/donors/{donor_id}/donations",
+    response_model=PaginatedResponse[DonationOut],
+    tags=["Donations"],
+)
+async def list_donor_donations(
+    donor_id: int,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(10, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page"),
+    date_from: Optional[datetime.date] = Query(
+        None, description="Only donations on or after this date"
+    ),
+    date_to: Optional[datetime.date] = Query(
+        None, description="Only donations on or before this date"
+    ),
+):
+    logger.info(f"GET /donors/{donor_id}/donations?cursor={cursor}")
+    after_date, after_id = None, None
+    if cursor is not None:
+        try:
+            values = decode_cursor(cursor)
+            after_date = datetime.date.fromisoformat(values["date"])
+            after_id = int(values["id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Invalid cursor: {cursor}")
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    donations = await get_donation_page(
+        db,
+        donor_id,
+        limit=limit + 1,
+        after_date=after_date,
+        after_id=after_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    if not donations and cursor is None:
+        # Tell "no donations" apart from "no such donor"; raises 404
+        await get_donor_version(db, donor_id)
+    next_cursor = None
+    if len(donations) > limit:
+        donations = donations[:limit]
+        last = donations[-1]
+        next_cursor = encode_cursor({"date": last.date, "id": last.id})
+    donations_out = [
+        DonationOut.model_validate(donation, from_attributes=True)
+        for donation in donations
+    ]
+    return PaginatedResponse[DonationOut](
+        total=None, items=donations_out, next_cursor=next_cursor
+    )
+
+
 @router.post(
     "/donors/{donor_id}/donations",
     response_model=DonationOut,
@@ -91,6 +400,19 @@ async def create_donation_route(
     return await create_donation(db, donor_id, donation)
 
 
+@router.get("/donations/export", tags=["Donations"])
+async def export_donations_route(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(f"GET /donations/export?format={fmt}")
+    return StreamingResponse(
+        export_donations(db, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="donations.{fmt}"'},
+    )
+
+
 @router.put("/donations/{donation_id}", response_model=DonationOut, tags=["Donations"])
 async def update_donation_route(
     donation_id: int, donation: DonationUpdate, db: AsyncSession = Depends(get_db)
@@ -102,3 +424,29 @@ async def update_donation_route(
 async def delete_donation_route(donation_id: int, db: AsyncSession = Depends(get_db)):
     await delete_donation(db, donation_id)
     return None
+
+
+@router.post(
+    "/donations:batchDelete", response_model=BatchDeleteResult, tags=["Donations"]
+)
+async def batch_delete_donations_route(
+    batch: BatchDeleteRequest, db: AsyncSession = Depends(get_db)
+):
+    logger.info(f"POST /donations:batchDelete ({len(batch.ids)} ids)")
+    return await batch_delete_donations(db, batch.ids)
+
+
+# --- Matching Routes ---
+@router.post("/matches", response_model=MatchResponse, tags=["Matching"])
+async def match_donors_route(
+    match: MatchRequest, db: AsyncSession = Depends(get_read_db)
+):
+    logger.info(f"POST /matches for {match.units} units of {match.blood_group}")
+    donors = await find_matching_donors(
+        db, match.blood_group, match.units, as_of=match.as_of
+    )
+    return MatchResponse(
+        blood_group=match.blood_group,
+        units=match.units,
+        donors=[DonorOut.model_validate(d, from_attributes=True) for d in donors],
+    )
@@ -6,3 +6,4 @@ from app.api.v1.schemas.donor_schema import (
     DonorOut,
     DonorUpdate,
 )
+from app.api.v1.schemas.match_schema import MatchRequest, MatchResponse
@@ -1,11 +1,58 @@
-from typing import Generic, List, TypeVar
+import base64
+import json
+from typing import Generic, List, Literal, Optional, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic.generics import GenericModel
 
 T = TypeVar("T")
 
 
 class PaginatedResponse(GenericModel, Generic[T]):
-    total: int
+    total: Optional[int]
     items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class BulkRowError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class BulkImportResult(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[BulkRowError] = []
+    # True once more rows failed than the report keeps
+    errors_truncated: bool = False
+
+
+class BatchDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=100_000)
+
+
+class BatchDeleteItem(BaseModel):
+    id: int
+    status: Literal["deleted", "not_found", "has_donations"]
+
+
+class BatchDeleteResult(BaseModel):
+    deleted: int
+    results: List[BatchDeleteItem]
+
+
+def encode_cursor(values: dict) -> str:
+    """Pack the keyset of the last row on a page into an opaque token."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Inverse of encode_cursor. Raises ValueError for anything malformed."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    # binascii.Error, UnicodeDecodeError and JSONDecodeError are all ValueErrors
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, dict):
+        raise ValueError("Cursor must decode to an object")
+    return values
@@ -8,6 +8,19 @@ from pydantic import BaseModel, Field, constr, field_validator, model_validator
 VALID_BLOOD_GROUPS = {"A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"}
 
 
+class OptimisticLock(BaseModel):
+    # Send back the version you read. updated_at is the older lock token and
+    # is still honoured, but it only has one-second resolution.
+    version: Optional[int] = None
+    updated_at: Optional[datetime.datetime] = None
+
+    @model_validator(mode="after")
+    def require_lock_token(self):
+        if self.version is None and self.updated_at is None:
+            raise ValueError("Either version or updated_at is required")
+        return self
+
+
 class DonorBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=300)
     blood_group: str = Field(
@@ -28,12 +41,13 @@ class DonorCreate(DonorBase):
     pass
 
 
-class DonorUpdate(DonorBase):
-    updated_at: datetime.datetime
+class DonorUpdate(DonorBase, OptimisticLock):
+    pass
 
 
 class DonorOut(DonorBase):
     id: int
+    version: int
     updated_at: datetime.datetime
 
     class Config:
@@ -94,12 +108,13 @@ class DonationCreate(DonationBase):
     pass
 
 
-class DonationUpdate(DonationBase):
-    updated_at: datetime.datetime
+class DonationUpdate(DonationBase, OptimisticLock):
+    pass
 
 
 class DonationOut(DonationBase):
     id: int
+    version: int
     updated_at: datetime.datetime
 
     class Config:
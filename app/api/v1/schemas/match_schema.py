@@ -0,0 +1,27 @@
+import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.api.v1.schemas.donor_schema import VALID_BLOOD_GROUPS, DonorOut
+
+
+class MatchRequest(BaseModel):
+    blood_group: str = Field(..., description="Recipient blood group")
+    units: int = Field(..., ge=1, le=100, description="Number of donors needed")
+    as_of: Optional[datetime.date] = Field(
+        None, description="Date to check donor eligibility for; defaults to today"
+    )
+
+    @field_validator("blood_group")
+    @classmethod
+    def validate_blood_group(cls, val):
+        if val not in VALID_BLOOD_GROUPS:
+            raise ValueError(f"Invalid blood group: {val}")
+        return val
+
+
+class MatchResponse(BaseModel):
+    blood_group: str
+    units: int
+    donors: List[DonorOut]
@@ -0,0 +1,23 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class StatementStatsOut(BaseModel):
+    statement: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    rows: int
+    slow_calls: int
+    histogram: Dict[str, int]
+    plan: Optional[List[str]] = None
+
+
+class QueryStatsReport(BaseModel):
+    slow_query_ms: float
+    statements: List[StatementStatsOut]
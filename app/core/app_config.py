@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,8 +17,64 @@ class AppSettings(BaseSettings):
     app_env: str = Field(default="local", alias="APP_ENV")
     database_url: str = Field(..., alias="DATABASE_URL")
     log_level: str = Field(default="info", alias="LOG_LEVEL")
+    # "sync" writes on the calling thread; "queue" hands records to a
+    # background thread so a slow stderr cannot stall the event loop
+    log_mode: str = Field(default="sync", alias="LOG_MODE")
+    # "text" or "json" (one object per line)
+    log_format: str = Field(default="text", alias="LOG_FORMAT")
+    # Thin out INFO records: keep this fraction, then at most this many per
+    # second per logger (0 = no cap). WARNING and above are never dropped.
+    log_info_sample_rate: float = Field(default=1.0, alias="LOG_INFO_SAMPLE_RATE")
+    log_info_max_per_second: float = Field(default=0.0, alias="LOG_INFO_MAX_PER_SECOND")
+    # Records waiting for the listener thread; extras are dropped, not awaited
+    log_queue_size: int = Field(default=10_000, alias="LOG_QUEUE_SIZE")
     api_prefix: str = Field(default="/api/v1", alias="PREFIX")
 
+    # Seconds a cached donor total may be served before it is recounted
+    donor_count_cache_ttl: float = Field(default=30.0, alias="DONOR_COUNT_CACHE_TTL")
+
+    # Read-through cache for GET /donors/{id}: "memory" (LRU + TTL) or "none"
+    donor_cache_backend: str = Field(default="memory", alias="DONOR_CACHE_BACKEND")
+    donor_cache_max_entries: int = Field(
+        default=10_000, alias="DONOR_CACHE_MAX_ENTRIES"
+    )
+    donor_cache_ttl: float = Field(default=60.0, alias="DONOR_CACHE_TTL")
+
+    # SQLite tuning, applied to every connection the app opens. An empty
+    # string or None leaves SQLite's own default in place.
+    sqlite_journal_mode: str = Field(default="wal", alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="normal", alias="SQLITE_SYNCHRONOUS")
+    # Negative values are KiB, positive values are pages
+    sqlite_cache_size: Optional[int] = Field(default=-65_536, alias="SQLITE_CACHE_SIZE")
+    sqlite_mmap_size: Optional[int] = Field(
+        default=268_435_456, alias="SQLITE_MMAP_SIZE"
+    )
+    sqlite_temp_store: str = Field(default="memory", alias="SQLITE_TEMP_STORE")
+    sqlite_busy_timeout_ms: int = Field(default=30_000, alias="SQLITE_BUSY_TIMEOUT_MS")
+    # Read-only connections (mode=ro) serving GET requests; 0 sends reads
+    # through the writer connection like any other request
+    sqlite_read_pool_size: int = Field(default=4, alias="SQLITE_READ_POOL_SIZE")
+
+    # Statements slower than this are logged with their query plan (0 = off).
+    # SQL_ECHO logs every statement and its parameters; for local debugging.
+    slow_query_ms: float = Field(default=100.0, alias="SLOW_QUERY_MS")
+    query_stats_max_statements: int = Field(
+        default=500, alias="QUERY_STATS_MAX_STATEMENTS"
+    )
+    sql_echo: bool = Field(default=False, alias="SQL_ECHO")
+
+    # Admin endpoints (query stats) expose SQL text; keep them off in production
+    enable_admin_routes: bool = Field(default=False, alias="ENABLE_ADMIN_ROUTES")
+
+    # Group commit for donation creates and updates: one background writer
+    # commits up to max_batch of them at a time, waiting at most max_delay_ms
+    # for a batch to fill
+    donation_write_queue: bool = Field(default=False, alias="DONATION_WRITE_QUEUE")
+    write_queue_max_batch: int = Field(default=256, alias="WRITE_QUEUE_MAX_BATCH")
+    write_queue_max_delay_ms: float = Field(
+        default=2.0, alias="WRITE_QUEUE_MAX_DELAY_MS"
+    )
+
     # OpenTelemetry settings
     enable_otel: bool = Field(default=False, alias="ENABLE_OTEL")
     otel_exporter: str = Field(default="console", alias="OTEL_EXPORTER")
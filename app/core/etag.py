@@ -0,0 +1,17 @@
+import hashlib
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the string form of ``parts``."""
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(), digest_size=16
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check; uses weak comparison as RFC 9110 requires."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
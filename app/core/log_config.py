@@ -1,8 +1,20 @@
+import atexit
+import datetime
 import logging
-import sys
+import logging.handlers
+import queue
+import random
+import time
+from typing import Dict, Optional
+
+import orjson
 
 from app.core.async_context import request_id_var
 
+LOG_FORMAT = (
+    "%(asctime)s [%(levelname)s] %(name)s [request_id=%(request_id)s]: %(message)s"
+)
+
 
 class RequestIdFilter(logging.Filter):
     def filter(self, record):
@@ -10,16 +22,144 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
-def setup_logging(level: str = "INFO"):
-    log_format = (
-        "%(asctime)s [%(levelname)s] %(name)s [request_id=%(request_id)s]: %(message)s"
+class InfoSampler(logging.Filter):
+    """Thin out INFO and lower records; WARNING and above always pass.
+
+    ``sample_rate`` keeps that fraction of records. ``max_per_second`` caps
+    what is left per logger with a token bucket holding one second's worth.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_per_second: float = 0.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self._buckets: Dict[str, list] = {}
+        self.dropped = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.dropped += 1
+            return False
+        if self.max_per_second > 0 and not self._take_token(record.name):
+            self.dropped += 1
+            return False
+        return True
+
+    def _take_token(self, name: str) -> bool:
+        now = time.monotonic()
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = [self.max_per_second, now]
+        tokens = min(
+            self.max_per_second, bucket[0] + (now - bucket[1]) * self.max_per_second
+        )
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            return False
+        bucket[0] = tokens - 1
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener thread without formatting or blocking.
+
+    The stock QueueHandler formats each record on the calling thread so it
+    can cross process boundaries. The listener here is a thread, so records
+    are passed as they are and formatting (message args, timestamps,
+    tracebacks, JSON) happens there. Only the request id, which lives in a
+    context variable, is captured on the caller's side by RequestIdFilter.
+    When the queue is full, records are dropped and counted rather than
+    stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def stop_listener():
+    """Flush and stop the queue listener, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_listener)
+
+
+def setup_logging(
+    level: str = "INFO",
+    mode: str = "sync",
+    fmt: str = "text",
+    info_sample_rate: float = 1.0,
+    info_max_per_second: float = 0.0,
+    queue_size: int = 10_000,
+):
+    """Configure the root logger.
+
+    ``mode="queue"`` writes from a background QueueListener thread so a slow
+    stderr never stalls the event loop. ``fmt="json"`` emits JSON lines.
+    The sampling arguments thin out INFO records (see InfoSampler).
+    """
+    global _listener
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        JsonFormatter() if fmt == "json" else logging.Formatter(LOG_FORMAT)
     )
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter(log_format))
+    handler: logging.Handler
+    if mode == "queue":
+        handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+        stop_listener()
+        _listener = logging.handlers.QueueListener(
+            handler.queue, stream_handler, respect_handler_level=True
+        )
+        _listener.start()
+    else:
+        handler = stream_handler
     handler.addFilter(RequestIdFilter())
+    if info_sample_rate < 1.0 or info_max_per_second > 0:
+        handler.addFilter(InfoSampler(info_sample_rate, info_max_per_second))
 
     logging.basicConfig(level=level.upper(), handlers=[handler])
+    if _listener is not None and handler not in logging.getLogger().handlers:
+        # Logging was already configured, so basicConfig kept the old handlers
+        stop_listener()
 
     # Optional: silence overly verbose loggers from dependencies
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
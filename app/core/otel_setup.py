@@ -30,7 +30,7 @@ class RequestIdSpanProcessor(SpanProcessor):
         pass  # No-op
 
 
-def configure_otel(app, engine):
+def configure_otel(app, *engines):
     if os.getenv("ENABLE_OTEL", "false").lower() != "true":
         logger.info("OpenTelemetry is disabled.")
         return
@@ -74,7 +74,9 @@ def configure_otel(app, engine):
 
     # Instrument FastAPI and SQLAlchemy
     FastAPIInstrumentor().instrument_app(app)
-    SQLAlchemyInstrumentor().instrument(engine=engine.sync_engine)
+    SQLAlchemyInstrumentor().instrument(
+        engines=list({id(e): e.sync_engine for e in engines}.values())
+    )
 
     logger.info(
         f"OpenTelemetry tracing enabled with sample rate: {app_settings.otel_sample_rate}"
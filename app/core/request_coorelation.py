@@ -1,19 +1,54 @@
+import re
 import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.async_context import request_id_var
 
+REQUEST_ID_HEADER = "X-Request-ID"
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+# A caller's id is reused only if it is short and safe to write into logs
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:\-]{1,128}")
 
-        # Set globally
+
+class CorrelationIdMiddleware:
+    """Tag every request with an id and echo it in the X-Request-ID header.
+
+    An incoming X-Request-ID is reused so ids line up across services; a new
+    uuid4 is generated only when none (or a malformed one) was sent. This is
+    plain ASGI rather than BaseHTTPMiddleware, so there is no extra task or
+    memory stream per request and streaming responses pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, header_name: str = REQUEST_ID_HEADER):
+        self.app = app
+        self.header_name = header_name
+        self._raw_header = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming_id(scope) or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        # Not reset afterwards: the 500 handler runs outside this middleware
+        # and logs with it. Servers give each request its own context.
         request_id_var.set(request_id)
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+    def _incoming_id(self, scope: Scope):
+        for name, value in scope["headers"]:
+            if name == self._raw_header:
+                request_id = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(request_id):
+                    return request_id
+                return None
+        return None
@@ -0,0 +1,24 @@
+import functools
+from typing import Any
+
+import orjson
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson; dates and datetimes encode natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(tp) -> TypeAdapter:
+    """Build each TypeAdapter once; building one compiles a core schema."""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp, value) -> bytes:
+    """Serialise ``value`` as ``tp`` to JSON bytes in pydantic's Rust core."""
+    return type_adapter(tp).dump_json(value)
@@ -1,2 +1,2 @@
 from app.db.session import asyncSessionLocal as session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
@@ -1,21 +1,198 @@
+import argparse
 import asyncio
+import bisect
+import itertools
 import logging
 import os
+import random
 import sys
-from datetime import date
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.schema import CreateTable
 
 from app.db.models.donor_models import Donation, Donor
-from app.db.session import Base, asyncSessionLocal, engine
+from app.db.session import DATABASE_URL, Base, asyncSessionLocal, engine
 
 logger = logging.getLogger(__name__)
 
+# Rough population frequencies, so group-filtered queries see realistic skew
+BLOOD_GROUP_WEIGHTS = {
+    "O+": 38,
+    "A+": 34,
+    "B+": 9,
+    "O-": 7,
+    "A-": 6,
+    "AB+": 3,
+    "B-": 2,
+    "AB-": 1,
+}
+# A few big centres collect most donations
+LOCATIONS = (
+    "Central Blood Bank",
+    "City Hospital",
+    "North Clinic",
+    "South Clinic",
+    "University Campus",
+    "Mobile Unit 1",
+    "Mobile Unit 2",
+    "East Community Centre",
+    "West Medical Centre",
+    "Airport Health Point",
+    "Harbour Clinic",
+    "Riverside Hospital",
+)
+LOCATION_WEIGHTS = tuple(1 / rank for rank in range(1, len(LOCATIONS) + 1))
+VOLUME_WEIGHTS = {350: 1, 450: 6, 500: 3}
+FIRST_NAMES = (
+    "Aarav", "Alice", "Amara", "Ben", "Chen", "Diego", "Elena", "Fatima", "Hana",
+    "Ivan", "Jamal", "Julia", "Kofi", "Leila", "Liam", "Maya", "Noah", "Olga",
+    "Priya", "Rahul", "Sara", "Tariq", "Yuki", "Zoe",
+)  # fmt: skip
+LAST_NAMES = (
+    "Ahmed", "Brown", "Costa", "Das", "Evans", "Garcia", "Gupta", "Ito", "Kim",
+    "Kowalski", "Mensah", "Mittal", "Novak", "Okafor", "Petrov", "Rossi", "Sato",
+    "Silva", "Singh", "Smith", "Wang", "Weber",
+)  # fmt: skip
 
-async def init_db():
+# version and updated_at come from their server defaults
+DONOR_COLUMNS = ("id", "name", "blood_group", "age", "last_donated")
+DONATION_COLUMNS = (
+    "donor_id",
+    "date",
+    "volume_ml",
+    "location",
+    "hemoglobin",
+    "pulse",
+    "blood_pressure",
+)
+
+# Tuned for a one-off load: no rollback journal, no fsync, big page cache.
+# A crash mid-load can corrupt the file, which is fine for generated data.
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA cache_size=-262144",  # 256 MiB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA foreign_keys=OFF",  # every donation references a generated donor
+)
+RESTORE_PRAGMAS = (
+    "PRAGMA journal_mode=DELETE",
+    "PRAGMA synchronous=FULL",
+    "PRAGMA locking_mode=NORMAL",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+# Columns added after the first release. create_all skips existing tables,
+# so databases created before them get the columns here.
+ADDED_COLUMNS = (
+    ("donors", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("donations", "version", "INTEGER NOT NULL DEFAULT 1"),
+)
+# Replaced by ix_donations_donor_id_date_id, which has donor_id as its prefix
+OBSOLETE_INDEXES = (("donations", "ix_donations_donor_id"),)
+# Tables declared AUTOINCREMENT after the first release. SQLite cannot add
+# it with ALTER TABLE, so older tables are rebuilt.
+AUTOINCREMENT_TABLES = ("donors",)
+
+
+def upgrade_schema(conn) -> List[str]:
+    """Bring tables created by an older version up to the models; idempotent.
+
+    Adds missing columns, rebuilds tables that lack AUTOINCREMENT, creates
+    missing indexes and drops replaced ones. Foreign keys must be off, or
+    dropping a rebuilt table would cascade. Returns the changes made.
+    """
+    changes = []
+    inspector = inspect(conn)
+    for table_name, column, ddl in ADDED_COLUMNS:
+        columns = {c["name"] for c in inspector.get_columns(table_name)}
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column} {ddl}"))
+            changes.append(f"added {table_name}.{column}")
+    rebuilt = [
+        table_name
+        for table_name in AUTOINCREMENT_TABLES
+        if not _has_autoincrement(conn, table_name)
+    ]
+    for table_name in rebuilt:
+        _rebuild_table(conn, Base.metadata.tables[table_name])
+        changes.append(f"rebuilt {table_name} with AUTOINCREMENT ids")
+    if rebuilt:
+        if conn.execute(text("PRAGMA foreign_key_check")).first() is not None:
+            raise RuntimeError("Foreign key violations after rebuilding tables")
+        # The inspector caches what it has read; the rebuilt tables have no indexes
+        inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+                changes.append(f"created index {index.name}")
+    for table_name, name in OBSOLETE_INDEXES:
+        if name in {i["name"] for i in inspector.get_indexes(table_name)}:
+            conn.execute(text(f"DROP INDEX {name}"))
+            changes.append(f"dropped index {name}")
+    return changes
+
+
+def _has_autoincrement(conn, table_name: str) -> bool:
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": table_name},
+    ).scalar_one()
+    return "AUTOINCREMENT" in sql.upper()
+
+
+def _rebuild_table(conn, table):
+    """Recreate ``table`` from the model and copy its rows over, keeping ids.
+
+    Indexes are left to the caller. Copying explicit ids moves the
+    AUTOINCREMENT counter past the highest one.
+    """
+    new_table = table.to_metadata(MetaData(), name=f"{table.name}_rebuild")
+    columns = ", ".join(column.name for column in table.columns)
+    # Left over if an earlier attempt failed before the copy
+    conn.execute(text(f"DROP TABLE IF EXISTS {new_table.name}"))
+    conn.execute(CreateTable(new_table))
+    conn.execute(
+        text(
+            f"INSERT INTO {new_table.name} ({columns}) "
+            f"SELECT {columns} FROM {table.name}"
+        )
+    )
+    conn.execute(text(f"DROP TABLE {table.name}"))
+    conn.execute(text(f"ALTER TABLE {new_table.name} RENAME TO {table.name}"))
+
+
+async def init_db(db_engine: AsyncEngine = engine):
     logger.info("Initializing database schema...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    async with db_engine.connect() as conn:
+        # SQLite ignores this PRAGMA inside a transaction, so it is committed
+        # on its own; the finally block puts the pooled connection back as it was
+        await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        await conn.commit()
+        try:
+            await conn.run_sync(Base.metadata.create_all)
+            changes = await conn.run_sync(upgrade_schema)
+            await conn.commit()
+        finally:
+            await conn.rollback()
+            await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            await conn.commit()
+    for change in changes:
+        logger.info(f"Schema upgrade: {change}")
     logger.info("Database schema created.")
 
 
@@ -46,12 +223,247 @@ async def seed_data():
         logger.info("Seed data inserted successfully.")
 
 
-if __name__ == "__main__":
+# ========== SYNTHETIC DATA ==========
+
+
+@dataclass
+class LoadStats:
+    donors: int = 0
+    donations: int = 0
+    insert_seconds: float = 0.0
+    index_seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return (self.donors + self.donations) / max(self.insert_seconds, 1e-9)
+
+
+def parse_range(value: str) -> Tuple[int, int]:
+    """ "0..40" -> (0, 40); a bare "5" means exactly five."""
+    low, _, high = value.partition("..")
+    bounds = (int(low), int(high or low))
+    if bounds[0] < 0 or bounds[0] > bounds[1]:
+        raise ValueError(f"Invalid range: {value}")
+    return bounds
+
+
+class DonorGenerator:
+    """Deterministic donors and donations; the same seed yields the same rows.
+
+    Donation counts are skewed towards the low end of the range, as most
+    donors give a few times and a few give for decades. Dates are at least
+    56 days apart and last_donated matches the newest donation.
+    """
+
+    def __init__(self, seed: int, donations_per_donor: Tuple[int, int], today: date):
+        self.rng = random.Random(seed)
+        self.low, self.high = donations_per_donor
+        self.today = today
+        self._group = self._picker(BLOOD_GROUP_WEIGHTS)
+        self._location = self._picker(dict(zip(LOCATIONS, LOCATION_WEIGHTS)))
+        self._volume = self._picker(VOLUME_WEIGHTS)
+
+    def _picker(self, weights: dict):
+        # random.choices rebuilds the cumulative weights on every call
+        values = tuple(weights)
+        cumulative = tuple(itertools.accumulate(weights.values()))
+        total, rng = cumulative[-1], self.rng
+        return lambda: values[bisect.bisect(cumulative, rng.random() * total)]
+
+    def _donation_count(self) -> int:
+        spread = self.high - self.low
+        if spread == 0:
+            return self.low
+        return self.low + min(spread, int(self.rng.expovariate(4 / spread)))
+
+    def _donation(self, donor_id: int, day: str) -> tuple:
+        rng = self.rng
+        if rng.random() < 0.1:  # vitals not recorded
+            hemoglobin = pulse = blood_pressure = None
+        else:
+            hemoglobin = round(min(18.0, max(12.5, rng.gauss(14.2, 1.3))), 1)
+            # Clamped to the ranges DonationBase accepts
+            pulse = min(100, max(60, int(rng.gauss(72, 9))))
+            systolic = min(180, max(90, int(rng.gauss(120, 12))))
+            diastolic = min(150, max(40, int(systolic * 0.65 + rng.gauss(0, 5))))
+            blood_pressure = f"{systolic}/{diastolic}"
+        return (
+            donor_id,
+            day,
+            self._volume(),
+            self._location(),
+            hemoglobin,
+            pulse,
+            blood_pressure,
+        )
+
+    def chunk(self, first_id: int, count: int) -> Tuple[List[tuple], List[tuple]]:
+        """Rows for donors first_id.. as tuples in DONOR_/DONATION_COLUMNS order."""
+        rng = self.rng
+        donors: List[tuple] = []
+        donations: List[tuple] = []
+        for donor_id in range(first_id, first_id + count):
+            day = self.today - timedelta(days=rng.randint(0, 730))
+            dates = []
+            for _ in range(self._donation_count()):
+                dates.append(day.isoformat())
+                day -= timedelta(days=56 + int(rng.expovariate(1 / 90)))
+            donors.append(
+                (
+                    donor_id,
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    self._group(),
+                    int(rng.triangular(18, 71, 32)),
+                    dates[0] if dates else None,
+                )
+            )
+            donations.extend(self._donation(donor_id, d) for d in reversed(dates))
+        return donors, donations
+
+
+def _secondary_indexes():
+    return [index for table in Base.metadata.sorted_tables for index in table.indexes]
+
+
+def _insert_sql(table, columns: Tuple[str, ...]) -> str:
+    # Built by hand: compiling insert(table) would add the Python-side defaults
+    placeholders = ", ".join("?" * len(columns))
+    return f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+async def _insert_chunk(conn: AsyncConnection, statements, rows, batch_size: int):
+    # Plain tuples through the driver; ORM and Core bind processing would
+    # cost more than SQLite spends on the insert itself
+    for sql, chunk_rows in zip(statements, rows):
+        for start in range(0, len(chunk_rows), batch_size):
+            await conn.exec_driver_sql(sql, chunk_rows[start : start + batch_size])
+    await conn.commit()
+
+
+async def generate_data(
+    database_url: str,
+    donors: int,
+    donations_per_donor: Tuple[int, int] = (0, 40),
+    seed: int = 42,
+    chunk_size: int = 100_000,
+    batch_size: int = 10_000,
+    today: Optional[date] = None,
+) -> LoadStats:
+    """Replace all data with ``donors`` generated donors and their donations.
+
+    Secondary indexes are dropped for the load and rebuilt afterwards, which
+    is much faster than maintaining them row by row. Each chunk of donors is
+    one transaction.
+    """
+    generator = DonorGenerator(seed, donations_per_donor, today or date.today())
+    stats = LoadStats()
+    load_engine = create_async_engine(database_url)
     try:
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        async with load_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with load_engine.connect() as conn:
+            for pragma in LOAD_PRAGMAS:
+                await conn.exec_driver_sql(pragma)
+            await conn.execute(text("DELETE FROM donations"))
+            await conn.execute(text("DELETE FROM donors"))
+            for index in _secondary_indexes():
+                await conn.run_sync(index.drop, checkfirst=True)
+            await conn.commit()
+
+            statements = (
+                _insert_sql(Donor.__table__, DONOR_COLUMNS),
+                _insert_sql(Donation.__table__, DONATION_COLUMNS),
+            )
+            start = time.perf_counter()
+            pending = pending_rows = None
+            for first_id in range(1, donors + 1, chunk_size):
+                rows = generator.chunk(first_id, min(chunk_size, donors + 1 - first_id))
+                if pending is not None:
+                    await pending
+                    _record_chunk(stats, pending_rows, donors, start)
+                # SQLite writes this chunk on the driver thread while the loop
+                # generates the next one
+                pending = asyncio.create_task(
+                    _insert_chunk(conn, statements, rows, batch_size)
+                )
+                pending_rows = rows
+                await asyncio.sleep(0)
+            if pending is not None:
+                await pending
+                _record_chunk(stats, pending_rows, donors, start)
+
+            start = time.perf_counter()
+            for index in _secondary_indexes():
+                await conn.run_sync(index.create, checkfirst=True)
+            await conn.execute(text("ANALYZE"))
+            await conn.commit()
+            stats.index_seconds = time.perf_counter() - start
+            for pragma in RESTORE_PRAGMAS:
+                await conn.exec_driver_sql(pragma)
+    finally:
+        await load_engine.dispose()
+    return stats
+
+
+def _record_chunk(stats: LoadStats, rows, donors: int, start: float):
+    stats.donors += len(rows[0])
+    stats.donations += len(rows[1])
+    stats.insert_seconds = time.perf_counter() - start
+    logger.info(
+        f"Loaded {stats.donors:,}/{donors:,} donors, {stats.donations:,} donations "
+        f"({stats.rows_per_sec:,.0f} rows/sec)"
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Create the schema and seed example data, or generate a "
+        "large synthetic data set with --donors."
+    )
+    parser.add_argument("--donors", type=int, help="e.g. 5_000_000; replaces all data")
+    parser.add_argument(
+        "--donations-per-donor", type=parse_range, default=(0, 40), metavar="LOW..HIGH"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument(
+        "--upgrade",
+        action="store_true",
+        help="only create missing tables, columns and indexes; keep the data",
+    )
+    args = parser.parse_args(argv)
+
+    if args.upgrade:
+        asyncio.run(init_db())
+        logger.info("Database schema upgraded.")
+        return
+    if args.donors is None:
         asyncio.run(init_db())
         asyncio.run(seed_data())
         logger.info("Database initialized and seeded.")
+        return
+
+    stats = asyncio.run(
+        generate_data(
+            args.database_url,
+            args.donors,
+            args.donations_per_donor,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+        )
+    )
+    print(
+        f"{stats.donors:,} donors and {stats.donations:,} donations in "
+        f"{stats.insert_seconds:.1f}s ({stats.rows_per_sec:,.0f} rows/sec); "
+        f"indexes and ANALYZE in {stats.index_seconds:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        main()
     except Exception as e:
         logger.exception("Failed during DB initialization or seeding")
         import sys
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -12,6 +21,8 @@ class Donor(Base):
     blood_group = Column(String(3), nullable=False)
     age = Column(Integer, nullable=False)
     last_donated = Column(Date, nullable=True)
+    # Optimistic lock token, bumped by every UPDATE
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     updated_at = Column(
         DateTime,
         server_default=func.now(),
@@ -23,13 +34,24 @@ class Donor(Base):
         "Donation", back_populates="donor", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Serves eligibility search: equality on blood_group, range on
+        # last_donated, with the rowid (id) as an implicit tiebreaker
+        Index("ix_donors_blood_group_last_donated", "blood_group", "last_donated"),
+        # Never hand a deleted donor's id to a new one: ETags and cache
+        # entries are keyed on (id, version), and both restart at 1
+        {"sqlite_autoincrement": True},
+    )
+
 
 class Donation(Base):
     __tablename__ = "donations"
 
     id = Column(Integer, primary_key=True, index=True)
     donor_id = Column(
-        Integer, ForeignKey("donors.id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("donors.id", ondelete="CASCADE"),
+        nullable=False,
     )
     date = Column(Date, nullable=False)
     volume_ml = Column(Integer, nullable=False)
@@ -39,9 +61,16 @@ class Donation(Base):
     blood_pressure = Column(String(10), nullable=True)  # Format: 'systolic/diastolic'
 
     donor = relationship("Donor", back_populates="donations")
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     updated_at = Column(
         DateTime,
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
     )
+
+    __table_args__ = (
+        # Per-donor lookups and the ON DELETE CASCADE seek the donor_id prefix;
+        # the donation history is read backwards along (date, id) by keyset
+        Index("ix_donations_donor_id_date_id", "donor_id", "date", "id"),
+    )
@@ -0,0 +1,317 @@
+"""EXPLAIN QUERY PLAN audit for the SQL issued by the service layer.
+
+Every public coroutine in app.service.donor_service has a scenario below.
+The audit runs each one against a seeded throwaway SQLite database,
+captures the statements it sends, and explains each of them. It fails when
+a plan scans a large table. Use it from tests or on its own:
+
+    python -m app.db.query_audit
+
+A new service function without a scenario is reported as missing, so it
+cannot skip the audit by accident.
+"""
+
+import asyncio
+import datetime
+import inspect
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.api.v1.schemas import DonationCreate, DonationUpdate, DonorCreate, DonorUpdate
+from app.db.models import Donation, Donor
+from app.db.session import Base
+
+LARGE_TABLES = frozenset({"donors", "donations"})
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+Scenario = Callable[[AsyncSession], Awaitable]
+
+
+class StatementRecorder:
+    """Collect (statement, parameters) sent through an engine while active."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[Tuple[str, tuple]] = []
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0]
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._capture)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._capture)
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters) -> List[str]:
+    """The detail column of EXPLAIN QUERY PLAN, one entry per plan node."""
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        return [row[-1] for row in result]
+
+
+def full_scans(plan: Sequence[str], large_tables=LARGE_TABLES) -> List[str]:
+    """Plan nodes that read a large table end to end (with or without index)."""
+    return [
+        node
+        for node in plan
+        if (match := _SCAN.match(node)) and match.group(1) in large_tables
+    ]
+
+
+@dataclass
+class PlannedStatement:
+    scenario: str
+    statement: str
+    plan: List[str]
+    scans: List[str]
+
+
+@dataclass
+class AuditReport:
+    statements: List[PlannedStatement] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    allowed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def violations(self) -> List[PlannedStatement]:
+        return [
+            s for s in self.statements if s.scans and s.scenario not in self.allowed
+        ]
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations and not self.missing
+
+
+async def audit(
+    engine: AsyncEngine,
+    scenarios: Dict[str, Scenario],
+    allowed: Optional[Dict[str, str]] = None,
+    large_tables=LARGE_TABLES,
+) -> AuditReport:
+    """Run each scenario in its own session and explain what it sent."""
+    report = AuditReport(allowed=dict(allowed or {}))
+    for name, scenario in scenarios.items():
+        with StatementRecorder(engine.sync_engine) as recorder:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                await scenario(db)
+        for statement, parameters in recorder.statements:
+            plan = await explain(engine, statement, parameters)
+            report.statements.append(
+                PlannedStatement(name, statement, plan, full_scans(plan, large_tables))
+            )
+    return report
+
+
+def missing_scenarios(module, scenarios: Iterable[str]) -> List[str]:
+    """Public coroutines of ``module`` that no named scenario exercises.
+
+    Scenario names may carry a variant suffix, e.g. "get_all_donors[cursor]".
+    """
+    covered = {name.split("[")[0] for name in scenarios}
+    return sorted(
+        name
+        for name, fn in inspect.getmembers(module, inspect.iscoroutinefunction)
+        if not name.startswith("_")
+        and fn.__module__ == module.__name__
+        and name not in covered
+    )
+
+
+# ========== DONOR SERVICE ==========
+
+AUDIT_DONORS = 5_000
+AUDIT_DONATIONS_PER_DONOR = 4
+_GROUPS = ("O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+")
+
+
+async def seed_audit_data(engine: AsyncEngine):
+    """Deterministic data set; odd donors have donations, even ones have none."""
+    today = datetime.date(2025, 1, 1)
+    donors = [
+        {
+            "id": i,
+            "name": f"Donor {i}",
+            "blood_group": _GROUPS[i % len(_GROUPS)],
+            "age": 18 + i % 50,
+            "last_donated": (
+                today - datetime.timedelta(days=i % 400) if i % 3 else None
+            ),
+        }
+        for i in range(1, AUDIT_DONORS + 1)
+    ]
+    donations = [
+        {
+            "donor_id": i,
+            "date": today - datetime.timedelta(days=30 * n),
+            "volume_ml": 450,
+            "location": "Audit Center",
+        }
+        for i in range(1, AUDIT_DONORS + 1, 2)
+        for n in range(AUDIT_DONATIONS_PER_DONOR)
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Donor), donors)
+        await conn.execute(insert(Donation), donations)
+        # Give the planner real statistics, as a production database has
+        await conn.execute(text("ANALYZE"))
+
+
+def donor_service_scenarios() -> Dict[str, Scenario]:
+    from app.service import donor_service as svc
+
+    donor = DonorCreate(name="Audit", blood_group="O-", age=30)
+    donation = DonationCreate(
+        date=datetime.date(2025, 1, 1),
+        volume_ml=450,
+        location="Audit",
+        hemoglobin=None,
+        pulse=None,
+        blood_pressure=None,
+        donor_id=1,
+    )
+
+    async def get_donor_out(db):
+        svc.donor_cache.delete(7)
+        await svc.get_donor_out(db, 7)
+
+    async def get_cached_donor_count(db):
+        svc.invalidate_donor_count_cache()
+        await svc.get_cached_donor_count(db)
+
+    return {
+        "create_donor": lambda db: svc.create_donor(db, donor),
+        "get_all_donors[offset]": lambda db: svc.get_all_donors(db, skip=0, limit=10),
+        "get_all_donors[cursor]": lambda db: svc.get_all_donors(
+            db, limit=10, after_id=2_500
+        ),
+        "get_all_donors[read_only]": lambda db: svc.get_all_donors(
+            db, limit=10, after_id=2_500, read_only=True
+        ),
+        "get_donor_page_rows": lambda db: svc.get_donor_page_rows(
+            db, limit=10, after_id=2_500
+        ),
+        "get_donor_page_rows[fields]": lambda db: svc.get_donor_page_rows(
+            db, limit=10, after_id=2_500, fields=["name", "blood_group"]
+        ),
+        "get_donor_page_rows[include_donations]": lambda db: svc.get_donor_page_rows(
+            db, limit=10, after_id=2_500, include_donations=True
+        ),
+        "get_donor_page_versions": lambda db: svc.get_donor_page_versions(
+            db, limit=10, after_id=2_500
+        ),
+        "get_eligible_donors[never_donated]": lambda db: svc.get_eligible_donors(
+            db, "O-", limit=50, as_of=datetime.date(2025, 1, 1)
+        ),
+        "get_eligible_donors[cursor]": lambda db: svc.get_eligible_donors(
+            db,
+            "O-",
+            limit=50,
+            after_last_donated=datetime.date(2024, 1, 1),
+            after_id=100,
+            as_of=datetime.date(2025, 1, 1),
+        ),
+        "get_donor": lambda db: svc.get_donor(db, 5),
+        "get_donor[read_only]": lambda db: svc.get_donor(db, 5, read_only=True),
+        "get_donors_by_ids": lambda db: svc.get_donors_by_ids(db, [5, 3_000, 9]),
+        "get_donor_version": lambda db: svc.get_donor_version(db, 5),
+        "get_donor_out": get_donor_out,
+        "update_donor": lambda db: svc.update_donor(
+            db, 9, DonorUpdate(name="Audit", blood_group="O-", age=30, version=1)
+        ),
+        # Even ids have no donations, so the delete goes through
+        "delete_donor": lambda db: svc.delete_donor(db, 10),
+        # 10 and 12 go, 11 has donations, 10_001 does not exist
+        "batch_delete_donors": lambda db: svc.batch_delete_donors(
+            db, [10, 11, 12, 10_001]
+        ),
+        "get_total_donor_count": svc.get_total_donor_count,
+        "get_cached_donor_count": get_cached_donor_count,
+        "get_donations_for_donor": lambda db: svc.get_donations_for_donor(db, 11),
+        "get_donation_page[latest]": lambda db: svc.get_donation_page(db, 11, limit=2),
+        "get_donation_page[cursor]": lambda db: svc.get_donation_page(
+            db,
+            11,
+            limit=2,
+            after_date=datetime.date(2024, 12, 2),
+            after_id=22,
+            date_from=datetime.date(2024, 1, 1),
+            date_to=datetime.date(2024, 12, 31),
+        ),
+        "donor_has_donations": lambda db: svc.donor_has_donations(db, 13),
+        "create_donation": lambda db: svc.create_donation(db, 1, donation),
+        "get_donation": lambda db: svc.get_donation(db, 3),
+        "update_donation": lambda db: svc.update_donation(
+            db,
+            3,
+            DonationUpdate(**donation.model_dump(), version=1),
+        ),
+        "delete_donation": lambda db: svc.delete_donation(db, 4),
+        "batch_delete_donations": lambda db: svc.batch_delete_donations(
+            db, [5, 6, 100_000]
+        ),
+    }
+
+
+# Scenarios whose scans are inherent; anything else that scans fails
+DONOR_SERVICE_ALLOWED_SCANS = {
+    "get_total_donor_count": "COUNT(*) reads every row; use total_mode=cached|none",
+    "get_cached_donor_count": "recounts with COUNT(*) when the cache is cold",
+    "get_all_donors[offset]": "OFFSET paging walks skipped rows; cursor mode seeks",
+}
+
+
+async def audit_donor_service(path: str) -> AuditReport:
+    from app.service import donor_service
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        await seed_audit_data(engine)
+        scenarios = donor_service_scenarios()
+        report = await audit(engine, scenarios, DONOR_SERVICE_ALLOWED_SCANS)
+        report.missing = missing_scenarios(donor_service, scenarios)
+        return report
+    finally:
+        await engine.dispose()
+
+
+def print_report(report: AuditReport, out=sys.stdout):
+    for planned in report.statements:
+        status = "ok"
+        if planned.scans:
+            status = "allowed" if planned.scenario in report.allowed else "SCAN"
+        first_line = planned.statement.strip().splitlines()[0]
+        print(f"[{status:>7}] {planned.scenario}: {first_line}", file=out)
+        for node in planned.plan:
+            print(f"            {node}", file=out)
+    for name in report.missing:
+        print(f"[missing] {name} has no audit scenario", file=out)
+    verdict = "passed" if report.ok else f"FAILED ({len(report.violations)} scans)"
+    print(f"Query plan audit {verdict}", file=out)
+
+
+async def _main() -> int:
+    with tempfile.TemporaryDirectory(prefix="query-audit-") as tmpdir:
+        report = await audit_donor_service(os.path.join(tmpdir, "audit.db"))
+    print_report(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,191 @@
+"""Per-statement latency histograms and a slow-query log for SQL engines.
+
+Statements are grouped by their normalised text (whitespace collapsed,
+literals and expanded IN lists replaced by ``?``), so the same query with
+different parameters lands in one entry. A statement that takes longer than
+``slow_ms`` is logged once per execution with its EXPLAIN QUERY PLAN; the
+plan is looked up the first time a statement is slow and then reused.
+"""
+
+import bisect
+import functools
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)+\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+
+
+# SQLAlchemy caches compiled SQL, so the same few strings come back each time
+@functools.lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """SQL text with literals and variable-length lists folded to ``?``."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _IN_LIST.sub("IN (?)", statement)
+    return _VALUES_ROWS.sub(r"\1", statement)
+
+
+@dataclass
+class StatementStats:
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    slow_calls: int = 0
+    buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(BUCKET_BOUNDS_MS) + 1)
+    )
+    plan: Optional[List[str]] = None
+
+    def record(self, elapsed_ms: float, rows: int):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def percentile_ms(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th call (max_ms if open)."""
+        rank = max(1, round(self.calls * pct / 100))
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict:
+        return {
+            "statement": self.statement,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "p99_ms": self.percentile_ms(99),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "slow_calls": self.slow_calls,
+            "histogram": dict(
+                zip([f"<={b}ms" for b in BUCKET_BOUNDS_MS] + ["more"], self.buckets)
+            ),
+            "plan": self.plan,
+        }
+
+
+def _result_rows(cursor) -> int:
+    """Rows written, or for reads the rows already buffered by the driver.
+
+    sqlite3 reports -1 for SELECTs; the aiosqlite adapter fetches the whole
+    result on execute, so its buffer holds the row count. -1 if unknown.
+    """
+    if cursor.rowcount >= 0:
+        return cursor.rowcount
+    buffered = getattr(cursor, "_rows", None)
+    return len(buffered) if buffered is not None else -1
+
+
+class QueryStats:
+    """Time every statement sent through the engines it is attached to.
+
+    Stats are kept for the ``max_statements`` most recently used statements.
+    ``slow_ms`` of 0 turns the slow-query log off; stats are still kept.
+    """
+
+    def __init__(self, slow_ms: float = 100.0, max_statements: int = 500):
+        self.slow_ms = slow_ms
+        self.max_statements = max_statements
+        self._stats: OrderedDict[str, StatementStats] = OrderedDict()
+
+    def attach(self, engine: Engine):
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._failed)
+
+    def detach(self, engine: Engine):
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+        event.remove(engine, "handle_error", self._failed)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        stats = self._statement_stats(normalize_statement(statement))
+        rows = _result_rows(cursor)
+        stats.record(elapsed_ms, rows)
+        if self.slow_ms and elapsed_ms >= self.slow_ms:
+            stats.slow_calls += 1
+            if stats.plan is None:
+                stats.plan = self._explain(conn, statement, parameters, executemany)
+            logger.warning(
+                "Slow query (%.1f ms, %d rows): %s\n  plan: %s",
+                elapsed_ms,
+                rows,
+                stats.statement,
+                "; ".join(stats.plan) or "-",
+            )
+
+    def _failed(self, exception_context):
+        # after_cursor_execute never runs for a failed statement
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+    def _statement_stats(self, statement: str) -> StatementStats:
+        stats = self._stats.get(statement)
+        if stats is None:
+            stats = self._stats[statement] = StatementStats(statement)
+            if len(self._stats) > self.max_statements:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(statement)
+        return stats
+
+    @staticmethod
+    def _explain(conn, statement, parameters, executemany) -> List[str]:
+        if conn.dialect.name != "sqlite":
+            return []
+        if executemany:
+            parameters = parameters[0]
+        # Straight on the DBAPI connection, so it is neither timed nor logged
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[-1] for row in cursor.fetchall()]
+        except Exception:
+            logger.debug("Could not explain slow query", exc_info=True)
+            return []
+        finally:
+            cursor.close()
+
+    def slowest(self, limit: int = 10, order_by: str = "mean_ms") -> List[Dict]:
+        summaries = [stats.summary() for stats in self._stats.values()]
+        summaries.sort(key=lambda s: s[order_by], reverse=True)
+        return summaries[:limit]
+
+    def reset(self):
+        self._stats.clear()
@@ -1,13 +1,20 @@
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
 
 from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import declarative_base, sessionmaker
+from starlette.requests import Request
 
 from app.core import app_settings
+from app.db.query_stats import QueryStats
 
 logger = logging.getLogger(__name__)
 
@@ -27,23 +34,114 @@ DATABASE_URL = (
     app_settings.database_url
 )  # "sqlite+aiosqlite:///./local_db/blood_donation.db"
 
-# engine = create_async_engine(DATABASE_URL, echo=True, future=True)
-engine = create_async_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False, "timeout": 30, "uri": True},
-    pool_pre_ping=True,
-    echo=True,
-    future=True,
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """PRAGMAs for a new connection under the SQLite profile in AppSettings.
+
+    journal_mode is left alone on read-only connections: it is stored in
+    the database file, so the writer sets it for everyone.
+    """
+    pragmas = {
+        "journal_mode": None if read_only else app_settings.sqlite_journal_mode,
+        "synchronous": app_settings.sqlite_synchronous,
+        "cache_size": app_settings.sqlite_cache_size,
+        "mmap_size": app_settings.sqlite_mmap_size,
+        "temp_store": app_settings.sqlite_temp_store,
+        "busy_timeout": app_settings.sqlite_busy_timeout_ms,
+    }
+    return [
+        f"PRAGMA {name}={value};"
+        for name, value in pragmas.items()
+        if value is not None and value != ""
+    ]
+
+
+def read_only_url(database_url: str) -> Optional[URL]:
+    """``database_url`` opened with mode=ro, or None if it is not a SQLite file."""
+    url = make_url(database_url)
+    database = url.database
+    if url.get_backend_name() != "sqlite" or not database or database == ":memory:":
+        return None
+    if not database.startswith("file:"):
+        database = f"file:{database}"
+    return url.set(database=database, query={**url.query, "mode": "ro", "uri": "true"})
+
+
+def _apply_pragmas(pragmas: List[str]):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return on_connect
+
+
+# Latency per normalised statement for every engine below; see /admin/queries
+query_stats = QueryStats(
+    slow_ms=app_settings.slow_query_ms,
+    max_statements=app_settings.query_stats_max_statements,
 )
 
+
+def _create_engine(url, read_only: bool = False, **pool_args) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        connect_args={"check_same_thread": False, "uri": True},
+        pool_pre_ping=True,
+        echo=app_settings.sql_echo,
+        future=True,
+        **pool_args,
+    )
+    query_stats.attach(new_engine.sync_engine)
+    if new_engine.dialect.name == "sqlite":
+        event.listen(
+            new_engine.sync_engine, "connect", _apply_pragmas(sqlite_pragmas(read_only))
+        )
+    return new_engine
+
+
+# SQLite allows one writer at a time, so writes share a single connection and
+# queue for it in the pool; GET requests read from a read-only pool instead
+_read_url = read_only_url(DATABASE_URL) if app_settings.sqlite_read_pool_size else None
+if _read_url is not None:
+    engine = _create_engine(DATABASE_URL, pool_size=1, max_overflow=0)
+    read_engine = _create_engine(
+        _read_url,
+        read_only=True,
+        pool_size=app_settings.sqlite_read_pool_size,
+        max_overflow=0,
+    )
+else:
+    engine = read_engine = _create_engine(DATABASE_URL)
+
 asyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+readSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    logger.debug("Creating DB session")
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async for session in _session(read_only=request.method in READ_METHODS):
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-pool session whatever the method, for POSTs that only read.
+
+    Under get_db such a POST would queue for the single writer connection.
+    """
+    async for session in _session(read_only=True):
+        yield session
+
+
+async def _session(read_only: bool) -> AsyncGenerator[AsyncSession, None]:
+    logger.debug(f"Creating {'read-only' if read_only else 'read-write'} DB session")
+    session_factory = readSessionLocal if read_only else asyncSessionLocal
     try:
-        async with asyncSessionLocal() as session:
+        async with session_factory() as session:
             yield session
     except Exception as e:
         logger.exception("Error in DB session generator")
@@ -1,17 +1,27 @@
 from app.core import app_settings
 from app.core.log_config import setup_logging
 
-setup_logging(app_settings.log_level)
+setup_logging(
+    app_settings.log_level,
+    mode=app_settings.log_mode,
+    fmt=app_settings.log_format,
+    info_sample_rate=app_settings.log_info_sample_rate,
+    info_max_per_second=app_settings.log_info_max_per_second,
+    queue_size=app_settings.log_queue_size,
+)
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.api.v1.routes.admin_route import router as admin_router
 from app.api.v1.routes.donor_routes import router as donor_router
 from app.api.v1.routes.health_route import router as health_router
 from app.core.exception_handler import (
@@ -21,10 +31,21 @@ from app.core.exception_handler import (
 )
 from app.core.otel_setup import configure_otel
 from app.core.request_coorelation import CorrelationIdMiddleware
-from app.db.session import engine
+from app.core.serialization import ORJSONResponse
+from app.db.session import engine, read_engine
+from app.service import donation_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if donation_writer is not None:
+        # Commit queued donations before the process exits
+        await donation_writer.close()
+
 
 try:
-    app = FastAPI()
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
     # # Set CORS
     # app.add_middleware(
@@ -39,11 +60,13 @@ try:
     app.add_exception_handler(Exception, global_exception_handler)
     app.add_middleware(CorrelationIdMiddleware)
 
-    configure_otel(app, engine)
+    configure_otel(app, engine, read_engine)
 
     # Register routes
     app.include_router(donor_router, prefix=app_settings.api_prefix)
     app.include_router(health_router)  # keep it unversioned and unauthenticated
+    if app_settings.enable_admin_routes:
+        app.include_router(admin_router, prefix=app_settings.api_prefix)
 
 except Exception as e:
     logger.exception("FastAPI application failed to initialize")
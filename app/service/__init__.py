@@ -1,13 +1,42 @@
+from app.service.bulk_service import bulk_create_donors, iter_lines
+from app.service.export_service import (
+    EXPORT_MEDIA_TYPES,
+    export_donations,
+    export_donors,
+)
 from app.service.health_service import db_health_check
+from app.service.matching_service import (
+    compatible_donor_groups,
+    find_matching_donors,
+    is_compatible,
+)
 
 from .donor_service import (
+    batch_delete_donations,
+    batch_delete_donors,
     create_donation,
     create_donor,
     delete_donation,
     delete_donor,
+    donation_writer,
+    donor_cache,
+    donor_field_names,
+    donor_flight,
+    donor_has_donations,
+    donor_loader,
     get_all_donors,
+    get_cached_donor_count,
+    get_donation_page,
     get_donor,
+    get_donor_out,
+    get_donor_page_rows,
+    get_donor_page_versions,
+    get_donor_version,
+    get_donors_by_ids,
+    get_eligible_donors,
     get_total_donor_count,
+    invalidate_donor_count_cache,
+    page_flight,
     update_donation,
     update_donor,
 )
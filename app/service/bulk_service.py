@@ -0,0 +1,151 @@
+import csv
+import json
+import logging
+from typing import AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.schemas import DonorCreate
+from app.api.v1.schemas.common import BulkImportResult, BulkRowError
+from app.db.models import Donor
+from app.service.donor_service import invalidate_donor_count_cache, page_flight
+
+logger = logging.getLogger(__name__)
+
+BULK_FORMATS = ("ndjson", "csv")
+BULK_CHUNK_SIZE = 1000
+# Keep the report bounded however many rows fail
+BULK_MAX_REPORTED_ERRORS = 1000
+# A donor row is well under 1 KiB; this only stops a body without newlines
+BULK_MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = BULK_MAX_LINE_BYTES
+) -> AsyncIterator[Optional[bytes]]:
+    """Split a byte stream into lines without buffering the whole body.
+
+    Lines stay undecoded, so a bad byte only fails its own row. A line longer
+    than ``max_line_bytes`` is dropped as it arrives and yielded as None.
+    """
+    buffer = b""
+    too_long = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if too_long or len(line) > max_line_bytes:
+                too_long = False
+                yield None
+            else:
+                yield line.rstrip(b"\r")
+        if len(buffer) > max_line_bytes:
+            too_long = True
+            buffer = b""
+    if too_long:
+        yield None
+    elif buffer:
+        yield buffer.rstrip(b"\r")
+
+
+def _decode_line(line: Optional[bytes]) -> str:
+    if line is None:
+        raise ValueError(f"line longer than {BULK_MAX_LINE_BYTES} bytes")
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("invalid UTF-8") from None
+
+
+def _record_error(result: BulkImportResult, line_no: int, errors: List[str]):
+    result.failed += 1
+    if len(result.errors) < BULK_MAX_REPORTED_ERRORS:
+        result.errors.append(BulkRowError(line=line_no, errors=errors))
+    else:
+        result.errors_truncated = True
+
+
+async def _insert_chunk(db: AsyncSession, rows: List[dict]):
+    # A list of parameter sets makes this a single executemany
+    await db.execute(insert(Donor), rows)
+    logger.debug(f"Inserted chunk of {len(rows)} donors")
+
+
+async def bulk_create_donors(
+    db: AsyncSession,
+    lines: AsyncIterator[Optional[bytes]],
+    fmt: str = "ndjson",
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> BulkImportResult:
+    """Validate and insert donors from NDJSON or CSV lines in one transaction.
+
+    ``lines`` come from iter_lines. CSV input needs a header row naming
+    DonorCreate fields; empty cells are treated as missing values. Quoted
+    fields may not span lines.
+    """
+    if fmt not in BULK_FORMATS:
+        raise ValueError(f"Unsupported bulk format: {fmt}")
+    logger.info(f"Bulk importing donors ({fmt}, chunk_size={chunk_size})")
+    result = BulkImportResult()
+    header: Optional[List[str]] = None
+    chunk: List[dict] = []
+    line_no = 0
+    try:
+        async for raw_line in lines:
+            line_no += 1
+            try:
+                line = _decode_line(raw_line)
+            except ValueError as e:
+                result.received += 1
+                _record_error(result, line_no, [str(e)])
+                continue
+            if not line.strip():
+                continue
+            if fmt == "csv" and header is None:
+                header = [name.strip() for name in next(csv.reader([line]))]
+                continue
+
+            result.received += 1
+            try:
+                if fmt == "csv":
+                    cells = next(csv.reader([line]))
+                    raw = {
+                        key: (value if value != "" else None)
+                        for key, value in zip(header or [], cells)
+                    }
+                else:
+                    raw = json.loads(line)
+                chunk.append(DonorCreate.model_validate(raw).model_dump())
+            except ValidationError as e:
+                _record_error(
+                    result,
+                    line_no,
+                    [
+                        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ],
+                )
+            except ValueError as e:
+                _record_error(result, line_no, [f"Malformed {fmt} row: {e}"])
+
+            if len(chunk) >= chunk_size:
+                await _insert_chunk(db, chunk)
+                result.inserted += len(chunk)
+                chunk = []
+
+        if chunk:
+            await _insert_chunk(db, chunk)
+            result.inserted += len(chunk)
+        await db.commit()
+        invalidate_donor_count_cache()
+        page_flight.forget_all()
+        logger.info(
+            f"Bulk import finished: {result.inserted} inserted, {result.failed} failed"
+        )
+        return result
+    except Exception:
+        logger.exception("Failed to bulk import donors")
+        await db.rollback()
+        raise
@@ -0,0 +1,102 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Minimal key/value interface so other backends can be swapped in later.
+
+    ``None`` is reserved for "not cached", so callers never store it.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]: ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class NullCache(CacheBackend):
+    """Caching switched off: every lookup is a miss."""
+
+    def get(self, key):
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCache(CacheBackend):
+    """Bounded in-process LRU whose entries also expire after ``ttl`` seconds.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60.0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {**super().stats(), "size": len(self._entries)}
+
+
+def create_cache(backend: str, max_entries: int, ttl: float) -> CacheBackend:
+    if backend == "memory":
+        return LRUCache(max_entries=max_entries, ttl=ttl)
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -1,15 +1,93 @@
+import datetime
 import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, cast
 
 from fastapi import HTTPException
-from sqlalchemy import func
+from sqlalchemy import Result, Row, delete, exists, func, insert, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only, selectinload
 
-from app.api.v1.schemas import DonationCreate, DonationUpdate, DonorCreate, DonorUpdate
+from app.api.v1.schemas import (
+    DonationCreate,
+    DonationOut,
+    DonationUpdate,
+    DonorCreate,
+    DonorOut,
+    DonorUpdate,
+)
+from app.api.v1.schemas.common import BatchDeleteItem, BatchDeleteResult
+from app.core import app_settings
 from app.db.models import Donation, Donor
+from app.db.session import asyncSessionLocal
+from app.service.cache import create_cache
+from app.service.loader import BatchLoader, session_loader
+from app.service.singleflight import SingleFlight
+from app.service.write_queue import GroupCommitWriter
 
 logger = logging.getLogger(__name__)
 
+# Whole-blood donors must wait this long between donations
+DONATION_INTERVAL = datetime.timedelta(days=56)
+
+# Ids per IN (...) list; well under SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+# Holds DonorOut snapshots keyed by donor id, never live ORM objects
+donor_cache = create_cache(
+    app_settings.donor_cache_backend,
+    max_entries=app_settings.donor_cache_max_entries,
+    ttl=app_settings.donor_cache_ttl,
+)
+# Read-only mode: selecting the table instead of the entity returns Core Rows.
+# They offer the same attribute access (row.id) but skip the identity map,
+# attribute instrumentation and expiry, so they cost far less per row. Never
+# hand them to code that modifies donors.
+donors_table = Donor.__table__
+# Also used in WHERE clauses: compared through the table, a column is a typed
+# SQL expression, where the models' plain Column attributes type-check as bool
+donations_table = Donation.__table__
+
+# Fields a donor projection may select, in the order DonorOut serialises them
+DONOR_OUT_FIELDS: Tuple[str, ...] = tuple(DonorOut.model_fields)
+
+# Concurrent cache misses for one donor, or requests for one page, share a query
+donor_flight = SingleFlight("donor")
+page_flight = SingleFlight("donor_page")
+
+# Opt-in group commit for donation intake: creates and updates of donations
+# share transactions on the writer connection instead of committing one by one
+donation_writer: Optional[GroupCommitWriter] = (
+    GroupCommitWriter(
+        asyncSessionLocal,
+        max_batch=app_settings.write_queue_max_batch,
+        max_delay=app_settings.write_queue_max_delay_ms / 1000,
+    )
+    if app_settings.donation_write_queue
+    else None
+)
+
+
+# Invalidation counters, one per slot of donor ids (id % slots). A load only
+# fills the cache if its slot was not bumped while it ran; a collision just
+# skips one fill. Fixed size, so memory does not grow with the donors written.
+_DONOR_GENERATION_SLOTS = 4096
+_donor_generations = [0] * _DONOR_GENERATION_SLOTS
+
+
+def _donor_generation(donor_id: int) -> int:
+    return _donor_generations[donor_id % _DONOR_GENERATION_SLOTS]
+
+
+def _invalidate_donor(donor_id: int) -> None:
+    _donor_generations[donor_id % _DONOR_GENERATION_SLOTS] += 1
+    donor_cache.delete(donor_id)
+    # Callers arriving after a write must not join a read that predates it
+    donor_flight.forget(donor_id)
+    page_flight.forget_all()
+
 
 # ========== DONOR  ==========
 
@@ -20,7 +98,11 @@ async def create_donor(db: AsyncSession, donor_in: DonorCreate) -> Donor:
         donor = Donor(**donor_in.model_dump())
         db.add(donor)
         await db.commit()
+        invalidate_donor_count_cache()
         await db.refresh(donor)
+        # A database not yet upgraded to AUTOINCREMENT ids may hand out the
+        # id of a previously deleted last row again
+        _invalidate_donor(cast(int, donor.id))
         logger.debug(f"Donor created with ID: {donor.id}")
         return donor
     except Exception:
@@ -28,11 +110,30 @@ async def create_donor(db: AsyncSession, donor_in: DonorCreate) -> Donor:
         raise
 
 
-async def get_all_donors(db: AsyncSession, skip: int = 0, limit: int = 100):
-    logger.info(f"Fetching all donors (skip={skip}, limit={limit})")
+def _donor_page_query(query, skip: int, limit: int, after_id: Optional[int]):
+    query = query.order_by(donors_table.c.id).limit(limit)
+    if after_id is not None:
+        # Keyset mode: seek on the primary key instead of discarding rows
+        return query.where(donors_table.c.id > after_id)
+    return query.offset(skip)
+
+
+async def get_all_donors(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    read_only: bool = False,
+):
+    """A page of donors; ``read_only=True`` returns Core rows, see donors_table."""
+    logger.info(
+        f"Fetching all donors (skip={skip}, limit={limit}, after_id={after_id}, "
+        f"read_only={read_only})"
+    )
     try:
-        result = await db.execute(select(Donor).offset(skip).limit(limit))
-        donors = result.scalars().all()
+        query = select(donors_table) if read_only else select(Donor)
+        result = await db.execute(_donor_page_query(query, skip, limit, after_id))
+        donors = result.all() if read_only else result.scalars().all()
         logger.debug(f"Retrieved {len(donors)} donors")
         return donors
     except Exception:
@@ -40,13 +141,197 @@ async def get_all_donors(db: AsyncSession, skip: int = 0, limit: int = 100):
         raise
 
 
+async def get_donor_page_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    include_donations: bool = False,
+) -> List[dict]:
+    """A page of donors as plain dicts shaped like DonorOut.
+
+    Reads a column projection, so no ORM objects or models are built, and
+    identical concurrent pages share one query. Treat the dicts as read-only.
+
+    ``fields`` narrows the projection to those DonorOut fields; id and version
+    are always read, for cursors and ETags. ``include_donations`` adds each
+    donor's donations (newest first) under "donations", loaded with
+    selectinload in one extra IN query for the whole page.
+    """
+    names = donor_field_names(fields)
+    page = ("after", after_id, limit) if after_id is not None else (skip, limit)
+    key = (*page, names, include_donations)
+
+    async def load():
+        logger.info(
+            f"Fetching donor rows (skip={skip}, limit={limit}, after_id={after_id}, "
+            f"fields={','.join(names)}, include_donations={include_donations})"
+        )
+        try:
+            columns = [getattr(Donor, name) for name in names]
+            if not include_donations:
+                result = await db.execute(
+                    _donor_page_query(select(*columns), skip, limit, after_id)
+                )
+                return [dict(row._mapping) for row in result]
+
+            query = select(Donor).options(
+                load_only(*columns), selectinload(Donor.donations)
+            )
+            result = await db.execute(_donor_page_query(query, skip, limit, after_id))
+            return [
+                {
+                    **{name: getattr(donor, name) for name in names},
+                    "donations": [
+                        DonationOut.model_validate(d, from_attributes=True).model_dump()
+                        for d in sorted(
+                            donor.donations, key=lambda d: (d.date, d.id), reverse=True
+                        )
+                    ],
+                }
+                for donor in result.scalars().all()
+            ]
+        except Exception:
+            logger.exception("Failed to fetch donor rows")
+            raise
+
+    return list(await page_flight.do(key, load))
+
+
+def donor_field_names(fields: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """DonorOut field names to read, in model order, always with id and version.
+
+    Raises ValueError on a name DonorOut does not have.
+    """
+    if fields is None:
+        return DONOR_OUT_FIELDS
+    unknown = set(fields) - set(DONOR_OUT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown donor fields: {', '.join(sorted(unknown))}")
+    wanted = {*fields, "id", "version"}
+    return tuple(name for name in DONOR_OUT_FIELDS if name in wanted)
+
+
+async def get_donor_page_versions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+):
+    """(id, version) of the rows get_all_donors would return, for ETags."""
+    logger.info(f"Probing donor page versions (skip={skip}, limit={limit})")
+    try:
+        result = await db.execute(
+            _donor_page_query(select(Donor.id, Donor.version), skip, limit, after_id)
+        )
+        return result.all()
+    except Exception:
+        logger.exception("Failed to probe donor page versions")
+        raise
+
+
+async def get_eligible_donors(
+    db: AsyncSession,
+    blood_group: str,
+    limit: int = 100,
+    after_last_donated: Optional[datetime.date] = None,
+    after_id: Optional[int] = None,
+    as_of: Optional[datetime.date] = None,
+):
+    """Donors of ``blood_group`` who may donate on ``as_of`` (default today).
+
+    Never-donated donors come first in id order, then the rest by
+    (last_donated, id) so the longest-rested donors lead. Both phases are
+    range seeks on ix_donors_blood_group_last_donated. Pass the last row's
+    (last_donated, id) back as after_last_donated/after_id for the next page.
+    """
+    cutoff = (as_of or datetime.date.today()) - DONATION_INTERVAL
+    logger.info(
+        f"Fetching eligible {blood_group} donors (cutoff={cutoff}, limit={limit}, "
+        f"after=({after_last_donated}, {after_id}))"
+    )
+    try:
+        donors: list = []
+        if after_last_donated is None:
+            query = (
+                select(Donor)
+                .where(
+                    donors_table.c.blood_group == blood_group,
+                    donors_table.c.last_donated.is_(None),
+                )
+                .order_by(Donor.id)
+                .limit(limit)
+            )
+            if after_id is not None:
+                query = query.where(donors_table.c.id > after_id)
+            result = await db.execute(query)
+            donors.extend(result.scalars().all())
+            after_id = None
+
+        if len(donors) < limit:
+            query = (
+                select(Donor)
+                .where(
+                    donors_table.c.blood_group == blood_group,
+                    donors_table.c.last_donated <= cutoff,
+                )
+                .order_by(Donor.last_donated, Donor.id)
+                .limit(limit - len(donors))
+            )
+            if after_last_donated is not None:
+                query = query.where(
+                    tuple_(Donor.last_donated, Donor.id)
+                    > tuple_(after_last_donated, after_id)
+                )
+            result = await db.execute(query)
+            donors.extend(result.scalars().all())
+        logger.debug(f"Retrieved {len(donors)} eligible donors")
+        return donors
+    except Exception:
+        logger.exception(f"Failed to fetch eligible {blood_group} donors")
+        raise
+
+
+def _chunks(ids: List[int]) -> Iterator[List[int]]:
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        yield ids[start : start + ID_CHUNK_SIZE]
+
+
+async def _load_donors(db: AsyncSession, donor_ids: List[int]) -> Dict[int, Donor]:
+    donors: Dict[int, Donor] = {}
+    for chunk in _chunks(donor_ids):
+        result = await db.execute(select(Donor).where(donors_table.c.id.in_(chunk)))
+        donors.update((cast(int, donor.id), donor) for donor in result.scalars().all())
+    return donors
+
+
+async def _load_donor_rows(db: AsyncSession, donor_ids: List[int]) -> Dict[int, Row]:
+    rows: Dict[int, Row] = {}
+    for chunk in _chunks(donor_ids):
+        result = await db.execute(
+            select(donors_table).where(donors_table.c.id.in_(chunk))
+        )
+        rows.update((row.id, row) for row in result)
+    return rows
+
+
+def donor_loader(db: AsyncSession, read_only: bool = False) -> BatchLoader:
+    """Request-scoped loader; lookups from one event-loop tick share a query."""
+    if read_only:
+        return session_loader(db, _load_donor_rows)
+    return session_loader(db, _load_donors)
+
+
 async def get_donor(
-    db: AsyncSession, donor_id: int, raise_error_when_not_found: bool = True
+    db: AsyncSession,
+    donor_id: int,
+    raise_error_when_not_found: bool = True,
+    read_only: bool = False,
 ):
     logger.info(f"Fetching donor ID: {donor_id}")
     try:
-        result = await db.execute(select(Donor).filter(Donor.id == donor_id))
-        donor = result.scalar_one_or_none()
+        donor = await donor_loader(db, read_only).load(donor_id)
         if donor is None and raise_error_when_not_found:
             logger.warning(f"Donor with ID {donor_id} not found")
             raise HTTPException(status_code=404, detail="Donor not found")
@@ -56,45 +341,157 @@ async def get_donor(
         raise
 
 
+async def get_donors_by_ids(
+    db: AsyncSession, donor_ids: List[int], read_only: bool = False
+):
+    """Donors in the order requested; unknown ids are left out."""
+    logger.info(f"Fetching {len(donor_ids)} donors by id")
+    try:
+        donors = await donor_loader(db, read_only).load_many(donor_ids)
+        return [donor for donor in donors if donor is not None]
+    except Exception:
+        logger.exception("Failed to fetch donors by id")
+        raise
+
+
+async def get_donor_version(db: AsyncSession, donor_id: int) -> int:
+    """Narrow probe for conditional GETs; raises 404 like get_donor."""
+    logger.info(f"Probing version of donor ID: {donor_id}")
+    try:
+        result = await db.execute(
+            select(donors_table.c.version).where(donors_table.c.id == donor_id)
+        )
+        version = result.scalar_one_or_none()
+        if version is None:
+            logger.warning(f"Donor with ID {donor_id} not found")
+            raise HTTPException(status_code=404, detail="Donor not found")
+        return version
+    except Exception:
+        logger.exception(f"Failed to probe donor ID: {donor_id}")
+        raise
+
+
+async def get_donor_out(db: AsyncSession, donor_id: int) -> DonorOut:
+    """Read-through cached view of a donor for read-only callers."""
+    cached = donor_cache.get(donor_id)
+    if cached is not None:
+        logger.debug(f"Donor ID {donor_id} served from cache")
+        return cached
+    return await donor_flight.do(donor_id, lambda: _load_donor_out(db, donor_id))
+
+
+async def _load_donor_out(db: AsyncSession, donor_id: int) -> DonorOut:
+    generation = _donor_generation(donor_id)
+    donor = await get_donor(db, donor_id, True, read_only=True)
+    donor_out = DonorOut.model_validate(donor, from_attributes=True)
+    # A write that committed while we read would be undone by caching this
+    if generation == _donor_generation(donor_id):
+        donor_cache.set(donor_id, donor_out)
+    return donor_out
+
+
+async def _apply_locked_update(db: AsyncSession, model, row_id: int, update_in, label):
+    """Apply an optimistic-lock update in one UPDATE ... RETURNING statement.
+
+    The lock check happens inside the WHERE clause, so it is atomic with the
+    write. Only when no row matches is a second query run, to tell a missing
+    row (404) from a stale lock token (409). Nothing is committed or rolled
+    back here; a raise leaves the transaction without changes.
+    """
+    version = update_in.version
+    if version is None:
+        # Legacy clients send updated_at; translate it to the version it saw.
+        # The UPDATE below still checks that version, so this stays race-free.
+        current = await db.execute(
+            select(model.version, model.updated_at).where(model.id == row_id)
+        )
+        row = current.one_or_none()
+        if row is not None and row.updated_at == update_in.updated_at:
+            version = row.version
+    lock_clause = model.version == version
+    values = {
+        key: value
+        for key, value in update_in.model_dump(
+            exclude={"version", "updated_at"}
+        ).items()
+        if value is not None
+    }
+    result = await db.execute(
+        update(model)
+        .where(model.id == row_id, lock_clause)
+        .values(**values, version=model.version + 1)
+        .returning(model)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    row = result.scalar_one_or_none()
+    if row is None:
+        exists = await db.execute(select(model.id).where(model.id == row_id))
+        if exists.scalar_one_or_none() is None:
+            logger.warning(f"{label} with ID {row_id} not found")
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        logger.warning(
+            f"Optimistic lock failed for {label.lower()} {row_id}: "
+            f"client version={update_in.version}, updated_at={update_in.updated_at}"
+        )
+        raise HTTPException(
+            status_code=409,
+            detail=f"{label} was updated by another process. Please refresh and try again.",
+        )
+    return row
+
+
+async def _update_with_lock(db: AsyncSession, model, row_id: int, update_in, label):
+    try:
+        row = await _apply_locked_update(db, model, row_id, update_in, label)
+    except HTTPException:
+        await db.rollback()
+        raise
+    await db.commit()
+    return row
+
+
 async def update_donor(db: AsyncSession, donor_id: int, donor_in: DonorUpdate):
     logger.info(f"Updating donor ID: {donor_id}")
     try:
-        donor = await get_donor(db, donor_id, True)
-        # Optimistic locking check
-        if donor_in.updated_at != donor.updated_at:  # type: ignore
-            logger.warning(
-                f"Optimistic lock failed for donor {donor_id}: "
-                f"client updated_at={donor_in.updated_at}, db updated_at={donor.updated_at}"  # type: ignore
-            )
-            raise HTTPException(
-                status_code=409,
-                detail="Donor was updated by another process. Please refresh and try again.",
-            )
-
-        # Update all fields except 'updated_at'
-        for key, value in donor_in.model_dump(exclude={"updated_at"}).items():
-            if value is not None:
-                setattr(donor, key, value)
-        await db.commit()
-        await db.refresh(donor)
-        logger.debug(f"Updated donor ID: {donor_id}")
+        donor = await _update_with_lock(db, Donor, donor_id, donor_in, "Donor")
+        _invalidate_donor(donor_id)
+        logger.debug(f"Updated donor ID: {donor_id} to version {donor.version}")
         return donor
     except Exception:
         logger.exception(f"Failed to update donor ID: {donor_id}")
         raise
 
 
+def _has_no_donations():
+    return ~exists().where(donations_table.c.donor_id == donors_table.c.id)
+
+
 async def delete_donor(db: AsyncSession, donor_id: int):
     logger.info(f"Deleting donor ID: {donor_id}")
     try:
-        donor = await get_donor(db, donor_id, True)
-        if await get_donations_for_donor(db, donor_id):
+        # The donations guard is part of the DELETE, so nothing is loaded first
+        result: Result = await db.execute(
+            delete(Donor)
+            .where(donors_table.c.id == donor_id, _has_no_donations())
+            .returning(Donor.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            found = await db.execute(
+                select(donors_table.c.id).where(donors_table.c.id == donor_id)
+            )
+            donor_exists = found.scalar_one_or_none() is not None
+            await db.rollback()
+            if not donor_exists:
+                logger.warning(f"Donor with ID {donor_id} not found")
+                raise HTTPException(status_code=404, detail="Donor not found")
             logger.warning(f"Cannot delete donor ID {donor_id}: has donations")
             raise HTTPException(
                 status_code=400, detail="Cannot delete donor with existing donations"
             )
-        await db.delete(donor)
         await db.commit()
+        invalidate_donor_count_cache()
+        _invalidate_donor(donor_id)
         logger.info(f"Deleted donor ID: {donor_id}")
         return {"detail": "Donor deleted successfully"}
     except Exception:
@@ -102,12 +499,94 @@ async def delete_donor(db: AsyncSession, donor_id: int):
         raise
 
 
+async def batch_delete_donors(
+    db: AsyncSession, donor_ids: List[int]
+) -> BatchDeleteResult:
+    """Delete many donors in one transaction with a result per unique id.
+
+    Donors with donations are skipped, as in delete_donor.
+    """
+    ids = list(dict.fromkeys(donor_ids))
+    logger.info(f"Batch deleting {len(ids)} donors")
+    deleted: set = set()
+    blocked: set = set()
+    try:
+        for chunk in _chunks(ids):
+            result: Result = await db.execute(
+                delete(Donor)
+                .where(donors_table.c.id.in_(chunk), _has_no_donations())
+                .returning(Donor.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted.update(result.scalars().all())
+        # Whatever survived but still exists must have been blocked by donations
+        for chunk in _chunks([i for i in ids if i not in deleted]):
+            result = await db.execute(
+                select(donors_table.c.id).where(donors_table.c.id.in_(chunk))
+            )
+            blocked.update(result.scalars().all())
+        await db.commit()
+    except Exception:
+        logger.exception("Failed to batch delete donors")
+        await db.rollback()
+        raise
+
+    invalidate_donor_count_cache()
+    for donor_id in deleted:
+        _invalidate_donor(donor_id)
+    logger.info(f"Batch deleted {len(deleted)} of {len(ids)} donors")
+    return BatchDeleteResult(
+        deleted=len(deleted),
+        results=[
+            BatchDeleteItem(
+                id=i,
+                status=(
+                    "deleted"
+                    if i in deleted
+                    else "has_donations" if i in blocked else "not_found"
+                ),
+            )
+            for i in ids
+        ],
+    )
+
+
 async def get_total_donor_count(db: AsyncSession) -> int:
     result = await db.execute(select(func.count()).select_from(Donor))
     total = result.scalar_one()
     return total
 
 
+@dataclass
+class _CachedCount:
+    value: Optional[int] = None
+    expires_at: float = 0.0
+    # Bumped on every invalidation so a count that raced a write is discarded
+    generation: int = 0
+
+
+_donor_count_cache = _CachedCount()
+
+
+def invalidate_donor_count_cache() -> None:
+    _donor_count_cache.value = None
+    _donor_count_cache.generation += 1
+
+
+async def get_cached_donor_count(db: AsyncSession) -> int:
+    cache = _donor_count_cache
+    now = time.monotonic()
+    if cache.value is not None and now < cache.expires_at:
+        return cache.value
+
+    generation = cache.generation
+    total = await get_total_donor_count(db)
+    if generation == cache.generation:
+        cache.value = total
+        cache.expires_at = now + app_settings.donor_count_cache_ttl
+    return total
+
+
 # ========== DONATION  ==========
 
 
@@ -122,15 +601,85 @@ async def get_donations_for_donor(db: AsyncSession, donor_id: int):
         raise
 
 
+async def get_donation_page(
+    db: AsyncSession,
+    donor_id: int,
+    limit: int = 100,
+    after_date: Optional[datetime.date] = None,
+    after_id: Optional[int] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+):
+    """A donor's donations, newest first, optionally within [date_from, date_to].
+
+    Ordered by (date DESC, id DESC) so the page is one backwards range read
+    of ix_donations_donor_id_date_id, however long the history is. Pass the
+    last row's (date, id) back as after_date/after_id for the next page.
+    """
+    logger.info(
+        f"Fetching donations for donor ID: {donor_id} (limit={limit}, "
+        f"after=({after_date}, {after_id}), range=[{date_from}, {date_to}])"
+    )
+    try:
+        query = (
+            select(Donation)
+            .where(donations_table.c.donor_id == donor_id)
+            .order_by(donations_table.c.date.desc(), donations_table.c.id.desc())
+            .limit(limit)
+        )
+        if date_from is not None:
+            query = query.where(donations_table.c.date >= date_from)
+        if date_to is not None:
+            query = query.where(donations_table.c.date <= date_to)
+        if after_date is not None:
+            query = query.where(
+                tuple_(Donation.date, Donation.id) < tuple_(after_date, after_id)
+            )
+        result = await db.execute(query)
+        donations = result.scalars().all()
+        logger.debug(f"Retrieved {len(donations)} donations")
+        return donations
+    except Exception:
+        logger.exception(f"Failed to fetch donations for donor ID: {donor_id}")
+        raise
+
+
+async def donor_has_donations(db: AsyncSession, donor_id: int) -> bool:
+    """EXISTS probe that stops at the first matching donation."""
+    result = await db.execute(
+        select(exists().where(donations_table.c.donor_id == donor_id))
+    )
+    return bool(result.scalar())
+
+
+async def _insert_donation(
+    db: AsyncSession, donor_id: int, donation_in: DonationCreate
+) -> Donation:
+    """Single INSERT ... RETURNING, as the group-commit writer requires."""
+    data = donation_in.model_dump()
+    data.pop("donor_id", None)
+    result = await db.execute(
+        insert(Donation).values(**data, donor_id=donor_id).returning(Donation)
+    )
+    return result.scalar_one()
+
+
 async def create_donation(db: AsyncSession, donor_id: int, donation_in: DonationCreate):
     logger.info(f"Creating donation for donor ID: {donor_id}")
     try:
-        data = donation_in.model_dump()
-        data.pop("donor_id", None)
-        donation = Donation(**data, donor_id=donor_id)
-        db.add(donation)
-        await db.commit()
-        await db.refresh(donation)
+        if donation_writer is not None:
+            donation: Donation = await donation_writer.submit(
+                lambda session: _insert_donation(session, donor_id, donation_in)
+            )
+            _invalidate_donor(donor_id)
+        else:
+            data = donation_in.model_dump()
+            data.pop("donor_id", None)
+            donation = Donation(**data, donor_id=donor_id)
+            db.add(donation)
+            await db.commit()
+            _invalidate_donor(donor_id)
+            await db.refresh(donation)
         logger.debug(f"Donation created with ID: {donation.id}")
         return donation
     except Exception:
@@ -159,23 +708,19 @@ async def update_donation(
 ):
     logger.info(f"Updating donation ID: {donation_id}")
     try:
-        donation = await get_donation(db, donation_id, True)
-        # Optimistic locking check
-        if donation_in.updated_at != donation.updated_at:  # type: ignore
-            logger.warning(
-                f"Optimistic lock failed for donation {donation_id}: "
-                f"client updated_at={donation_in.updated_at}, db updated_at={donation.updated_at}"  # type: ignore
+        if donation_writer is not None:
+            donation: Donation = await donation_writer.submit(
+                lambda session: _apply_locked_update(
+                    session, Donation, donation_id, donation_in, "Donation"
+                )
             )
-            raise HTTPException(
-                status_code=409,
-                detail="Donation was updated by another process. Please refresh and try again.",
+        else:
+            donation = await _update_with_lock(
+                db, Donation, donation_id, donation_in, "Donation"
             )
-        for key, value in donation_in.model_dump(exclude={"updated_at"}).items():
-            if value is not None:
-                setattr(donation, key, value)
-        await db.commit()
-        await db.refresh(donation)
-        logger.debug(f"Updated donation ID: {donation_id}")
+        logger.debug(
+            f"Updated donation ID: {donation_id} to version {donation.version}"
+        )
         return donation
     except Exception:
         logger.exception(f"Failed to update donation ID: {donation_id}")
@@ -185,11 +730,51 @@ async def update_donation(
 async def delete_donation(db: AsyncSession, donation_id: int):
     logger.info(f"Deleting donation ID: {donation_id}")
     try:
-        donation = await get_donation(db, donation_id, True)
-        await db.delete(donation)
+        result: Result = await db.execute(
+            delete(Donation)
+            .where(donations_table.c.id == donation_id)
+            .returning(Donation.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            logger.warning(f"Donation with ID {donation_id} not found")
+            raise HTTPException(status_code=404, detail="Donation not found")
         await db.commit()
         logger.info(f"Deleted donation ID: {donation_id}")
         return {"detail": "Donation deleted successfully"}
     except Exception:
         logger.exception(f"Failed to delete donation ID: {donation_id}")
         raise
+
+
+async def batch_delete_donations(
+    db: AsyncSession, donation_ids: List[int]
+) -> BatchDeleteResult:
+    """Delete many donations in one transaction with a result per unique id."""
+    ids = list(dict.fromkeys(donation_ids))
+    logger.info(f"Batch deleting {len(ids)} donations")
+    deleted: set = set()
+    try:
+        for chunk in _chunks(ids):
+            result: Result = await db.execute(
+                delete(Donation)
+                .where(donations_table.c.id.in_(chunk))
+                .returning(Donation.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted.update(result.scalars().all())
+        await db.commit()
+    except Exception:
+        logger.exception("Failed to batch delete donations")
+        await db.rollback()
+        raise
+
+    logger.info(f"Batch deleted {len(deleted)} of {len(ids)} donations")
+    return BatchDeleteResult(
+        deleted=len(deleted),
+        results=[
+            BatchDeleteItem(id=i, status="deleted" if i in deleted else "not_found")
+            for i in ids
+        ],
+    )
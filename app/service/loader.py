@@ -0,0 +1,98 @@
+import asyncio
+import functools
+import logging
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFn = Callable[[List[K]], Awaitable[Dict[K, V]]]
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesce ``load()`` calls made in one event-loop tick into one batch call.
+
+    ``batch_fn`` receives the unique keys and returns a dict; keys it leaves
+    out resolve to ``None``. Batches run one at a time because they share the
+    caller's session. Nothing is memoised across batches, so a load after a
+    write always sees the new row.
+    """
+
+    def __init__(self, batch_fn: BatchFn):
+        self._batch_fn = batch_fn
+        self._pending: Dict[K, List[asyncio.Future]] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: set = set()
+        self.batches = 0
+        self.loads = 0
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self.loads += 1
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: Dict[K, List[asyncio.Future]]):
+        # Keys whose callers all went away are not worth querying
+        keys = [
+            k for k, futures in pending.items() if not all(f.done() for f in futures)
+        ]
+        if not keys:
+            return
+        async with self._lock:
+            self.batches += 1
+            logger.debug(f"Loading batch of {len(keys)} keys")
+            try:
+                values = await self._batch_fn(keys)
+            except asyncio.CancelledError:
+                for futures in pending.values():
+                    for future in futures:
+                        future.cancel()
+                raise
+            except Exception as exc:
+                for futures in pending.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(exc)
+                return
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(values.get(key))
+
+
+def session_loader(db, batch_fn: Callable[..., Awaitable[Dict]]) -> BatchLoader:
+    """The loader for ``batch_fn(db, keys)`` bound to ``db``, made on first use.
+
+    Loaders live in ``db.info``; get_db opens one session per request, so
+    every call made while serving a request shares them.
+    """
+    loaders = db.info.setdefault("batch_loaders", {})
+    loader = loaders.get(batch_fn)
+    if loader is None:
+        loader = loaders[batch_fn] = BatchLoader(functools.partial(batch_fn, db))
+    return loader
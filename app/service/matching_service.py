@@ -0,0 +1,103 @@
+import datetime
+import heapq
+import logging
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models import Donor
+from app.service.donor_service import DONATION_INTERVAL, donors_table
+
+logger = logging.getLogger(__name__)
+
+# Bit position of each group in a compatibility mask
+BLOOD_GROUPS: Tuple[str, ...] = ("O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+")
+_GROUP_BIT: Dict[str, int] = {group: 1 << i for i, group in enumerate(BLOOD_GROUPS)}
+
+
+def _can_donate(donor_group: str, recipient_group: str) -> bool:
+    """ABO/Rh red-cell rule: the donor may carry no antigen the recipient lacks."""
+    donor_antigens = set(donor_group[:-1]) - {"O"}
+    recipient_antigens = set(recipient_group[:-1]) - {"O"}
+    rh_ok = donor_group[-1] == "-" or recipient_group[-1] == "+"
+    return donor_antigens <= recipient_antigens and rh_ok
+
+
+# recipient group -> mask of donor groups it can receive from
+COMPATIBLE_DONOR_MASK: Dict[str, int] = {
+    recipient: sum(_GROUP_BIT[d] for d in BLOOD_GROUPS if _can_donate(d, recipient))
+    for recipient in BLOOD_GROUPS
+}
+_COMPATIBLE_DONOR_GROUPS: Dict[str, Tuple[str, ...]] = {
+    recipient: tuple(d for d in BLOOD_GROUPS if mask & _GROUP_BIT[d])
+    for recipient, mask in COMPATIBLE_DONOR_MASK.items()
+}
+
+
+def is_compatible(donor_group: str, recipient_group: str) -> bool:
+    return bool(COMPATIBLE_DONOR_MASK[recipient_group] & _GROUP_BIT[donor_group])
+
+
+def compatible_donor_groups(recipient_group: str) -> Tuple[str, ...]:
+    return _COMPATIBLE_DONOR_GROUPS[recipient_group]
+
+
+def _rank_key(recipient_group: str):
+    # Longest rested first (never donated before anyone), then an exact group
+    # match so universal O- donors are kept for those who need them
+    def key(donor: Donor):
+        return (
+            donor.last_donated is not None,
+            donor.last_donated or datetime.date.min,
+            donor.blood_group != recipient_group,
+            donor.id,
+        )
+
+    return key
+
+
+async def find_matching_donors(
+    db: AsyncSession,
+    recipient_blood_group: str,
+    units: int,
+    as_of: Optional[datetime.date] = None,
+) -> List[Donor]:
+    """Rank eligible donors whose blood a recipient can receive.
+
+    Runs one seek on ix_donors_blood_group_last_donated per compatible group.
+    The index keeps NULLs first and ineligible (recent) donors last, so each
+    seek stops after ``units`` rows; the per-group lists are then merged.
+    """
+    cutoff = (as_of or datetime.date.today()) - DONATION_INTERVAL
+    groups = compatible_donor_groups(recipient_blood_group)
+    logger.info(
+        f"Matching {units} units for {recipient_blood_group} "
+        f"across groups {groups} (cutoff={cutoff})"
+    )
+    try:
+        candidates: List[Sequence[Donor]] = []
+        for group in groups:
+            result = await db.execute(
+                select(Donor)
+                .where(
+                    donors_table.c.blood_group == group,
+                    or_(
+                        donors_table.c.last_donated.is_(None),
+                        donors_table.c.last_donated <= cutoff,
+                    ),
+                )
+                .order_by(Donor.last_donated, Donor.id)
+                .limit(units)
+            )
+            candidates.append(result.scalars().all())
+
+        key = _rank_key(recipient_blood_group)
+        matches = list(islice(heapq.merge(*candidates, key=key), units))
+        logger.debug(f"Matched {len(matches)} donors for {recipient_blood_group}")
+        return matches
+    except Exception:
+        logger.exception(f"Failed to match donors for {recipient_blood_group}")
+        raise
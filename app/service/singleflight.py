@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The caller running the shared call was cancelled before it finished."""
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    executions: int = 0  # calls that ran the function themselves
+    shared: int = 0  # calls that awaited someone else's execution
+    errors: int = 0
+    takeovers: int = 0  # followers that re-ran after the leader was cancelled
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller (the leader) runs the function on its own session and
+    the others await its result. Share only immutable results such as
+    DonorOut snapshots, never ORM objects bound to the leader's session.
+
+    Cancelling a follower does not affect anyone else. If the leader is
+    cancelled, its session is going away, so one waiting follower takes over
+    and runs the function itself. Errors are not retried; every caller sees
+    the leader's exception. Per-key stats are kept for the ``max_tracked_keys``
+    most recently used keys.
+    """
+
+    def __init__(self, name: str, max_tracked_keys: int = 1024):
+        self.name = name
+        self.max_tracked_keys = max_tracked_keys
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._stats: OrderedDict[Hashable, FlightStats] = OrderedDict()
+        self.totals = FlightStats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        stats = self._key_stats(key)
+        stats.calls += 1
+        self.totals.calls += 1
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                return await self._lead(key, fn, stats)
+            stats.shared += 1
+            self.totals.shared += 1
+            try:
+                # shield: a cancelled follower must not cancel the shared call
+                return await asyncio.shield(call)
+            except _LeaderCancelled:
+                stats.takeovers += 1
+                self.totals.takeovers += 1
+                logger.debug(f"{self.name}: leader for {key!r} cancelled, taking over")
+
+    async def _lead(self, key, fn, stats: FlightStats):
+        call = asyncio.get_running_loop().create_future()
+        # Mark the outcome retrieved so an error with no followers is not logged
+        call.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = call
+        stats.executions += 1
+        self.totals.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.set_exception(_LeaderCancelled())
+            raise
+        except Exception as exc:
+            stats.errors += 1
+            self.totals.errors += 1
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def forget(self, key: Hashable) -> None:
+        """Start a fresh execution for later callers, e.g. after a write."""
+        self._calls.pop(key, None)
+
+    def forget_all(self) -> None:
+        self._calls.clear()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _key_stats(self, key: Hashable) -> FlightStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = FlightStats()
+            if len(self._stats) > self.max_tracked_keys:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        return stats
+
+    def stats(self, key: Optional[Hashable] = None) -> Dict[str, int]:
+        if key is not None:
+            return asdict(self._stats.get(key, FlightStats()))
+        return {**asdict(self.totals), "in_flight": self.in_flight}
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WriteOp = Callable[[AsyncSession], Awaitable[T]]
+
+
+@dataclass
+class _Pending:
+    op: WriteOp
+    future: asyncio.Future
+
+
+@dataclass
+class WriterStats:
+    batches: int = 0
+    writes: int = 0
+    failed_writes: int = 0  # operations that raised; the rest of their batch commits
+    failed_commits: int = 0
+    largest_batch: int = 0
+
+
+class GroupCommitWriter:
+    """Run write operations from many callers in shared transactions.
+
+    One background task takes operations off a queue and runs them in order
+    on a single session. It commits once per batch, when ``max_batch``
+    operations have been collected or ``max_delay`` seconds after the first
+    one arrived. Each caller's future resolves after that commit, with its
+    own result or its own exception.
+
+    An operation must issue at most one write statement. SQLite undoes only
+    the statement that failed, so an operation that raises (a 404, a 409, a
+    constraint violation) leaves the rest of its batch intact. If the commit
+    itself fails, every caller in the batch gets that error.
+    """
+
+    def __init__(self, session_factory, max_batch: int = 256, max_delay: float = 0.002):
+        self._session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.stats = WriterStats()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+
+    async def submit(self, op: WriteOp) -> T:
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(op, future))
+        self._wakeup.set()
+        return await future
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        # Queues and events belong to one loop; start afresh on a new one
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run(), name="group-commit-writer")
+
+    async def close(self):
+        """Commit everything already submitted, then stop the writer task."""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(None)
+        self._wakeup.set()
+        await self._task
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    pending = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    continue
+                if pending is None:
+                    closing = True
+                    break
+                batch.append(pending)
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[_Pending]):
+        # Callers that were cancelled while queued are skipped
+        live = [pending for pending in batch if not pending.future.done()]
+        if not live:
+            return
+        outcomes: List[Tuple[_Pending, Any, Optional[BaseException]]] = []
+        try:
+            async with self._session_factory() as db:
+                for pending in live:
+                    try:
+                        outcomes.append((pending, await pending.op(db), None))
+                    except Exception as exc:
+                        outcomes.append((pending, None, exc))
+                await db.commit()
+        except Exception as exc:
+            logger.exception(f"Group commit of {len(live)} writes failed")
+            self.stats.failed_commits += 1
+            for pending in live:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+
+        self.stats.batches += 1
+        self.stats.writes += len(live)
+        self.stats.largest_batch = max(self.stats.largest_batch, len(live))
+        logger.debug(f"Group commit of {len(live)} writes")
+        for pending, result, error in outcomes:
+            if pending.future.done():
+                continue
+            if error is not None:
+                self.stats.failed_writes += 1
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(result)
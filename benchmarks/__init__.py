@@ -0,0 +1,11 @@
+"""Benchmarks for the blood donation service.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.pagination_bench``.
+Benchmarks build throwaway SQLite databases, so they never touch local_db/.
+"""
+
+import os
+
+# app.core.app_config requires DATABASE_URL at import time; benchmarks bring
+# their own engines, so any value works here.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
@@ -0,0 +1,99 @@
+import contextlib
+import datetime
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import AsyncIterator, Awaitable, Callable, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.bootstrap_db import generate_data
+from app.db.models import Donor
+from app.db.session import Base
+
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+_EPOCH = datetime.date(2025, 1, 1)
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "blood-bench-data")
+
+
+@contextlib.asynccontextmanager
+async def temp_database(name: str = "bench") -> AsyncIterator[AsyncEngine]:
+    """Create an empty schema in a temporary SQLite file and drop it afterwards."""
+    tmpdir = tempfile.mkdtemp(prefix="blood-bench-")
+    path = os.path.join(tmpdir, f"{name}.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+async def seed_donors(engine: AsyncEngine, count: int, batch_size: int = 10_000):
+    """Insert ``count`` donors with ids 1..count using batched executemany."""
+    async with engine.begin() as conn:
+        for start in range(0, count, batch_size):
+            batch = [
+                {
+                    "name": f"Donor {i}",
+                    "blood_group": BLOOD_GROUPS[i % len(BLOOD_GROUPS)],
+                    "age": 18 + i % 52,
+                    # A fifth never donated; the rest spread over two years
+                    "last_donated": (
+                        None
+                        if i % 5 == 0
+                        else _EPOCH - datetime.timedelta(days=i * 7919 % 730)
+                    ),
+                }
+                for i in range(start, min(start + batch_size, count))
+            ]
+            await conn.execute(insert(Donor), batch)
+
+
+async def prepare_database(
+    donors: int,
+    donations_per_donor: Tuple[int, int],
+    seed: int,
+    data_dir: str = DEFAULT_DATA_DIR,
+    today: datetime.date = _EPOCH,
+) -> str:
+    """Generate (once) and cache a data set; return the cached file's path."""
+    os.makedirs(data_dir, exist_ok=True)
+    low, high = donations_per_donor
+    path = os.path.join(data_dir, f"donors-{donors}-d{low}-{high}-s{seed}.db")
+    if not os.path.exists(path):
+        partial = f"{path}.partial"
+        stats = await generate_data(
+            f"sqlite+aiosqlite:///{partial}",
+            donors,
+            donations_per_donor,
+            seed=seed,
+            today=today,
+        )
+        os.replace(partial, path)
+        print(
+            f"generated {stats.donors:,} donors / {stats.donations:,} donations "
+            f"({stats.rows_per_sec:,.0f} rows/sec)"
+        )
+    return path
+
+
+async def time_async(fn: Callable[[], Awaitable], repeat: int) -> List[float]:
+    """Run ``fn`` ``repeat`` times and return the latencies in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(pct) - 1]
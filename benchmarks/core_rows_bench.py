@@ -0,0 +1,77 @@
+"""Compare ORM entities with read-only Core rows for page reads.
+
+    python -m benchmarks.core_rows_bench --rows 10000 --page 1000 --repeat 20
+
+Each run opens a fresh session, as a request would, fetches one page with
+get_all_donors, and converts it to DonorOut. Latency comes from wall time.
+Memory comes from tracemalloc: the peak while serving the page and what the
+fetched rows still hold afterwards. Figures are normalised per 1,000 rows.
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.schemas import DonorOut
+from app.service import get_all_donors
+from benchmarks.common import percentile, seed_donors, temp_database, time_async
+
+
+async def _read_page(session_factory, page: int, read_only: bool):
+    async with session_factory() as db:
+        donors = await get_all_donors(db, limit=page, read_only=read_only)
+        return donors, [
+            DonorOut.model_validate(d, from_attributes=True) for d in donors
+        ]
+
+
+async def _memory(session_factory, page: int, read_only: bool):
+    gc.collect()
+    tracemalloc.start()
+    async with session_factory() as db:
+        donors = await get_all_donors(db, limit=page, read_only=read_only)
+        [DonorOut.model_validate(d, from_attributes=True) for d in donors]
+        held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, peak
+
+
+async def run(rows: int, page: int, repeat: int):
+    async with temp_database("core-rows") as engine:
+        await seed_donors(engine, rows)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        scale = 1000 / page
+
+        print(f"{rows} donors, {page}-row pages, {repeat} runs; figures per 1,000 rows")
+        print(
+            f"{'mode':<10} {'p50 ms':>9} {'p95 ms':>9} {'held KiB':>10} {'peak KiB':>10}"
+        )
+        for name, read_only in (("orm", False), ("core", True)):
+            timings = await time_async(
+                lambda: _read_page(session_factory, page, read_only), repeat
+            )
+            held, peak = await _memory(session_factory, page, read_only)
+            print(
+                f"{name:<10} {percentile(timings, 50) * scale:>9.3f}"
+                f" {percentile(timings, 95) * scale:>9.3f}"
+                f" {held * scale / 1024:>10.1f} {peak * scale / 1024:>10.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    # The service logs every page read at INFO; keep output readable
+    logging.getLogger("app").setLevel(logging.WARNING)
+    asyncio.run(run(args.rows, args.page, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
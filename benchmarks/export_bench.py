@@ -0,0 +1,59 @@
+"""Measure streaming export throughput (rows/sec) and peak memory.
+
+    python -m benchmarks.export_bench --rows 100000 --rows 400000
+
+Peak traced memory should stay roughly the same as the row count grows,
+since rows are pulled from a server-side cursor one batch at a time.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.service import export_donors
+from benchmarks.common import seed_donors, temp_database
+
+
+async def _drain(session_factory, fmt: str, batch_size: int) -> int:
+    written = 0
+    async with session_factory() as db:
+        async for chunk in export_donors(db, fmt, batch_size):
+            written += len(chunk)
+    return written
+
+
+async def run(row_counts, batch_size: int):
+    print(f"{'rows':>10} {'format':>7} {'rows/sec':>12} {'MB out':>8} {'peak KB':>9}")
+    for rows in row_counts:
+        async with temp_database("export") as engine:
+            await seed_donors(engine, rows)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            for fmt in ("ndjson", "csv"):
+                start = time.perf_counter()
+                written = await _drain(session_factory, fmt, batch_size)
+                elapsed = time.perf_counter() - start
+
+                tracemalloc.start()
+                await _drain(session_factory, fmt, batch_size)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                print(
+                    f"{rows:>10} {fmt:>7} {rows / elapsed:>12,.0f}"
+                    f" {written / 1e6:>8.1f} {peak / 1024:>9,.0f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, action="append")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows or [100_000, 400_000], args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Donation intake throughput with and without the group-commit writer.
+
+    python -m benchmarks.group_commit_bench --kiosks 64 --duration 5
+
+Each kiosk records donations back to back through create_donation on the
+app's single writer connection. "direct" commits every donation on its
+own; "group" sends them through GroupCommitWriter, which commits up to
+--max-batch at a time. Run it with SQLITE_SYNCHRONOUS=full to see the
+fsync cost that group commit spreads over a batch.
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.schemas import DonationCreate
+from app.core import app_settings
+from app.db.session import _create_engine
+from app.service import donor_service
+from app.service.write_queue import GroupCommitWriter
+from benchmarks.common import percentile, prepare_database
+
+
+async def _kiosk(session_factory, rng, donors, deadline, latencies: List[float]):
+    while time.perf_counter() < deadline:
+        donor_id = rng.randint(1, donors)
+        donation = DonationCreate(
+            date=datetime.date(2025, 1, 1),
+            volume_ml=450,
+            location="Donation Drive",
+            hemoglobin=None,
+            pulse=None,
+            blood_pressure=None,
+            donor_id=donor_id,
+        )
+        start = time.perf_counter()
+        async with session_factory() as db:
+            await donor_service.create_donation(db, donor_id, donation)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run_mode(mode: str, cached: str, args) -> Dict[str, float]:
+    workdir = tempfile.mkdtemp(prefix="blood-bench-")
+    path = os.path.join(workdir, f"{mode}.db")
+    shutil.copyfile(cached, path)
+    engine = _create_engine(f"sqlite+aiosqlite:///{path}", pool_size=1, max_overflow=0)
+    engine.echo = False
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    writer = None
+    if mode == "group":
+        writer = GroupCommitWriter(
+            session_factory,
+            max_batch=args.max_batch,
+            max_delay=args.max_delay_ms / 1000,
+        )
+    previous, donor_service.donation_writer = donor_service.donation_writer, writer
+    latencies: List[float] = []
+    try:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(
+                _kiosk(
+                    session_factory, random.Random(i), args.donors, deadline, latencies
+                )
+                for i in range(args.kiosks)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        if writer is not None:
+            await writer.close()
+    finally:
+        donor_service.donation_writer = previous
+        await engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "inserts/sec": len(latencies) / elapsed,
+        "p50 ms": percentile(latencies, 50),
+        "p99 ms": percentile(latencies, 99),
+        "commits": writer.stats.batches if writer else len(latencies),
+    }
+
+
+async def run(args):
+    cached = await prepare_database(args.donors, (0, 10), seed=42)
+    results = {mode: await run_mode(mode, cached, args) for mode in ("direct", "group")}
+    print(
+        f"{args.kiosks} kiosks for {args.duration:.0f}s, "
+        f"synchronous={app_settings.sqlite_synchronous}, "
+        f"journal_mode={app_settings.sqlite_journal_mode}"
+    )
+    print(f"{'':<12} {'direct':>10} {'group':>10}")
+    for metric in results["direct"]:
+        print(
+            f"{metric:<12} {results['direct'][metric]:>10,.1f} "
+            f"{results['group'][metric]:>10,.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kiosks", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--donors", type=int, default=10_000)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""End-to-end HTTP load generator for app.main:app.
+
+    python -m benchmarks.load_test --profile read-heavy --concurrency 32
+    python -m benchmarks.load_test --profile donation-intake --uvicorn-workers 4
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --donors 10_000
+
+By default requests go in-process through httpx.ASGITransport, as the tests
+do, so the full middleware, exception handler and DB stack is exercised
+without sockets. --uvicorn-workers starts uvicorn on a free port instead;
+both modes serve a fresh copy of a generated data set of --donors donors.
+--url targets a server that is already running; its data must have donor
+ids 1..--donors.
+
+Each of --concurrency workers runs operations from the profile's weighted
+mix back to back for --duration seconds. The report gives throughput,
+p50/p95/p99 per operation, 409 and 5xx rates and, in-process, how many
+500s were SQLite "database is locked" errors.
+"""
+
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+# app modules read DATABASE_URL on import, so they are imported only after
+# the load test has pointed it at its own database (see _serve)
+
+Operation = Callable[[httpx.AsyncClient, random.Random, int], Awaitable[httpx.Response]]
+
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+API = "/api/v1"
+
+
+# ========== OPERATIONS ==========
+
+
+async def get_donor(client, rng, donors):
+    return await client.get(f"{API}/donors/{rng.randint(1, donors)}")
+
+
+async def list_donors(client, rng, donors):
+    return await client.get(
+        f"{API}/donors", params={"limit": 50, "skip": 0, "total_mode": "cached"}
+    )
+
+
+async def list_donations(client, rng, donors):
+    return await client.get(
+        f"{API}/donors/{rng.randint(1, donors)}/donations", params={"limit": 20}
+    )
+
+
+async def eligible_donors(client, rng, donors):
+    return await client.get(
+        f"{API}/donors/eligible",
+        params={"blood_group": rng.choice(BLOOD_GROUPS), "limit": 50},
+    )
+
+
+async def create_donation(client, rng, donors):
+    donor_id = rng.randint(1, donors)
+    return await client.post(
+        f"{API}/donors/{donor_id}/donations",
+        json={
+            "date": datetime.date.today().isoformat(),
+            "volume_ml": rng.choice((350, 450, 500)),
+            "location": "Load Test Drive",
+            "hemoglobin": 14.0,
+            "pulse": 72,
+            "blood_pressure": "120/80",
+            "donor_id": donor_id,
+        },
+    )
+
+
+async def update_donor(client, rng, donors):
+    """Read-modify-write with the version just read; racing writers get 409."""
+    donor_id = rng.randint(1, donors)
+    current = await client.get(f"{API}/donors/{donor_id}")
+    if current.status_code != 200:
+        return current
+    body = current.json()
+    return await client.put(
+        f"{API}/donors/{donor_id}",
+        json={
+            "name": body["name"],
+            "blood_group": body["blood_group"],
+            "age": body["age"],
+            "last_donated": body["last_donated"],
+            "version": body["version"],
+        },
+    )
+
+
+async def create_donor(client, rng, donors):
+    return await client.post(
+        f"{API}/donors",
+        json={
+            "name": f"Walk-in {rng.randrange(10**6)}",
+            "blood_group": rng.choice(BLOOD_GROUPS),
+            "age": rng.randint(18, 65),
+        },
+    )
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "get_donor": get_donor,
+    "list_donors": list_donors,
+    "list_donations": list_donations,
+    "eligible_donors": eligible_donors,
+    "create_donation": create_donation,
+    "update_donor": update_donor,
+    "create_donor": create_donor,
+}
+
+
+@dataclass
+class Profile:
+    """Weighted operation mix, optionally issued in bursts.
+
+    With ``burst=(period, duty)`` workers only send during the first
+    ``duty`` fraction of every ``period`` seconds and idle for the rest,
+    e.g. kiosks at a donation drive submitting in waves.
+    """
+
+    mix: Dict[str, int]
+    burst: Optional[Tuple[float, float]] = None
+
+
+PROFILES: Dict[str, Profile] = {
+    # 90/10 read/write
+    "read-heavy": Profile(
+        {
+            "get_donor": 40,
+            "list_donors": 20,
+            "list_donations": 20,
+            "eligible_donors": 10,
+            "update_donor": 5,
+            "create_donation": 5,
+        }
+    ),
+    "balanced": Profile(
+        {
+            "get_donor": 25,
+            "list_donations": 15,
+            "eligible_donors": 10,
+            "update_donor": 20,
+            "create_donation": 25,
+            "create_donor": 5,
+        }
+    ),
+    "donation-intake": Profile(
+        {"create_donation": 80, "get_donor": 10, "list_donations": 10},
+        burst=(2.0, 0.25),
+    ),
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """ "get_donor=9,create_donation=1" -> {"get_donor": 9, "create_donation": 1}"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+# ========== RUNNER ==========
+
+
+class LockedErrorCounter(logging.Handler):
+    """Count unhandled "database is locked" errors logged by the app."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        exc = record.exc_info[1] if record.exc_info else None
+        if "database is locked" in (str(exc) if exc else record.getMessage()):
+            self.count += 1
+
+
+@dataclass
+class OpStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: collections.Counter = field(default_factory=collections.Counter)
+    transport_errors: int = 0
+
+
+async def _worker(
+    client, profile: Profile, seed: int, donors: int, start, deadline, stats
+):
+    rng = random.Random(seed)
+    names = list(profile.mix)
+    weights = list(profile.mix.values())
+    while (now := time.perf_counter()) < deadline:
+        if profile.burst is not None:
+            period, duty = profile.burst
+            phase = (now - start) % period
+            if phase >= period * duty:
+                await asyncio.sleep(period - phase)
+                continue
+        name = rng.choices(names, weights)[0]
+        op_stats = stats[name]
+        began = time.perf_counter()
+        try:
+            response = await OPERATIONS[name](client, rng, donors)
+        except httpx.TransportError:
+            op_stats.transport_errors += 1
+            continue
+        op_stats.latencies.append((time.perf_counter() - began) * 1000)
+        op_stats.statuses[response.status_code] += 1
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    profile: Profile,
+    concurrency: int,
+    duration: float,
+    donors: int,
+    seed: int = 42,
+) -> Tuple[Dict[str, OpStats], float]:
+    stats: Dict[str, OpStats] = collections.defaultdict(OpStats)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _worker(client, profile, seed + i, donors, start, start + duration, stats)
+            for i in range(concurrency)
+        )
+    )
+    return stats, time.perf_counter() - start
+
+
+def build_report(stats: Dict[str, OpStats], elapsed: float, locked) -> dict:
+    from benchmarks.common import percentile
+
+    def summary(latencies, statuses, transport_errors):
+        count = sum(statuses.values())
+        server_errors = sum(n for code, n in statuses.items() if code >= 500)
+        return {
+            "requests": count,
+            "rps": count / elapsed,
+            "p50_ms": percentile(latencies, 50) if latencies else None,
+            "p95_ms": percentile(latencies, 95) if latencies else None,
+            "p99_ms": percentile(latencies, 99) if latencies else None,
+            "conflict_rate": statuses[409] / count if count else 0.0,
+            "server_error_rate": server_errors / count if count else 0.0,
+            "transport_errors": transport_errors,
+            "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        }
+
+    overall_statuses: collections.Counter = collections.Counter()
+    overall_latencies: List[float] = []
+    for op_stats in stats.values():
+        overall_statuses.update(op_stats.statuses)
+        overall_latencies.extend(op_stats.latencies)
+    return {
+        "elapsed_s": elapsed,
+        "overall": {
+            **summary(
+                overall_latencies,
+                overall_statuses,
+                sum(s.transport_errors for s in stats.values()),
+            ),
+            "database_locked": locked,
+        },
+        "operations": {
+            name: summary(s.latencies, s.statuses, s.transport_errors)
+            for name, s in sorted(stats.items())
+        },
+    }
+
+
+def print_report(report: dict, out=sys.stdout):
+    def ms(value):
+        return f"{value:>8.2f}" if value is not None else f"{'-':>8}"
+
+    print(
+        f"{'operation':<18} {'requests':>9} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'409':>6} {'5xx':>6}",
+        file=out,
+    )
+    rows = list(report["operations"].items()) + [("TOTAL", report["overall"])]
+    for name, s in rows:
+        print(
+            f"{name:<18} {s['requests']:>9,} {s['rps']:>8,.0f} {ms(s['p50_ms'])} "
+            f"{ms(s['p95_ms'])} {ms(s['p99_ms'])} {s['conflict_rate']:>6.1%} "
+            f"{s['server_error_rate']:>6.1%}",
+            file=out,
+        )
+    overall = report["overall"]
+    locked = overall["database_locked"]
+    print(
+        f"statuses {overall['statuses']}, transport errors "
+        f"{overall['transport_errors']}, database is locked: "
+        f"{'n/a' if locked is None else locked}",
+        file=out,
+    )
+
+
+# ========== TARGETS ==========
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_healthy(client: httpx.AsyncClient, server=None, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() > deadline:
+            raise RuntimeError("server did not become healthy in time")
+        await asyncio.sleep(0.2)
+
+
+async def _run_asgi(args, profile: Profile) -> dict:
+    from app.db.session import engine, read_engine
+    from app.main import app
+
+    # echo logs every statement and parameter set, which dwarfs the request
+    engine.echo = read_engine.echo = args.sql_echo
+    counter = LockedErrorCounter()
+    handler_logger = logging.getLogger("app.core.exception_handler")
+    handler_logger.addHandler(counter)
+    handler_logger.setLevel(logging.ERROR)
+    logging.getLogger("app").setLevel(args.app_log_level.upper())
+    try:
+        async with httpx.AsyncClient(
+            base_url="http://loadtest", transport=httpx.ASGITransport(app=app)
+        ) as client:
+            stats, elapsed = await run_load(
+                client, profile, args.concurrency, args.duration, args.donors, args.seed
+            )
+    finally:
+        handler_logger.removeHandler(counter)
+    return build_report(stats, elapsed, counter.count)
+
+
+async def _run_http(args, profile: Profile, base_url: str, server=None) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        await _wait_healthy(client, server)
+        stats, elapsed = await run_load(
+            client, profile, args.concurrency, args.duration, args.donors, args.seed
+        )
+    return build_report(stats, elapsed, None)
+
+
+async def _serve(args, profile: Profile) -> dict:
+    if args.url:
+        return await _run_http(args, profile, args.url)
+
+    workdir = tempfile.mkdtemp(prefix="blood-load-")
+    path = os.path.join(workdir, "load.db")
+    database_url = f"sqlite+aiosqlite:///{path}"
+    os.environ["DATABASE_URL"] = database_url
+    try:
+        from benchmarks.common import prepare_database
+
+        cached = await prepare_database(args.donors, (0, 10), args.seed)
+        shutil.copyfile(cached, path)
+        if not args.uvicorn_workers:
+            return await _run_asgi(args, profile)
+
+        port = _free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app.main:app",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--workers",
+                str(args.uvicorn_workers),
+                "--log-level",
+                "warning",
+                "--no-access-log",
+            ],
+            env={**os.environ, "LOG_LEVEL": args.app_log_level},
+        )
+        try:
+            return await _run_http(args, profile, f"http://127.0.0.1:{port}", server)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="read-heavy")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        help="custom weighted mix instead of a profile, e.g. get_donor=9,update_donor=1",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--donors", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="base URL of a running server")
+    target.add_argument(
+        "--uvicorn-workers",
+        type=int,
+        default=0,
+        help="serve with uvicorn and this many worker processes",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--app-log-level",
+        default="warning",
+        help="level for the app's own loggers when served in-process or by uvicorn",
+    )
+    parser.add_argument(
+        "--sql-echo", action="store_true", help="keep engine echo on in-process"
+    )
+    parser.add_argument("--out", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    profile = Profile(args.mix) if args.mix else PROFILES[args.profile]
+    report = asyncio.run(_serve(args, profile))
+    report["config"] = {
+        "profile": "custom" if args.mix else args.profile,
+        "mix": profile.mix,
+        "burst": profile.burst,
+        "concurrency": args.concurrency,
+        "target": args.url
+        or (f"uvicorn x{args.uvicorn_workers}" if args.uvicorn_workers else "asgi"),
+    }
+    print_report(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
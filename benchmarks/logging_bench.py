@@ -0,0 +1,119 @@
+"""Event-loop lag while request handlers log to a slow stderr.
+
+    python -m benchmarks.logging_bench --handlers 32 --duration 3 --write-delay-us 200
+
+Each simulated handler logs one INFO line and yields, over and over. stderr
+is replaced by a stream whose write() sleeps, standing in for a pipe to a
+busy log collector. A probe task asks to wake every millisecond and records
+how late it actually ran; that lateness is time the loop spent blocked.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import List
+
+from app.core import log_config
+from benchmarks.common import percentile
+
+VARIANTS = {
+    "sync": dict(mode="sync"),
+    "queue": dict(mode="queue"),
+    "queue+json": dict(mode="queue", fmt="json"),
+    "queue+sampling": dict(mode="queue", info_max_per_second=100),
+}
+
+
+class SlowStream:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.writes += 1
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+async def _handler(logger, index, deadline, counter):
+    while time.perf_counter() < deadline:
+        logger.info("handled request %d for donor %d", counter[0], index)
+        counter[0] += 1
+        await asyncio.sleep(0)
+
+
+async def _probe(deadline, lags):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+
+async def measure(handlers: int, duration: float):
+    logger = logging.getLogger("app.bench")
+    lags: List[float] = []
+    counter = [0]
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        _probe(deadline, lags),
+        *(_handler(logger, i, deadline, counter) for i in range(handlers)),
+    )
+    return lags, counter[0]
+
+
+def _reset_logging() -> int:
+    """Drop the root handlers and return how many records they discarded."""
+    log_config.stop_listener()
+    root = logging.getLogger()
+    dropped = 0
+    for handler in root.handlers[:]:
+        dropped += getattr(handler, "dropped", 0)
+        for log_filter in handler.filters:
+            dropped += getattr(log_filter, "dropped", 0)
+        root.removeHandler(handler)
+    return dropped
+
+
+def run(args):
+    stderr = sys.stderr
+    print(
+        f"{args.handlers} handlers for {args.duration:.0f}s, "
+        f"{args.write_delay_us:.0f}us per stderr write"
+    )
+    print(
+        f"{'mode':<16} {'logged/s':>10} {'written':>9} {'dropped':>9} "
+        f"{'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11}"
+    )
+    for name, options in VARIANTS.items():
+        stream = SlowStream(args.write_delay_us / 1_000_000)
+        _reset_logging()
+        sys.stderr = stream
+        try:
+            log_config.setup_logging("INFO", **options)
+            lags, logged = asyncio.run(measure(args.handlers, args.duration))
+            dropped = _reset_logging()
+        finally:
+            sys.stderr = stderr
+        print(
+            f"{name:<16} {logged / args.duration:>10,.0f} {stream.writes:>9,} {dropped:>9,} "
+            f"{percentile(lags, 50):>11.2f} {percentile(lags, 99):>11.2f} "
+            f"{max(lags):>11.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handlers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--write-delay-us", type=float, default=200.0)
+    args = parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
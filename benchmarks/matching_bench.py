@@ -0,0 +1,51 @@
+"""Latency of find_matching_donors for every recipient blood group.
+
+    python -m benchmarks.matching_bench --donors 1000000 --units 10
+
+The emergency-request target is p99 under 50 ms at 5M donors.
+"""
+
+import argparse
+import asyncio
+import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.service import find_matching_donors
+from app.service.matching_service import BLOOD_GROUPS
+from benchmarks.common import percentile, seed_donors, temp_database, time_async
+
+AS_OF = datetime.date(2025, 1, 1)
+
+
+async def run(donors: int, units: int, repeat: int):
+    async with temp_database("matching") as engine:
+        await seed_donors(engine, donors)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"{donors} donors, {units} units, {repeat} runs per group")
+        print(f"{'recipient':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for group in BLOOD_GROUPS:
+
+            async def match():
+                # Fresh session per request, as in the API
+                async with session_factory() as db:
+                    await find_matching_donors(db, group, units, as_of=AS_OF)
+
+            timings = await time_async(match, repeat)
+            print(
+                f"{group:>9} {percentile(timings, 50):>8.2f}"
+                f" {percentile(timings, 99):>8.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--donors", type=int, default=200_000)
+    parser.add_argument("--units", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.donors, args.units, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
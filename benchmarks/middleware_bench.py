@@ -0,0 +1,108 @@
+"""Requests/sec on /health with each correlation-id middleware.
+
+    python -m benchmarks.middleware_bench --concurrency 32 --duration 5
+
+Compares no middleware, the previous BaseHTTPMiddleware implementation
+(kept here as the baseline) and the current pure ASGI one. Requests go
+in-process through httpx.ASGITransport, so no sockets are involved. The
+health check's SELECT 1 runs against a throwaway SQLite file.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.api.v1.routes.health_route import router as health_router
+from app.core.async_context import request_id_var
+from app.core.request_coorelation import CorrelationIdMiddleware
+from app.db.session import get_db
+from benchmarks.common import percentile, temp_database
+
+
+class BaseHTTPCorrelationIdMiddleware(BaseHTTPMiddleware):
+    """The implementation CorrelationIdMiddleware replaced."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        request_id_var.set(request_id)
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+def build_app(middleware, session_factory) -> FastAPI:
+    app = FastAPI()
+    app.include_router(health_router)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def measure(app, concurrency: int, duration: float):
+    latencies = []
+
+    async def client_loop(client):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get("/health")
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async with AsyncClient(
+        base_url="http://bench", transport=ASGITransport(app=app)
+    ) as client:
+        await client.get("/health")  # warm-up
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return (
+        len(latencies) / elapsed,
+        percentile(latencies, 50),
+        percentile(latencies, 99),
+    )
+
+
+async def run(concurrency: int, duration: float):
+    variants = {
+        "none": None,
+        "BaseHTTPMiddleware": BaseHTTPCorrelationIdMiddleware,
+        "pure ASGI": CorrelationIdMiddleware,
+    }
+    async with temp_database("middleware") as engine:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"GET /health, {concurrency} concurrent clients, {duration:.0f}s each")
+        print(f"{'middleware':<20} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, middleware in variants.items():
+            rps, p50, p99 = await measure(
+                build_app(middleware, session_factory), concurrency, duration
+            )
+            print(f"{name:<20} {rps:>8,.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(logging.WARNING)
+    asyncio.run(run(args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare OFFSET and keyset pagination latency as pages get deeper.
+
+    python -m benchmarks.pagination_bench --page-size 10 --repeat 20
+
+Offset latency grows with the page number because SQLite walks every skipped
+row; the keyset (cursor) path should stay flat from page 1 to page 10,000.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.service import get_all_donors
+from benchmarks.common import percentile, seed_donors, temp_database, time_async
+
+PAGES = (1, 10, 100, 1_000, 10_000)
+
+
+async def run(page_size: int, repeat: int):
+    rows = max(PAGES) * page_size
+    async with temp_database("pagination") as engine:
+        await seed_donors(engine, rows)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            print(f"{rows} donors, page size {page_size}, {repeat} runs per point")
+            print(f"{'page':>8} {'offset p50 ms':>14} {'cursor p50 ms':>14}")
+            for page in PAGES:
+                skip = (page - 1) * page_size
+                offset = await time_async(
+                    lambda: get_all_donors(db, skip=skip, limit=page_size), repeat
+                )
+                # Seeded ids are contiguous, so the cursor for this page is `skip`
+                cursor = await time_async(
+                    lambda: get_all_donors(db, limit=page_size, after_id=skip), repeat
+                )
+                print(
+                    f"{page:>8} {percentile(offset, 50):>14.3f}"
+                    f" {percentile(cursor, 50):>14.3f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare the response encoding pipelines for one page of donors.
+
+    python -m benchmarks.serialization_bench --rows 100 --repeat 2000
+
+"legacy" is what list_donors used to do on the pinned FastAPI: a per-row
+model_validate, then response_model validation and serialisation of the
+whole page again, then stdlib json. "adapter" keeps the models but encodes
+them with a cached TypeAdapter. "orjson" is the current path: rows from a
+column projection written straight to JSON. Each pipeline is timed encoding
+only and including the page fetch.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.schemas import DonorOut
+from app.api.v1.schemas.common import PaginatedResponse
+from app.core.serialization import dump_json, type_adapter
+from app.service import get_all_donors, get_donor_page_rows, page_flight
+from benchmarks.common import percentile, seed_donors, temp_database, time_async
+
+Page = PaginatedResponse[DonorOut]
+
+
+def legacy(donors) -> bytes:
+    items = [DonorOut.model_validate(d, from_attributes=True) for d in donors]
+    page = Page(total=len(items), items=items, next_cursor=None)
+    # FastAPI 0.115 serialize_response: dump, re-validate, dump as JSON types
+    adapter = type_adapter(Page)
+    content = adapter.dump_python(
+        adapter.validate_python(page.model_dump()), mode="json"
+    )
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def adapter(donors) -> bytes:
+    items = [DonorOut.model_validate(d, from_attributes=True) for d in donors]
+    return dump_json(Page, Page(total=len(items), items=items, next_cursor=None))
+
+
+def fast(rows) -> bytes:
+    return orjson.dumps({"total": len(rows), "items": rows, "next_cursor": None})
+
+
+def _time_sync(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(name: str, timings, baseline):
+    p50 = percentile(timings, 50)
+    print(
+        f"{name:<22} {p50:>9.3f} {percentile(timings, 95):>9.3f}"
+        f" {percentile(baseline, 50) / p50:>8.1f}x"
+    )
+
+
+async def run(rows: int, repeat: int):
+    async with temp_database("serialization") as engine:
+        await seed_donors(engine, rows)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            donors = await get_all_donors(db, limit=rows)
+            projected = await get_donor_page_rows(db, limit=rows)
+            assert orjson.loads(legacy(donors)) == orjson.loads(fast(projected))
+
+            print(f"{rows}-row page, {repeat} runs per pipeline")
+            print(f"{'pipeline':<22} {'p50 ms':>9} {'p95 ms':>9} {'speedup':>9}")
+            base = _time_sync(lambda: legacy(donors), repeat)
+            _report("legacy", base, base)
+            _report("adapter", _time_sync(lambda: adapter(donors), repeat), base)
+            _report("orjson", _time_sync(lambda: fast(projected), repeat), base)
+
+            async def legacy_fetch():
+                legacy(await get_all_donors(db, limit=rows))
+
+            async def fast_fetch():
+                page_flight.forget_all()
+                fast(await get_donor_page_rows(db, limit=rows))
+
+            base = await time_async(legacy_fetch, repeat)
+            _report("legacy + fetch", base, base)
+            _report("orjson + fetch", await time_async(fast_fetch, repeat), base)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
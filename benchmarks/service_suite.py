@@ -0,0 +1,412 @@
+"""Latency and allocation suite for every coroutine in donor_service.
+
+    python -m benchmarks.service_suite --sizes 10_000,1_000_000,5_000_000 \
+        --out results.json
+    python -m benchmarks.service_suite --sizes 10_000 --compare results.json
+
+Each size is a donor count. Its data set comes from the bootstrap_db
+generator and is cached in --data-dir; every run works on a fresh copy.
+Each case runs --repeat times, each time in its own session as a request
+would, and reports p50/p95/p99 in milliseconds. A short tracemalloc pass
+then measures peak allocations per call. --compare exits 1 when a case's
+p50, p95 or allocations grew past --threshold against a saved result file.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.schemas import DonationCreate, DonationUpdate, DonorCreate, DonorUpdate
+from app.db.models import Donation, Donor
+from app.db.query_audit import missing_scenarios
+from app.service import donor_service as svc
+from benchmarks.common import DEFAULT_DATA_DIR, percentile, prepare_database
+
+# Regressions smaller than this are noise whatever the ratio
+MIN_DELTA_MS = 0.05
+MIN_DELTA_KIB = 4.0
+_TODAY = datetime.date(2025, 1, 1)
+
+
+@dataclass
+class BenchContext:
+    donors: int
+    donations: int
+    rng: random.Random
+
+    def donor_id(self) -> int:
+        return self.rng.randint(1, self.donors)
+
+    def donation_id(self) -> int:
+        return self.rng.randint(1, self.donations)
+
+
+@dataclass
+class Case:
+    """``setup`` runs untimed in the same session and returns args for ``run``."""
+
+    run: Callable[..., Awaitable]
+    setup: Optional[Callable[..., Awaitable[tuple]]] = None
+
+
+def _donor_in(**overrides) -> DonorCreate:
+    return DonorCreate(**{"name": "Bench", "blood_group": "O-", "age": 30, **overrides})
+
+
+def _donation_in(donor_id: int) -> DonationCreate:
+    return DonationCreate(
+        date=_TODAY,
+        volume_ml=450,
+        location="Bench",
+        donor_id=donor_id,
+        hemoglobin=None,
+        pulse=None,
+        blood_pressure=None,
+    )
+
+
+async def _new_donor(db, ctx):
+    return ((await svc.create_donor(db, _donor_in())).id,)
+
+
+async def _new_donation(db, ctx):
+    donation = await _create_donation(db, ctx.donor_id())
+    return (donation.id,)
+
+
+def _create_donation(db, donor_id: int):
+    return svc.create_donation(db, donor_id, _donation_in(donor_id))
+
+
+async def _donor_version(db, ctx):
+    donor_id = ctx.donor_id()
+    return donor_id, await svc.get_donor_version(db, donor_id)
+
+
+async def _donation_version(db, ctx):
+    donation = await svc.get_donation(db, ctx.donation_id())
+    return donation.id, donation.donor_id, donation.version
+
+
+async def _cold_donor_out(db, ctx):
+    donor_id = ctx.donor_id()
+    svc.donor_cache.delete(donor_id)
+    return (donor_id,)
+
+
+async def _warm_donor_out(db, ctx):
+    donor_id = ctx.donor_id()
+    await svc.get_donor_out(db, donor_id)
+    return (donor_id,)
+
+
+async def _cold_count(db, ctx):
+    svc.invalidate_donor_count_cache()
+    return ()
+
+
+async def _new_donors(db, count: int) -> tuple:
+    donors = [Donor(**_donor_in().model_dump()) for _ in range(count)]
+    db.add_all(donors)
+    await db.flush()
+    return tuple(donor.id for donor in donors)
+
+
+async def _new_donations(db, ctx, count: int) -> tuple:
+    donations = [
+        Donation(**_donation_in(ctx.donor_id()).model_dump()) for _ in range(count)
+    ]
+    db.add_all(donations)
+    await db.flush()
+    return tuple(donation.id for donation in donations)
+
+
+def service_cases() -> Dict[str, Case]:
+    return {
+        "create_donor": Case(lambda db, ctx: svc.create_donor(db, _donor_in())),
+        "get_all_donors[offset]": Case(
+            lambda db, ctx: svc.get_all_donors(db, skip=ctx.donors // 2, limit=50)
+        ),
+        "get_all_donors[cursor]": Case(
+            lambda db, ctx: svc.get_all_donors(db, limit=50, after_id=ctx.donor_id())
+        ),
+        "get_all_donors[read_only]": Case(
+            lambda db, ctx: svc.get_all_donors(
+                db, limit=50, after_id=ctx.donor_id(), read_only=True
+            )
+        ),
+        "get_donor_page_rows": Case(
+            lambda db, ctx: svc.get_donor_page_rows(
+                db, limit=50, after_id=ctx.donor_id()
+            )
+        ),
+        "get_donor_page_rows[fields]": Case(
+            lambda db, ctx: svc.get_donor_page_rows(
+                db, limit=50, after_id=ctx.donor_id(), fields=["name", "blood_group"]
+            )
+        ),
+        "get_donor_page_rows[include_donations]": Case(
+            lambda db, ctx: svc.get_donor_page_rows(
+                db, limit=50, after_id=ctx.donor_id(), include_donations=True
+            )
+        ),
+        "get_donor_page_versions": Case(
+            lambda db, ctx: svc.get_donor_page_versions(
+                db, limit=50, after_id=ctx.donor_id()
+            )
+        ),
+        "get_eligible_donors": Case(
+            lambda db, ctx: svc.get_eligible_donors(db, "AB-", limit=50, as_of=_TODAY)
+        ),
+        "get_donor": Case(lambda db, ctx: svc.get_donor(db, ctx.donor_id())),
+        "get_donor[read_only]": Case(
+            lambda db, ctx: svc.get_donor(db, ctx.donor_id(), read_only=True)
+        ),
+        "get_donors_by_ids": Case(
+            lambda db, ctx: svc.get_donors_by_ids(
+                db, [ctx.donor_id() for _ in range(50)], read_only=True
+            )
+        ),
+        "get_donor_version": Case(
+            lambda db, ctx: svc.get_donor_version(db, ctx.donor_id())
+        ),
+        "get_donor_out[miss]": Case(svc.get_donor_out, _cold_donor_out),
+        "get_donor_out[hit]": Case(svc.get_donor_out, _warm_donor_out),
+        "update_donor": Case(
+            lambda db, donor_id, version: svc.update_donor(
+                db, donor_id, DonorUpdate(**_donor_in().model_dump(), version=version)
+            ),
+            _donor_version,
+        ),
+        "delete_donor": Case(svc.delete_donor, _new_donor),
+        "batch_delete_donors": Case(
+            lambda db, *ids: svc.batch_delete_donors(db, list(ids)),
+            lambda db, ctx: _new_donors(db, 20),
+        ),
+        "get_total_donor_count": Case(lambda db, ctx: svc.get_total_donor_count(db)),
+        "get_cached_donor_count[miss]": Case(
+            lambda db: svc.get_cached_donor_count(db), _cold_count
+        ),
+        "get_donations_for_donor": Case(
+            lambda db, ctx: svc.get_donations_for_donor(db, ctx.donor_id())
+        ),
+        "get_donation_page": Case(
+            lambda db, ctx: svc.get_donation_page(db, ctx.donor_id(), limit=20)
+        ),
+        "donor_has_donations": Case(
+            lambda db, ctx: svc.donor_has_donations(db, ctx.donor_id())
+        ),
+        "create_donation": Case(lambda db, ctx: _create_donation(db, ctx.donor_id())),
+        "get_donation": Case(lambda db, ctx: svc.get_donation(db, ctx.donation_id())),
+        "update_donation": Case(
+            lambda db, donation_id, donor_id, version: svc.update_donation(
+                db,
+                donation_id,
+                DonationUpdate(**_donation_in(donor_id).model_dump(), version=version),
+            ),
+            _donation_version,
+        ),
+        "delete_donation": Case(svc.delete_donation, _new_donation),
+        "batch_delete_donations": Case(
+            lambda db, *ids: svc.batch_delete_donations(db, list(ids)),
+            lambda db, ctx: _new_donations(db, ctx, 20),
+        ),
+    }
+
+
+# ========== RUNNER ==========
+
+
+async def _call(session_factory, case: Case, ctx: BenchContext, timed: Callable):
+    async with session_factory() as db:
+        args: tuple = ()
+        if case.setup is not None:
+            args = tuple(await case.setup(db, ctx))
+            await db.commit()
+        else:
+            args = (ctx,)
+        return await timed(lambda: case.run(db, *args))
+
+
+async def run_case(
+    session_factory, case: Case, ctx: BenchContext, repeat: int, alloc_repeat: int
+) -> Dict[str, float]:
+    timings: List[float] = []
+
+    async def timed(fn):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    await _call(session_factory, case, ctx, lambda fn: fn())  # warm-up
+    for _ in range(repeat):
+        await _call(session_factory, case, ctx, timed)
+
+    allocations: List[float] = []
+
+    async def traced(fn):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await fn()
+        allocations.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_repeat):
+            await _call(session_factory, case, ctx, traced)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "n": len(timings),
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "alloc_kib": statistics.median(allocations) if allocations else 0.0,
+    }
+
+
+async def run_size(
+    donors: int, cases: Dict[str, Case], args
+) -> Dict[str, Dict[str, float]]:
+    cached = await prepare_database(
+        donors, args.donations_per_donor, args.seed, args.data_dir, today=_TODAY
+    )
+    workdir = tempfile.mkdtemp(prefix="blood-bench-")
+    path = os.path.join(workdir, "suite.db")
+    shutil.copyfile(cached, path)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            donations = (await db.execute(select(func.max(Donation.id)))).scalar()
+        ctx = BenchContext(donors, donations or 1, random.Random(args.seed))
+        results = {}
+        for name, case in cases.items():
+            results[name] = await run_case(
+                session_factory, case, ctx, args.repeat, args.alloc_repeat
+            )
+            stats = results[name]
+            print(
+                f"{donors:>10,} {name:<40} {stats['p50_ms']:>8.3f} "
+                f"{stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f} "
+                f"{stats['alloc_kib']:>9.1f}"
+            )
+        return results
+    finally:
+        await engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Describe every case whose p50, p95 or allocations regressed."""
+    regressions = []
+    for size, cases in current["results"].items():
+        for name, stats in cases.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if base is None:
+                continue
+            for metric, floor in (
+                ("p50_ms", MIN_DELTA_MS),
+                ("p95_ms", MIN_DELTA_MS),
+                ("alloc_kib", MIN_DELTA_KIB),
+            ):
+                old, new = base[metric], stats[metric]
+                if new > old * (1 + threshold) and new - old > floor:
+                    regressions.append(
+                        f"{size} {name} {metric}: {old:.3f} -> {new:.3f} "
+                        f"(+{(new / old - 1) if old else float('inf'):.0%})"
+                    )
+    return regressions
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",") if size]
+
+
+async def run(args) -> dict:
+    cases = service_cases()
+    if args.cases:
+        cases = {name: cases[name] for name in args.cases.split(",")}
+    missing = missing_scenarios(svc, service_cases())
+    for name in missing:
+        print(f"warning: {name} has no benchmark case", file=sys.stderr)
+
+    print(
+        f"{'donors':>10} {'case':<40} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'alloc KiB':>9}"
+    )
+    results = {}
+    for donors in args.sizes:
+        results[str(donors)] = await run_size(donors, cases, args)
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "donations_per_donor": list(args.donations_per_donor),
+            "seed": args.seed,
+            "missing_cases": missing,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.db.bootstrap_db import parse_range
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=_parse_sizes, default=[10_000, 1_000_000, 5_000_000]
+    )
+    parser.add_argument(
+        "--donations-per-donor", type=parse_range, default=(0, 10), metavar="LOW..HIGH"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--alloc-repeat", type=int, default=5)
+    parser.add_argument("--cases", help="comma-separated subset of case names")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    # Every service call logs at INFO; keep output readable
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    current = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), current, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regressions against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Concurrent read/write throughput with and without the SQLite profile.
+
+    python -m benchmarks.sqlite_profile_bench --readers 16 --writers 4
+
+"baseline" is the engine the app used to build: one shared pool, the
+rollback journal and a 30 s busy timeout. "tuned" is the current
+app.db.session setup: WAL plus the AppSettings pragmas, writes on one
+connection, reads on a mode=ro pool. Both run the same workload against
+copies of one generated data set. Readers alternate a donor lookup with a
+page of that donor's donations, and writers record donations. Readers and
+writers are spread over --processes processes, like uvicorn workers.
+"""
+
+import argparse
+import asyncio
+import collections
+import datetime
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, DefaultDict, Dict, List, Tuple
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.api.v1.schemas import DonationCreate
+from app.db.session import _create_engine, read_only_url
+from app.service import create_donation, get_donation_page, get_donor
+from benchmarks.common import percentile, prepare_database
+
+
+def baseline_engines(url: str) -> Tuple[AsyncEngine, AsyncEngine]:
+    engine = create_async_engine(
+        url, connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    return engine, engine
+
+
+def tuned_engines(url: str) -> Tuple[AsyncEngine, AsyncEngine]:
+    return (
+        _create_engine(url, pool_size=1, max_overflow=0),
+        _create_engine(read_only_url(url), read_only=True, pool_size=8, max_overflow=0),
+    )
+
+
+async def _reader(session_factory, rng, donors, deadline, stats):
+    while time.perf_counter() < deadline:
+        donor_id = rng.randint(1, donors)
+        start = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                await get_donor(db, donor_id, read_only=True)
+                await get_donation_page(db, donor_id, limit=20)
+        except OperationalError:
+            stats["read_locked"] += 1
+            continue
+        stats["read_ms"].append((time.perf_counter() - start) * 1000)
+
+
+async def _writer(session_factory, rng, donors, deadline, stats):
+    while time.perf_counter() < deadline:
+        donor_id = rng.randint(1, donors)
+        donation = DonationCreate(
+            date=datetime.date(2025, 1, 1),
+            volume_ml=450,
+            location="Bench",
+            donor_id=donor_id,
+        )
+        start = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                await create_donation(db, donor_id, donation)
+        except OperationalError:
+            stats["write_locked"] += 1
+            continue
+        stats["write_ms"].append((time.perf_counter() - start) * 1000)
+
+
+async def _load(name: str, path: str, donors: int, readers, writers, duration, seed):
+    url = f"sqlite+aiosqlite:///{path}"
+    writer, reader = (tuned_engines if name == "tuned" else baseline_engines)(url)
+    writer.echo = reader.echo = False
+    try:
+        write_sessions = async_sessionmaker(writer, expire_on_commit=False)
+        read_sessions = async_sessionmaker(reader, expire_on_commit=False)
+        stats: DefaultDict[str, Any] = collections.defaultdict(list)
+        stats.update(read_locked=0, write_locked=0)
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(
+            *(
+                _reader(read_sessions, random.Random(seed + i), donors, deadline, stats)
+                for i in range(readers)
+            ),
+            *(
+                _writer(
+                    write_sessions, random.Random(-seed - i), donors, deadline, stats
+                )
+                for i in range(1, writers + 1)
+            ),
+        )
+        stats["elapsed"] = [time.perf_counter() - start]
+        return dict(stats)
+    finally:
+        await writer.dispose()
+        if reader is not writer:
+            await reader.dispose()
+
+
+def _load_process(*args) -> Dict:
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    return asyncio.run(_load(*args))
+
+
+async def run_profile(name: str, cached: str, donors: int, args) -> Dict:
+    """Run the workload split over ``args.processes`` processes, as uvicorn
+    workers would share the database file."""
+    workdir = tempfile.mkdtemp(prefix="blood-bench-")
+    path = os.path.join(workdir, f"{name}.db")
+    shutil.copyfile(cached, path)
+    try:
+        # The writer switches the file to WAL on its first connection
+        writer, reader = (tuned_engines if name == "tuned" else baseline_engines)(
+            f"sqlite+aiosqlite:///{path}"
+        )
+        async with writer.connect():
+            pass
+        await writer.dispose()
+        await reader.dispose()
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            args.processes, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            parts = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        _load_process,
+                        name,
+                        path,
+                        donors,
+                        args.readers // args.processes,
+                        args.writers // args.processes,
+                        args.duration,
+                        1000 * n,
+                    )
+                    for n in range(args.processes)
+                )
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    stats: DefaultDict[str, Any] = collections.defaultdict(list)
+    stats.update(read_locked=0, write_locked=0)
+    for part in parts:
+        for key, value in part.items():
+            stats[key] += value
+    # Processes start at different times; each one times its own run
+    elapsed = max(stats["elapsed"])
+
+    def p95(samples: List[float]) -> float:
+        return percentile(samples, 95) if len(samples) > 1 else float("nan")
+
+    return {
+        "reads/sec": len(stats["read_ms"]) / elapsed,
+        "writes/sec": len(stats["write_ms"]) / elapsed,
+        "read p95 ms": p95(stats["read_ms"]),
+        "write p95 ms": p95(stats["write_ms"]),
+        "locked errors": stats["read_locked"] + stats["write_locked"],
+    }
+
+
+async def run(args):
+    cached = await prepare_database(args.donors, (0, 10), seed=42)
+    results = {
+        name: await run_profile(name, cached, args.donors, args)
+        for name in ("baseline", "tuned")
+    }
+    print(
+        f"{args.readers} readers + {args.writers} writers in {args.processes} "
+        f"processes for {args.duration:.0f}s on {args.donors:,} donors"
+    )
+    print(f"{'':<16} {'baseline':>10} {'tuned':>10}")
+    for metric in results["baseline"]:
+        print(
+            f"{metric:<16} {results['baseline'][metric]:>10,.1f} "
+            f"{results['tuned'][metric]:>10,.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--donors", type=int, default=100_000)
+    args = parser.parse_args()
+    if min(args.readers, args.writers) < args.processes:
+        # Readers and writers are split evenly over the processes
+        parser.error("--readers and --writers must be at least --processes")
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Many concurrent writers updating a small set of hot donors.
+
+    python -m benchmarks.update_contention_bench --writers 32 --hot 8
+
+Each writer reads a donor's version and sends an update with it, so
+writers that race on the same donor get a 409. At the end every donor's
+version must equal 1 + its successful updates, i.e. no update was lost.
+"""
+
+import argparse
+import asyncio
+import collections
+import logging
+import random
+import time
+from typing import Dict
+
+from fastapi import HTTPException
+from sqlalchemy import Result, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.schemas import DonorUpdate
+from app.db.models import Donor
+from app.service import get_donor_version, update_donor
+from benchmarks.common import seed_donors, temp_database
+
+
+async def _writer(session_factory, seed: int, hot: int, updates: int, stats):
+    rng = random.Random(seed)
+    for _ in range(updates):
+        donor_id = rng.randint(1, hot)
+        async with session_factory() as db:
+            try:
+                version = await get_donor_version(db, donor_id)
+                await db.rollback()  # release the read before writing
+                await update_donor(
+                    db,
+                    donor_id,
+                    DonorUpdate(
+                        name=f"Writer {seed}",
+                        blood_group="O-",
+                        age=30,
+                        version=version,
+                    ),
+                )
+                stats["ok"] += 1
+                stats[f"ok:{donor_id}"] += 1
+            except HTTPException as e:
+                stats[str(e.status_code)] += 1
+            except OperationalError:
+                stats["locked"] += 1
+
+
+async def run(writers: int, hot: int, updates: int):
+    async with temp_database("contention") as engine:
+        await seed_donors(engine, hot)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        stats: collections.Counter = collections.Counter()
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _writer(session_factory, seed, hot, updates, stats)
+                for seed in range(writers)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        async with session_factory() as db:
+            result: Result = await db.execute(select(Donor.id, Donor.version))
+            versions: Dict[int, int] = dict(result.tuples().all())
+        lost = [
+            donor_id
+            for donor_id, version in versions.items()
+            if version != 1 + stats[f"ok:{donor_id}"]
+        ]
+
+    attempts = writers * updates
+    print(f"{writers} writers x {updates} updates on {hot} hot donors")
+    print(f"attempts/sec   {attempts / elapsed:,.0f}")
+    print(f"commits/sec    {stats['ok'] / elapsed:,.0f}")
+    print(f"409 conflicts  {stats['409']} ({stats['409'] / attempts:.1%})")
+    print(f"locked errors  {stats['locked']}")
+    print(f"lost updates   {len(lost)} donors" + (f" {lost}" if lost else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--hot", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+    # Every 409 is logged with a traceback by the service; keep output readable
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    asyncio.run(run(args.writers, args.hot, args.updates))
+
+
+if __name__ == "__main__":
+    main()
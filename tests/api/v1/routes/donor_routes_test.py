@@ -1,5 +1,11 @@
+import csv
+import io
+import json
+
 import pytest
 
+from app.api.v1.schemas.common import encode_cursor
+
 
 # Sample donor and donation data for reuse
 def sample_donor(
@@ -119,3 +125,453 @@ async def test_create_donation_invalid_pulse(client):
     resp = await client.post(f"/api/v1/donors/{donor_id}/donations", json=donation_data)
     assert resp.status_code == 422
     assert "Pulse must be between 60 and 200" in str(resp.json())
+
+
+@pytest.mark.anyio
+async def test_list_donors_cursor_pagination(client):
+    ids = []
+    for name in ("Cursor A", "Cursor B", "Cursor C"):
+        resp = await client.post("/api/v1/donors", json=sample_donor(name=name))
+        ids.append(resp.json()["id"])
+
+    cursor = encode_cursor({"id": ids[0] - 1})
+    resp = await client.get(f"/api/v1/donors?limit=2&cursor={cursor}")
+    assert resp.status_code == 200
+    page = resp.json()
+    assert [d["id"] for d in page["items"]] == ids[:2]
+    assert page["next_cursor"] is not None
+
+    resp = await client.get(f"/api/v1/donors?limit=2&cursor={page['next_cursor']}")
+    page = resp.json()
+    assert [d["id"] for d in page["items"]] == ids[2:]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_list_donors_invalid_cursor(client):
+    resp = await client.get("/api/v1/donors?cursor=not-a-cursor")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.anyio
+async def test_list_donors_total_modes(client):
+    await client.post("/api/v1/donors", json=sample_donor())
+    exact = (await client.get("/api/v1/donors?total_mode=exact")).json()
+    cached = (await client.get("/api/v1/donors?total_mode=cached")).json()
+    skipped = (await client.get("/api/v1/donors?total_mode=none")).json()
+    assert exact["total"] >= 1
+    assert cached["total"] == exact["total"]
+    assert skipped["total"] is None
+    assert skipped["items"] == exact["items"]
+
+
+@pytest.mark.anyio
+async def test_bulk_import_donors_ndjson(client):
+    body = "\n".join(
+        [
+            json.dumps(sample_donor(name="Bulk A")),
+            json.dumps(sample_donor(name="Bulk B", blood_group="X-")),
+            "{not json",
+            json.dumps(sample_donor(name="Bulk C", last_donated=None)),
+        ]
+    )
+    resp = await client.post(
+        "/api/v1/donors:bulk",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["received"] == 4
+    assert report["inserted"] == 2
+    assert report["failed"] == 2
+    assert [e["line"] for e in report["errors"]] == [2, 3]
+    assert "Invalid blood group" in report["errors"][0]["errors"][0]
+
+
+@pytest.mark.anyio
+async def test_bulk_import_donors_bad_bytes_fail_only_their_rows(client):
+    from app.service.bulk_service import BULK_MAX_LINE_BYTES
+
+    good = json.dumps(sample_donor(name="Bulk ok")).encode()
+    body = b"\n".join(
+        [good, b'{"name": "Bad \xe9"}', good, b"x" * (BULK_MAX_LINE_BYTES + 1)]
+    )
+    resp = await client.post(
+        "/api/v1/donors:bulk",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["inserted"] == 2
+    assert [(e["line"], e["errors"]) for e in report["errors"]] == [
+        (2, ["invalid UTF-8"]),
+        (4, [f"line longer than {BULK_MAX_LINE_BYTES} bytes"]),
+    ]
+
+
+@pytest.mark.anyio
+async def test_bulk_import_donors_csv(client):
+    before = (await client.get("/api/v1/donors")).json()["total"]
+    body = "name,blood_group,age,last_donated\nCsv A,O-,40,\nCsv B,AB+,17,2024-01-01\n"
+    resp = await client.post(
+        "/api/v1/donors:bulk", content=body, headers={"content-type": "text/csv"}
+    )
+    report = resp.json()
+    assert report["inserted"] == 1
+    assert report["errors"][0]["line"] == 3
+
+    after = (await client.get("/api/v1/donors")).json()["total"]
+    assert after == before + 1
+
+
+@pytest.mark.anyio
+async def test_bulk_import_donors_unsupported_type(client):
+    resp = await client.post(
+        "/api/v1/donors:bulk", content="{}", headers={"content-type": "text/plain"}
+    )
+    assert resp.status_code == 415
+
+
+@pytest.mark.anyio
+async def test_export_donors_ndjson(client):
+    donor = (await client.post("/api/v1/donors", json=sample_donor())).json()
+    resp = await client.get("/api/v1/donors/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    exported = next(r for r in rows if r["id"] == donor["id"])
+    assert exported["name"] == "Test Donor"
+    assert exported["last_donated"] == "2024-05-01"
+
+
+@pytest.mark.anyio
+async def test_export_donations_csv(client):
+    donor_id = (await client.post("/api/v1/donors", json=sample_donor())).json()["id"]
+    await client.post(
+        f"/api/v1/donors/{donor_id}/donations", json=sample_donation(donor_id)
+    )
+    resp = await client.get("/api/v1/donations/export?format=csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert any(
+        r["donor_id"] == str(donor_id) and r["blood_pressure"] == "120/80" for r in rows
+    )
+
+
+@pytest.mark.anyio
+async def test_list_eligible_donors_keyset_order(client):
+    async def create(name, last_donated):
+        data = sample_donor(name=name, blood_group="AB-", last_donated=last_donated)
+        return (await client.post("/api/v1/donors", json=data)).json()["id"]
+
+    never_a = await create("Never A", None)
+    rested = await create("Rested", "2024-01-01")
+    never_b = await create("Never B", None)
+    recent = await create("Recent", "2024-06-20")
+
+    seen = []
+    url = "/api/v1/donors/eligible?blood_group=AB-&limit=1&as_of=2024-07-01"
+    cursor = None
+    while True:
+        resp = await client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert resp.status_code == 200
+        page = resp.json()
+        seen.extend(d["id"] for d in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    mine = [i for i in seen if i in (never_a, rested, never_b, recent)]
+    assert mine == [never_a, never_b, rested]
+
+
+@pytest.mark.anyio
+async def test_list_eligible_donors_invalid_blood_group(client):
+    resp = await client.get("/api/v1/donors/eligible?blood_group=Z")
+    assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_match_donors_for_recipient(client):
+    async def create(name, blood_group, last_donated):
+        data = sample_donor(
+            name=name, blood_group=blood_group, last_donated=last_donated
+        )
+        return (await client.post("/api/v1/donors", json=data)).json()["id"]
+
+    b_neg = await create("B neg", "B-", "2023-01-01")
+    o_neg = await create("O neg", "O-", "2022-01-01")
+    await create("B pos", "B+", None)  # incompatible with B-
+    await create("B neg recent", "B-", "2024-06-30")  # not yet eligible
+
+    resp = await client.post(
+        "/api/v1/matches",
+        json={"blood_group": "B-", "units": 100, "as_of": "2024-07-01"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {d["blood_group"] for d in body["donors"]} <= {"O-", "B-"}
+    mine = [d["id"] for d in body["donors"] if d["id"] in (b_neg, o_neg)]
+    assert mine == [o_neg, b_neg]
+    assert all(d["name"] != "B neg recent" for d in body["donors"])
+
+
+@pytest.mark.anyio
+async def test_match_donors_does_not_use_the_writer(client):
+    from app.db.session import get_db
+    from app.main import app
+
+    async def writer_session():
+        raise AssertionError("POST /matches queued for the writer connection")
+        yield
+
+    app.dependency_overrides[get_db] = writer_session
+    resp = await client.post("/api/v1/matches", json={"blood_group": "O-", "units": 1})
+    assert resp.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_match_donors_invalid_request(client):
+    resp = await client.post("/api/v1/matches", json={"blood_group": "C", "units": 0})
+    assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_get_donor_after_update_is_not_stale(client):
+    donor = (await client.post("/api/v1/donors", json=sample_donor())).json()
+    await client.get(f"/api/v1/donors/{donor['id']}")  # warm the cache
+    update = {**sample_donor(name="Renamed"), "updated_at": donor["updated_at"]}
+    resp = await client.put(f"/api/v1/donors/{donor['id']}", json=update)
+    assert resp.status_code == 200
+    fetched = (await client.get(f"/api/v1/donors/{donor['id']}")).json()
+    assert fetched["name"] == "Renamed"
+
+
+@pytest.mark.anyio
+async def test_get_donor_conditional_get(client):
+    donor = (await client.post("/api/v1/donors", json=sample_donor())).json()
+    url = f"/api/v1/donors/{donor['id']}"
+    first = await client.get(url)
+    etag = first.headers["etag"]
+
+    resp = await client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    resp = await client.get(url, headers={"If-None-Match": '"stale"'})
+    assert resp.status_code == 200
+    assert resp.json()["id"] == donor["id"]
+
+
+@pytest.mark.anyio
+async def test_get_donor_conditional_get_not_found(client):
+    resp = await client.get("/api/v1/donors/99999", headers={"If-None-Match": "*"})
+    assert resp.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_list_donors_conditional_get(client):
+    await client.post("/api/v1/donors", json=sample_donor())
+    first = await client.get("/api/v1/donors")
+    etag = first.headers["etag"]
+    resp = await client.get("/api/v1/donors", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+    # A new donor changes the total, so the page is no longer current
+    await client.post("/api/v1/donors", json=sample_donor())
+    resp = await client.get("/api/v1/donors", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+@pytest.mark.anyio
+async def test_update_donor_version_conflict(client):
+    donor = (await client.post("/api/v1/donors", json=sample_donor())).json()
+    assert donor["version"] == 1
+    url = f"/api/v1/donors/{donor['id']}"
+
+    resp = await client.put(url, json={**sample_donor(name="First"), "version": 1})
+    assert resp.status_code == 200
+    assert resp.json()["version"] == 2
+    assert resp.json()["name"] == "First"
+
+    # A second writer still holding version 1 loses, even within the same second
+    resp = await client.put(url, json={**sample_donor(name="Second"), "version": 1})
+    assert resp.status_code == 409
+
+    resp = await client.put(
+        "/api/v1/donors/99999", json={**sample_donor(), "version": 1}
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_update_donation_version(client):
+    donor_id = (await client.post("/api/v1/donors", json=sample_donor())).json()["id"]
+    donation = (
+        await client.post(
+            f"/api/v1/donors/{donor_id}/donations", json=sample_donation(donor_id)
+        )
+    ).json()
+    update = {**sample_donation(donor_id, location="Moved"), "version": 1}
+    resp = await client.put(f"/api/v1/donations/{donation['id']}", json=update)
+    assert resp.status_code == 200
+    assert resp.json()["location"] == "Moved"
+    assert resp.json()["version"] == 2
+
+
+@pytest.mark.anyio
+async def test_delete_donor_guarded(client):
+    donor_id = (await client.post("/api/v1/donors", json=sample_donor())).json()["id"]
+    await client.post(
+        f"/api/v1/donors/{donor_id}/donations", json=sample_donation(donor_id)
+    )
+    resp = await client.delete(f"/api/v1/donors/{donor_id}")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Cannot delete donor with existing donations"
+
+    resp = await client.delete("/api/v1/donors/99999")
+    assert resp.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_batch_delete_donors(client):
+    free = (await client.post("/api/v1/donors", json=sample_donor())).json()["id"]
+    busy = (await client.post("/api/v1/donors", json=sample_donor())).json()["id"]
+    donation = (
+        await client.post(
+            f"/api/v1/donors/{busy}/donations", json=sample_donation(busy)
+        )
+    ).json()
+
+    resp = await client.post(
+        "/api/v1/donors:batchDelete", json={"ids": [free, busy, 99999, free]}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["deleted"] == 1
+    assert body["results"] == [
+        {"id": free, "status": "deleted"},
+        {"id": busy, "status": "has_donations"},
+        {"id": 99999, "status": "not_found"},
+    ]
+    assert (await client.get(f"/api/v1/donors/{free}")).status_code == 404
+
+    resp = await client.post(
+        "/api/v1/donations:batchDelete", json={"ids": [donation["id"], 99999]}
+    )
+    assert resp.json() == {
+        "deleted": 1,
+        "results": [
+            {"id": donation["id"], "status": "deleted"},
+            {"id": 99999, "status": "not_found"},
+        ],
+    }
+    resp = await client.post("/api/v1/donors:batchDelete", json={"ids": [busy]})
+    assert resp.json()["results"] == [{"id": busy, "status": "deleted"}]
+
+    resp = await client.post("/api/v1/donors:batchDelete", json={"ids": []})
+    assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_list_donors_by_ids(client):
+    first = (await client.post("/api/v1/donors", json=sample_donor("One"))).json()
+    second = (await client.post("/api/v1/donors", json=sample_donor("Two"))).json()
+
+    ids = f"{second['id']},99999,{first['id']}"
+    resp = await client.get(f"/api/v1/donors?ids={ids}")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [d["name"] for d in body["items"]] == ["Two", "One"]
+    assert body["total"] == 2 and body["next_cursor"] is None
+
+    resp = await client.get(
+        f"/api/v1/donors?ids={ids}", headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert resp.status_code == 304
+
+    assert (await client.get("/api/v1/donors?ids=1,x")).status_code == 400
+    assert (await client.get("/api/v1/donors?ids=")).status_code == 400
+
+
+@pytest.mark.anyio
+async def test_list_donor_donations_keyset_newest_first(client):
+    donor_id = (await client.post("/api/v1/donors", json=sample_donor())).json()["id"]
+    url = f"/api/v1/donors/{donor_id}/donations"
+    for date in ("2024-01-10", "2024-03-10", "2024-03-10", "2024-06-10"):
+        await client.post(url, json=sample_donation(donor_id, date=date))
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = (await client.get(url, params=params)).json()
+        seen.extend((d["date"], d["id"]) for d in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 4
+    assert seen == sorted(seen, reverse=True)
+
+    resp = await client.get(
+        url, params={"date_from": "2024-02-01", "date_to": "2024-05-01"}
+    )
+    assert [d["date"] for d in resp.json()["items"]] == ["2024-03-10"] * 2
+
+    assert (await client.get(url, params={"cursor": "bad"})).status_code == 400
+    assert (await client.get("/api/v1/donors/99999/donations")).status_code == 404
+
+
+@pytest.mark.anyio
+async def test_list_donors_rows_match_donor_out(client):
+    donor = (await client.post("/api/v1/donors", json=sample_donor())).json()
+    single = (await client.get(f"/api/v1/donors/{donor['id']}")).json()
+    cursor = encode_cursor({"id": donor["id"] - 1})
+    page = (await client.get("/api/v1/donors", params={"cursor": cursor})).json()
+    assert page["items"][0] == single == donor
+
+
+@pytest.mark.anyio
+async def test_list_donors_sparse_fields_and_include_donations(client):
+    donor = (await client.post("/api/v1/donors", json=sample_donor())).json()
+    url = f"/api/v1/donors/{donor['id']}/donations"
+    for date in ("2024-01-10", "2024-06-10"):
+        await client.post(url, json=sample_donation(donor["id"], date=date))
+    cursor = encode_cursor({"id": donor["id"] - 1})
+
+    resp = await client.get(
+        "/api/v1/donors", params={"cursor": cursor, "fields": "name,blood_group"}
+    )
+    assert resp.json()["items"] == [{"name": "Test Donor", "blood_group": "A+"}]
+
+    resp = await client.get(
+        "/api/v1/donors",
+        params={"cursor": cursor, "fields": "id", "include": "donations"},
+    )
+    (item,) = resp.json()["items"]
+    assert item["id"] == donor["id"] and set(item) == {"id", "donations"}
+    assert [d["date"] for d in item["donations"]] == ["2024-06-10", "2024-01-10"]
+
+    # Adding a donation changes the embedded page, so the old ETag goes stale
+    params = {"cursor": cursor, "include": "donations"}
+    etag = (await client.get("/api/v1/donors", params=params)).headers["etag"]
+    cached = await client.get(
+        "/api/v1/donors", params=params, headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    await client.post(url, json=sample_donation(donor["id"], date="2024-09-10"))
+    fresh = await client.get(
+        "/api/v1/donors", params=params, headers={"If-None-Match": etag}
+    )
+    assert fresh.status_code == 200
+    assert len(fresh.json()["items"][0]["donations"]) == 3
+
+    resp = await client.get("/api/v1/donors", params={"fields": "id,password"})
+    assert resp.status_code == 400
+    resp = await client.get("/api/v1/donors", params={"include": "everything"})
+    assert resp.status_code == 422
@@ -55,14 +55,15 @@ async def db_session(engine):
 @pytest.fixture(scope="function")
 async def client(db_session, monkeypatch):
     """
-    Override get_db to use the transactional session for each test.
+    Override get_db and get_read_db to use the transactional session for each test.
     """
-    from app.db.session import get_db
+    from app.db.session import get_db, get_read_db
 
     async def override_get_db():
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     # with TestClient(app) as c:
     #     yield c
     from httpx import ASGITransport
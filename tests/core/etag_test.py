@@ -0,0 +1,19 @@
+import datetime
+
+from app.core.etag import etag_matches, make_etag
+
+
+def test_make_etag_is_strong_and_stable():
+    updated_at = datetime.datetime(2024, 7, 7, 18, 0, 0)
+    etag = make_etag(1, updated_at)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(1, updated_at)
+    assert etag != make_etag(1, updated_at + datetime.timedelta(seconds=1))
+
+
+def test_etag_matches_lists_weak_tags_and_wildcard():
+    etag = make_etag("x")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
@@ -0,0 +1,76 @@
+import io
+import logging
+import logging.handlers
+import queue
+import sys
+
+import orjson
+
+from app.core.async_context import request_id_var
+from app.core.log_config import (
+    InfoSampler,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+)
+
+
+def _record(level=logging.INFO, name="app.test", msg="hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampler_never_drops_warnings():
+    sampler = InfoSampler(sample_rate=0.0)
+    assert sampler.filter(_record(logging.WARNING))
+    assert not sampler.filter(_record(logging.INFO))
+    assert sampler.dropped == 1
+
+
+def test_sampler_caps_info_per_logger():
+    sampler = InfoSampler(max_per_second=5)
+    kept = sum(sampler.filter(_record()) for _ in range(50))
+    assert kept == 5
+    assert sampler.filter(_record(name="app.other"))
+    assert sampler.dropped == 45
+
+
+def test_json_formatter_emits_one_object_per_record():
+    record = _record()
+    record.request_id = "abc"
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+    entry = orjson.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO" and entry["request_id"] == "abc"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_queue_handler_formats_on_listener_thread():
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(logging.Formatter("%(request_id)s %(message)s"))
+    handler = NonBlockingQueueHandler(queue.Queue(10))
+    handler.addFilter(RequestIdFilter())
+    listener = logging.handlers.QueueListener(handler.queue, target)
+    logger = logging.getLogger("app.queue_test")
+    logger.addHandler(handler)
+    logger.propagate = False
+    token = request_id_var.set("req-1")
+    try:
+        listener.start()
+        logger.warning("donor %d", 7)
+    finally:
+        request_id_var.reset(token)
+        listener.stop()
+        logger.removeHandler(handler)
+        logger.propagate = True
+    assert stream.getvalue() == "req-1 donor 7\n"
+
+
+def test_queue_handler_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    handler.handle(_record())
+    handler.handle(_record())
+    assert handler.queue.qsize() == 1 and handler.dropped == 1
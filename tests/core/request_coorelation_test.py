@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.async_context import request_id_var
+from app.core.request_coorelation import CorrelationIdMiddleware
+
+
+async def echo(request: Request):
+    return JSONResponse(
+        {"state": request.state.request_id, "context": request_id_var.get()}
+    )
+
+
+async def stream(request: Request):
+    async def chunks():
+        for i in range(3):
+            yield f"{i}\n".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def _client():
+    app = Starlette(routes=[Route("/echo", echo), Route("/stream", stream)])
+    app.add_middleware(CorrelationIdMiddleware)
+    return AsyncClient(base_url="http://test", transport=ASGITransport(app=app))
+
+
+@pytest.mark.anyio
+async def test_generates_an_id_when_none_is_sent():
+    async with _client() as client:
+        response = await client.get("/echo")
+    request_id = response.headers["X-Request-ID"]
+    assert uuid.UUID(request_id)
+    assert response.json() == {"state": request_id, "context": request_id}
+
+
+@pytest.mark.anyio
+async def test_reuses_incoming_id():
+    async with _client() as client:
+        response = await client.get("/echo", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["X-Request-ID"] == "abc-123"
+    assert response.json() == {"state": "abc-123", "context": "abc-123"}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("sent", ["x" * 129, "bad id\r\n", ""])
+async def test_replaces_malformed_incoming_id(sent):
+    async with _client() as client:
+        response = await client.get("/echo", headers={"X-Request-ID": sent})
+    assert response.headers["X-Request-ID"] != sent
+    assert uuid.UUID(response.headers["X-Request-ID"])
+
+
+@pytest.mark.anyio
+async def test_streaming_responses_pass_through_with_header():
+    async with _client() as client:
+        response = await client.get("/stream", headers={"X-Request-ID": "s-1"})
+    assert response.text == "0\n1\n2\n"
+    assert response.headers["X-Request-ID"] == "s-1"
+    assert response.headers.get_list("X-Request-ID") == ["s-1"]
@@ -0,0 +1,25 @@
+import datetime
+
+import orjson
+
+from app.api.v1.schemas import DonorOut
+from app.core.serialization import ORJSONResponse, dump_json, type_adapter
+
+
+def test_type_adapters_are_cached():
+    assert type_adapter(DonorOut) is type_adapter(DonorOut)
+
+
+def test_orjson_response_matches_pydantic_json():
+    donor = DonorOut(
+        id=1,
+        name="A",
+        blood_group="O-",
+        age=30,
+        last_donated=datetime.date(2024, 5, 1),
+        version=2,
+        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0, 123456),
+    )
+    body = ORJSONResponse(donor.model_dump()).body
+    assert body == dump_json(DonorOut, donor)
+    assert orjson.loads(body)["updated_at"] == "2024-07-07T18:00:00.123456"
@@ -0,0 +1,184 @@
+import datetime
+import random
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.v1.schemas import DonationOut
+from app.db.bootstrap_db import (
+    DONATION_COLUMNS,
+    DonorGenerator,
+    generate_data,
+    init_db,
+    parse_range,
+)
+from app.db.models import Donation, Donor
+
+
+def test_parse_range():
+    assert parse_range("0..40") == (0, 40)
+    assert parse_range("5") == (5, 5)
+    with pytest.raises(ValueError):
+        parse_range("9..3")
+
+
+def test_generator_is_deterministic():
+    today = datetime.date(2025, 1, 1)
+    first = DonorGenerator(7, (0, 10), today).chunk(1, 50)
+    second = DonorGenerator(7, (0, 10), today).chunk(1, 50)
+    assert first == second
+    assert first != DonorGenerator(8, (0, 10), today).chunk(1, 50)
+
+
+class EdgeRandom(random.Random):
+    """Always records vitals and draws every gauss ``sigmas`` from the mean."""
+
+    def __init__(self, sigmas: float):
+        super().__init__(0)
+        self.sigmas = sigmas
+
+    def random(self):
+        return 0.5
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        return mu + self.sigmas * sigma
+
+
+def _donation_out(row: tuple) -> DonationOut:
+    return DonationOut(
+        **dict(zip(DONATION_COLUMNS, row)),
+        id=1,
+        version=1,
+        updated_at=datetime.datetime(2025, 1, 1),
+    )
+
+
+def test_generated_donations_fit_the_schema():
+    _, donations = DonorGenerator(3, (0, 40), datetime.date(2025, 1, 1)).chunk(1, 500)
+    assert len(donations) > 1000
+    for row in donations:
+        _donation_out(row)
+
+
+@pytest.mark.parametrize("sigmas", [-10, -3, 3, 10])
+def test_generated_vitals_fit_the_schema_at_the_edges(sigmas):
+    generator = DonorGenerator(3, (0, 40), datetime.date(2025, 1, 1))
+    generator.rng = EdgeRandom(sigmas)
+    # At -10 sigmas systolic is clamped low and the diastolic noise is negative
+    donation = _donation_out(generator._donation(1, "2024-01-01"))
+    assert donation.pulse is not None and donation.blood_pressure is not None
+
+
+@pytest.mark.asyncio
+async def test_generate_data_loads_consistent_rows(tmp_path):
+    path = tmp_path / "generated.db"
+    stats = await generate_data(
+        f"sqlite+aiosqlite:///{path}",
+        donors=500,
+        donations_per_donor=(0, 6),
+        seed=1,
+        chunk_size=128,
+        today=datetime.date(2025, 1, 1),
+    )
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT count(*) FROM donors").fetchone()[0] == 500
+        donations = conn.execute("SELECT count(*) FROM donations").fetchone()[0]
+        assert donations == stats.donations > 0
+        # last_donated is the newest donation, NULL when there is none
+        (mismatched,) = conn.execute(
+            "SELECT count(*) FROM donors d WHERE last_donated IS NOT "
+            "(SELECT max(date) FROM donations WHERE donor_id = d.id)"
+        ).fetchone()
+        assert mismatched == 0
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert "ix_donations_donor_id_date_id" in indexes
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+# Schema as created before version columns and the composite indexes existed
+OLD_SCHEMA = """
+CREATE TABLE donors (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR(300) NOT NULL,
+    blood_group VARCHAR(3) NOT NULL,
+    age INTEGER NOT NULL,
+    last_donated DATE,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+CREATE INDEX ix_donors_id ON donors (id);
+CREATE TABLE donations (
+    id INTEGER NOT NULL PRIMARY KEY,
+    donor_id INTEGER NOT NULL REFERENCES donors (id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    volume_ml INTEGER NOT NULL,
+    location VARCHAR(100) NOT NULL,
+    hemoglobin INTEGER,
+    pulse INTEGER,
+    blood_pressure VARCHAR(10),
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+CREATE INDEX ix_donations_id ON donations (id);
+CREATE INDEX ix_donations_donor_id ON donations (donor_id);
+INSERT INTO donors (name, blood_group, age) VALUES ('Alice', 'A+', 29);
+INSERT INTO donations (donor_id, date, volume_ml, location)
+    VALUES (1, '2024-01-01', 450, 'Center A');
+"""
+
+
+@pytest.mark.asyncio
+async def test_init_db_upgrades_an_old_schema_in_place(tmp_path):
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(OLD_SCHEMA)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        await init_db(engine)
+        await init_db(engine)  # idempotent
+        async with AsyncSession(engine) as db:
+            donor = (await db.execute(select(Donor))).scalar_one()
+            donation = (await db.execute(select(Donation))).scalar_one()
+    finally:
+        await engine.dispose()
+
+    assert donor.name == "Alice" and donor.version == 1
+    assert donation.location == "Center A" and donation.version == 1
+    with sqlite3.connect(path) as conn:
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    assert {
+        "ix_donors_blood_group_last_donated",
+        "ix_donations_donor_id_date_id",
+    } <= indexes
+    assert "ix_donations_donor_id" not in indexes
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("DELETE FROM donors WHERE id = 1")
+        new_id = conn.execute(
+            "INSERT INTO donors (name, blood_group, age) VALUES ('Bob', 'O-', 35)"
+        ).lastrowid
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'donors'")
+        assert "AUTOINCREMENT" in sql.fetchone()[0]
+    # Rebuilt donors hands out fresh ids, so a stale ETag cannot match Bob
+    assert new_id == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_donor_ids_are_not_reused(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'new.db'}")
+    try:
+        await init_db(engine)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            donor = Donor(name="Alice", blood_group="A+", age=29)
+            db.add(donor)
+            await db.commit()
+            await db.delete(donor)
+            await db.commit()
+            replacement = Donor(name="Bob", blood_group="O-", age=35)
+            db.add(replacement)
+            await db.commit()
+    finally:
+        await engine.dispose()
+
+    assert replacement.id != donor.id
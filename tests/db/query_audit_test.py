@@ -0,0 +1,23 @@
+import pytest
+
+from app.db.query_audit import audit_donor_service, full_scans, print_report
+
+
+def test_full_scans_flags_large_tables_only():
+    plan = [
+        "SCAN donors",
+        "SCAN donations USING COVERING INDEX ix_donations_donor_id_date_id",
+        "SEARCH donors USING INTEGER PRIMARY KEY (rowid=?)",
+        "SCAN sqlite_master",
+    ]
+    assert full_scans(plan) == plan[:2]
+
+
+@pytest.mark.asyncio
+async def test_donor_service_queries_do_not_scan_large_tables(tmp_path, capsys):
+    report = await audit_donor_service(str(tmp_path / "audit.db"))
+    print_report(report)
+    output = capsys.readouterr().out
+    assert not report.missing, output
+    assert not report.violations, output
+    assert report.statements
@@ -0,0 +1,95 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.routes import admin_route
+from app.db.query_stats import QueryStats, normalize_statement
+
+
+def test_normalize_statement_folds_literals_and_lists():
+    assert (
+        normalize_statement("SELECT *\n  FROM donors WHERE id IN (?, ?, ?) LIMIT 10")
+        == "SELECT * FROM donors WHERE id IN (?) LIMIT ?"
+    )
+    assert (
+        normalize_statement("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)")
+        == "INSERT INTO t (a, b) VALUES (?, ?)"
+    )
+    assert (
+        normalize_statement("SELECT name FROM donors WHERE blood_group = 'O-'")
+        == "SELECT name FROM donors WHERE blood_group = ?"
+    )
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_stats_group_statements_and_count_rows(engine):
+    stats = QueryStats(slow_ms=0)
+    stats.attach(engine.sync_engine)
+    async with engine.begin() as conn:
+        for i in range(3):
+            await conn.exec_driver_sql("INSERT INTO t (v) VALUES (?)", (f"v{i}",))
+        await conn.exec_driver_sql("SELECT * FROM t WHERE id > 0")
+        await conn.exec_driver_sql("SELECT * FROM t WHERE id > 1")
+        with pytest.raises(OperationalError):
+            await conn.exec_driver_sql("SELECT * FROM missing")
+        assert not conn.sync_connection.info["query_start"]
+
+    by_statement = {s["statement"]: s for s in stats.slowest(limit=10)}
+    insert = by_statement["INSERT INTO t (v) VALUES (?)"]
+    assert insert["calls"] == 3 and insert["rows"] == 3
+    select = by_statement["SELECT * FROM t WHERE id > ?"]
+    assert select["calls"] == 2 and select["rows"] == 5
+    assert sum(select["histogram"].values()) == 2
+    assert select["slow_calls"] == 0 and select["plan"] is None
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_logged_with_plan(engine, caplog):
+    stats = QueryStats(slow_ms=1e-6)
+    stats.attach(engine.sync_engine)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT v FROM t WHERE v = ?", ("x",))
+    stats.detach(engine.sync_engine)
+
+    [entry] = stats.slowest()
+    assert entry["slow_calls"] == 1
+    assert entry["plan"] == ["SCAN t"]
+    assert "Slow query" in caplog.text and "plan: SCAN t" in caplog.text
+
+
+@pytest.mark.anyio
+async def test_admin_endpoint_lists_slowest_statements(monkeypatch):
+    stats = QueryStats(slow_ms=50)
+    for statement, elapsed_ms in [("SELECT 1", 1.0), ("SELECT 2", 9.0)]:
+        stats._statement_stats(statement).record(elapsed_ms, 1)
+    monkeypatch.setattr(admin_route, "query_stats", stats)
+    app = FastAPI()
+    app.include_router(admin_route.router)
+
+    async with AsyncClient(
+        base_url="http://test", transport=ASGITransport(app=app)
+    ) as client:
+        response = await client.get("/admin/queries", params={"limit": 1})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["slow_query_ms"] == 50
+        assert [s["statement"] for s in body["statements"]] == ["SELECT 2"]
+        assert body["statements"][0]["p95_ms"] == 9.0
+
+        assert (await client.delete("/admin/queries")).status_code == 204
+        assert (await client.get("/admin/queries")).json()["statements"] == []
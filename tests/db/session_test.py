@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import (
+    _create_engine,
+    asyncSessionLocal,
+    get_db,
+    get_read_db,
+    read_only_url,
+    readSessionLocal,
+    sqlite_pragmas,
+)
+
+
+def test_read_only_url():
+    url = read_only_url("sqlite+aiosqlite:///./local_db/blood_donation.db")
+    assert url.database == "file:./local_db/blood_donation.db"
+    assert url.query["mode"] == "ro"
+    assert read_only_url("sqlite+aiosqlite:///:memory:") is None
+    assert read_only_url("postgresql+asyncpg://db/app") is None
+
+
+def test_sqlite_pragmas_skip_journal_mode_on_readers():
+    assert "PRAGMA journal_mode=wal;" in sqlite_pragmas()
+    assert not any("journal_mode" in p for p in sqlite_pragmas(read_only=True))
+
+
+@pytest.mark.asyncio
+async def test_split_engines_apply_profile_and_reject_writes(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'split.db'}"
+    writer = _create_engine(url, pool_size=1, max_overflow=0)
+    reader = _create_engine(read_only_url(url), read_only=True, pool_size=2)
+    try:
+        async with writer.begin() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            await conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+            await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM t"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        await writer.dispose()
+        await reader.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "method, factory", [("GET", readSessionLocal), ("POST", asyncSessionLocal)]
+)
+async def test_get_db_picks_session_by_method(method, factory):
+    sessions = get_db(SimpleNamespace(method=method))
+    session = await sessions.__anext__()
+    try:
+        assert session.bind is factory.kw["bind"]
+    finally:
+        await sessions.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_reads_whatever_the_method():
+    sessions = get_read_db()
+    session = await sessions.__anext__()
+    try:
+        assert session.bind is readSessionLocal.kw["bind"]
+    finally:
+        await sessions.aclose()
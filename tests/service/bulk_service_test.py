@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from app.service.bulk_service import (
+    BULK_MAX_LINE_BYTES,
+    bulk_create_donors,
+    iter_lines,
+)
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_handles_lines_split_across_chunks():
+    chunks = [b'{"a": 1}\n{"b"', b": 2}\r\n", b'{"c": 3}']
+    lines = [line async for line in iter_lines(_aiter(chunks))]
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_drops_over_long_lines():
+    chunks = [b"short\n0123", b"456789", b"abc\nok\n", b"0123456789"]
+    lines = [line async for line in iter_lines(_aiter(chunks), max_line_bytes=8)]
+    # Neither long line is buffered past the limit, with or without a newline
+    assert lines == [b"short", None, b"ok", None]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_donors_inserts_in_chunks(mocker):
+    db = mocker.AsyncMock()
+    rows = [
+        json.dumps({"name": f"D{i}", "blood_group": "A+", "age": 30}).encode()
+        for i in range(5)
+    ]
+    result = await bulk_create_donors(db, _aiter(rows), chunk_size=2)
+    assert result.inserted == 5
+    assert result.failed == 0
+    # 2 + 2 + 1 rows, each chunk a single executemany
+    assert db.execute.call_count == 3
+    assert len(db.execute.call_args_list[0].args[1]) == 2
+    db.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_donors_caps_error_report(mocker):
+    mocker.patch("app.service.bulk_service.BULK_MAX_REPORTED_ERRORS", 2)
+    db = mocker.AsyncMock()
+    rows = [b"not json"] * 5
+    result = await bulk_create_donors(db, _aiter(rows))
+    assert result.failed == 5
+    assert len(result.errors) == 2
+    assert result.errors_truncated
+    db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_donors_rolls_back_on_db_error(mocker):
+    db = mocker.AsyncMock()
+    db.execute.side_effect = Exception("disk full")
+    rows = [json.dumps({"name": "D", "blood_group": "A+", "age": 30}).encode()]
+    with pytest.raises(Exception):
+        await bulk_create_donors(db, _aiter(rows))
+    db.rollback.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_donors_reports_bad_lines_per_row(mocker):
+    db = mocker.AsyncMock()
+    valid = json.dumps({"name": "D", "blood_group": "A+", "age": 30}).encode()
+    rows = [valid, b'{"name": "\xff"}', None, valid]
+    result = await bulk_create_donors(db, _aiter(rows))
+    assert result.received == 4
+    assert result.inserted == 2
+    assert [(e.line, e.errors) for e in result.errors] == [
+        (2, ["invalid UTF-8"]),
+        (3, [f"line longer than {BULK_MAX_LINE_BYTES} bytes"]),
+    ]
+    db.commit.assert_called_once()
@@ -0,0 +1,45 @@
+import pytest
+
+from app.service.cache import LRUCache, NullCache, create_cache
+
+
+def test_lru_cache_hit_miss_and_eviction_counters():
+    cache = LRUCache(max_entries=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"  # 1 is now most recently used
+    cache.set(3, "c")  # evicts 2
+    assert cache.get(2) is None
+    assert cache.get(3) == "c"
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1, "size": 2}
+
+
+def test_lru_cache_entries_expire(mocker):
+    clock = mocker.patch("app.service.cache.time.monotonic", return_value=100.0)
+    cache = LRUCache(max_entries=10, ttl=5)
+    cache.set("k", "v")
+    clock.return_value = 104.9
+    assert cache.get("k") == "v"
+    clock.return_value = 105.0
+    assert cache.get("k") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_cache_delete_and_clear():
+    cache = LRUCache()
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.delete(1)
+    assert cache.get(1) is None
+    cache.clear()
+    assert cache.get(2) is None
+
+
+def test_create_cache_backends():
+    assert isinstance(create_cache("memory", 10, 1), LRUCache)
+    null = create_cache("none", 10, 1)
+    null.set(1, "a")
+    assert null.get(1) is None
+    assert isinstance(null, NullCache)
+    with pytest.raises(ValueError):
+        create_cache("redis", 10, 1)
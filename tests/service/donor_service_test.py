@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+import re
 
 import pytest
 from fastapi import HTTPException
@@ -12,18 +14,49 @@ from app.api.v1.schemas.donor_schema import (
 )
 from app.db.models.donor_models import Donation, Donor
 from app.service.donor_service import (
+    _invalidate_donor,
     create_donation,
     create_donor,
     delete_donation,
     delete_donor,
+    donor_cache,
+    donor_field_names,
+    donor_has_donations,
     get_all_donors,
+    get_cached_donor_count,
     get_donation,
+    get_donation_page,
     get_donor,
+    get_donor_out,
+    get_donor_version,
+    get_donors_by_ids,
     get_total_donor_count,
+    invalidate_donor_count_cache,
     update_donation,
     update_donor,
 )
 
+
+def _scalar_result(mocker, value):
+    result = mocker.MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+def _scalars_result(mocker, values):
+    result = mocker.MagicMock()
+    result.scalars.return_value.all.return_value = values
+    return result
+
+
+def _rows_result(mocker, rows):
+    # Core rows for read_only queries; ORM objects stand in for attribute access
+    result = mocker.MagicMock()
+    result.all.return_value = rows
+    result.__iter__.side_effect = lambda: iter(rows)
+    return result
+
+
 # ========== DONOR TESTS ==========
 
 
@@ -79,6 +112,18 @@ async def test_get_all_donors(mocker):
     db.execute.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_get_all_donors_after_id_uses_keyset(mocker):
+    db = mocker.AsyncMock()
+    result = mocker.MagicMock()
+    result.scalars.return_value.all.return_value = []
+    db.execute.return_value = result
+    await get_all_donors(db, skip=50, limit=10, after_id=42)
+    sql = str(db.execute.call_args.args[0])
+    assert "donors.id >" in sql
+    assert "OFFSET" not in sql
+
+
 @pytest.mark.asyncio
 async def test_get_all_donors_exception(mocker):
     db = mocker.AsyncMock()
@@ -87,13 +132,23 @@ async def test_get_all_donors_exception(mocker):
         await get_all_donors(db)
 
 
+def test_donor_field_names_keeps_model_order_and_keys():
+    assert donor_field_names(["blood_group", "name"]) == (
+        "name",
+        "blood_group",
+        "id",
+        "version",
+    )
+    with pytest.raises(ValueError):
+        donor_field_names(["name", "ssn"])
+
+
 @pytest.mark.asyncio
 async def test_get_donor_found(mocker: MockerFixture):
     db = mocker.AsyncMock()
+    db.info = {}
     donor = Donor(id=1, name="A", blood_group="A+", age=25)
-    result = mocker.MagicMock()
-    result.scalar_one_or_none.return_value = donor
-    db.execute.return_value = result
+    db.execute.return_value = _scalars_result(mocker, [donor])
     fetched = await get_donor(db, 1)
     assert fetched == donor
     db.execute.assert_called()
@@ -102,9 +157,8 @@ async def test_get_donor_found(mocker: MockerFixture):
 @pytest.mark.asyncio
 async def test_get_donor_not_found_raises(mocker):
     db = mocker.AsyncMock()
-    result = mocker.MagicMock()
-    result.scalar_one_or_none.return_value = None
-    db.execute.return_value = result
+    db.info = {}
+    db.execute.return_value = _scalars_result(mocker, [])
     with pytest.raises(HTTPException) as exc:
         await get_donor(db, 999)
     assert exc.value.status_code == 404
@@ -113,87 +167,255 @@ async def test_get_donor_not_found_raises(mocker):
 @pytest.mark.asyncio
 async def test_get_donor_not_found_silent(mocker):
     db = mocker.AsyncMock()
-    result = mocker.MagicMock()
-    result.scalar_one_or_none.return_value = None
-    db.execute.return_value = result
+    db.info = {}
+    db.execute.return_value = _scalars_result(mocker, [])
     fetched = await get_donor(db, 999, raise_error_when_not_found=False)
     assert fetched is None
 
 
+@pytest.mark.asyncio
+async def test_get_donor_read_only_selects_core_rows(mocker):
+    db = mocker.AsyncMock()
+    db.info = {}
+    row = mocker.MagicMock(id=1)
+    db.execute.return_value = _rows_result(mocker, [row])
+    assert await get_donor(db, 1, read_only=True) is row
+    # A table select, not an entity select: nothing enters the identity map
+    statement = db.execute.call_args.args[0]
+    assert all("entity" not in c for c in statement.column_descriptions)
+
+
+@pytest.mark.asyncio
+async def test_get_all_donors_read_only_returns_rows(mocker):
+    db = mocker.AsyncMock()
+    rows = [mocker.MagicMock(id=1), mocker.MagicMock(id=2)]
+    db.execute.return_value = _rows_result(mocker, rows)
+    assert await get_all_donors(db, limit=2, read_only=True) == rows
+    db.execute.return_value.scalars.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_donor_exception(mocker):
     db = mocker.AsyncMock()
+    db.info = {}
     db.execute.side_effect = Exception("Failed query")
     with pytest.raises(Exception):
         await get_donor(db, 1)
 
 
 @pytest.mark.asyncio
-async def test_update_donor_success(mocker):
+async def test_get_donor_calls_in_one_tick_share_a_query(mocker):
     db = mocker.AsyncMock()
-    old_updated_at = datetime.datetime(2024, 7, 7, 18, 0, 0)
-    donor_obj = Donor(
+    db.info = {}
+    donors = [Donor(id=i, name="A", blood_group="A+", age=25) for i in (1, 2)]
+    db.execute.return_value = _scalars_result(mocker, donors)
+
+    fetched = await asyncio.gather(get_donor(db, 2), get_donor(db, 1), get_donor(db, 2))
+    assert [donor.id for donor in fetched] == [2, 1, 2]
+    assert db.execute.call_count == 1
+    sql = str(db.execute.call_args.args[0])
+    assert "donors.id IN" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_donors_by_ids_keeps_order_and_skips_missing(mocker):
+    db = mocker.AsyncMock()
+    db.info = {}
+    donors = [Donor(id=i, name="A", blood_group="A+", age=25) for i in (3, 1)]
+    db.execute.return_value = _scalars_result(mocker, donors)
+
+    fetched = await get_donors_by_ids(db, [1, 99, 3, 1])
+    assert [donor.id for donor in fetched] == [1, 3, 1]
+    assert db.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_donor_out_reads_through_cache(mocker):
+    donor_cache.clear()
+    db = mocker.AsyncMock()
+    donor = Donor(
         id=1,
-        name="Alice",
+        name="A",
         blood_group="A+",
         age=25,
+        version=1,
+        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0),
+    )
+    db.info = {}
+    db.execute.return_value = _rows_result(mocker, [donor])
+
+    first = await get_donor_out(db, 1)
+    second = await get_donor_out(db, 1)
+    assert first.name == "A"
+    assert second is first
+    assert db.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_donor_out_coalesces_concurrent_misses(mocker):
+    donor_cache.clear()
+    db = mocker.AsyncMock()
+    db.info = {}
+    donor = Donor(
+        id=2,
+        name="A",
+        blood_group="A+",
+        age=25,
+        version=1,
+        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0),
+    )
+
+    async def slow_execute(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return _rows_result(mocker, [donor])
+
+    db.execute.side_effect = slow_execute
+    results = await asyncio.gather(*(get_donor_out(db, 2) for _ in range(10)))
+    assert {r.name for r in results} == {"A"}
+    assert db.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_does_not_fill_cache(mocker):
+    donor_cache.clear()
+    db = mocker.AsyncMock()
+    db.info = {}
+    donor = Donor(
+        id=3,
+        name="Old",
+        blood_group="A+",
+        age=25,
+        version=1,
+        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0),
+    )
+    loading, release = asyncio.Event(), asyncio.Event()
+
+    async def held_execute(*args, **kwargs):
+        loading.set()
+        await release.wait()
+        return _rows_result(mocker, [donor])
+
+    db.execute.side_effect = held_execute
+    pending = asyncio.ensure_future(get_donor_out(db, 3))
+    await loading.wait()
+    _invalidate_donor(3)  # a write commits while the SELECT is in flight
+    release.set()
+
+    assert (await pending).name == "Old"
+    assert donor_cache.get(3) is None
+
+
+@pytest.mark.asyncio
+async def test_update_donor_invalidates_cache(mocker):
+    donor_obj = Donor(id=1, name="B", blood_group="A+", age=25, version=4)
+    donor_cache.set(1, "stale")
+    db = mocker.AsyncMock()
+    db.execute.return_value = _scalar_result(mocker, donor_obj)
+    donor_data = DonorUpdate(
+        name="B", blood_group="A+", age=25, last_donated=None, version=3
+    )
+    await update_donor(db, 1, donor_data)
+    assert donor_cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_get_donor_version_selects_only_the_version(mocker):
+    db = mocker.AsyncMock()
+    db.execute.return_value = _scalar_result(mocker, 3)
+    assert await get_donor_version(db, 1) == 3
+    query = db.execute.call_args.args[0]
+    assert [c.name for c in query.selected_columns] == ["version"]
+
+    db.execute.return_value = _scalar_result(mocker, None)
+    with pytest.raises(HTTPException) as exc:
+        await get_donor_version(db, 2)
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_donor_success(mocker):
+    db = mocker.AsyncMock()
+    donor_obj = Donor(
+        id=1,
+        name="Bob",
+        blood_group="O+",
+        age=40,
         last_donated=None,
-        updated_at=old_updated_at,
+        version=2,
     )
     donor_data = DonorUpdate(
         name="Bob",
         blood_group="O+",
         age=40,
         last_donated=None,
-        updated_at=old_updated_at,
+        version=1,
     )
-    mocker.patch("app.service.donor_service.get_donor", return_value=donor_obj)
-    db.commit = mocker.AsyncMock()
-    db.refresh = mocker.AsyncMock()
+    db.execute.return_value = _scalar_result(mocker, donor_obj)
     donor = await update_donor(db, 1, donor_data)
-    assert donor.name == "Bob"  # type: ignore
-    assert donor.blood_group == "O+"  # type: ignore
-    assert donor.age == 40  # type: ignore
+    assert donor is donor_obj
+    # One UPDATE ... WHERE version = ? RETURNING, no SELECT before or after
+    assert db.execute.call_count == 1
+    sql = str(db.execute.call_args.args[0])
+    assert sql.startswith("UPDATE donors")
+    assert re.search(r"donors.version = :version_\d", sql)
+    assert "RETURNING" in sql
     db.commit.assert_called()
-    db.refresh.assert_called_with(donor_obj)
+    db.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_donor_accepts_legacy_updated_at_token(mocker):
+    db = mocker.AsyncMock()
+    stamp = datetime.datetime(2024, 7, 7, 18, 0, 0)
+    current = mocker.MagicMock()
+    current.one_or_none.return_value = mocker.MagicMock(version=5, updated_at=stamp)
+    db.execute.side_effect = [current, _scalar_result(mocker, Donor(id=1, version=6))]
+    donor_data = DonorUpdate(name="Bob", blood_group="O+", age=40, updated_at=stamp)
+    await update_donor(db, 1, donor_data)
+    update_stmt = db.execute.call_args.args[0]
+    assert 5 in update_stmt.whereclause.compile().params.values()
 
 
 @pytest.mark.asyncio
 async def test_update_donor_optimistic_lock_fail(mocker):
     db = mocker.AsyncMock()
-    db_updated_at = datetime.datetime(2024, 7, 7, 18, 0, 0)
-    donor_obj = Donor(
-        id=1,
-        name="Alice",
-        blood_group="A+",
-        age=25,
-        last_donated=None,
-        updated_at=db_updated_at,
-    )
-    # Client provides a different (stale) updated_at
-    stale_updated_at = datetime.datetime(2024, 7, 7, 17, 0, 0)
+    # No row matched the stale version, but the donor exists
+    db.execute.side_effect = [
+        _scalar_result(mocker, None),
+        _scalar_result(mocker, 1),
+    ]
     donor_data = DonorUpdate(
         name="Bob",
         blood_group="O+",
         age=40,
         last_donated=None,
-        updated_at=stale_updated_at,  # different from DB!
+        version=1,
     )
-    mocker.patch("app.service.donor_service.get_donor", return_value=donor_obj)
-    db.commit = mocker.AsyncMock()
-    db.refresh = mocker.AsyncMock()
-    from fastapi import HTTPException
-
     with pytest.raises(HTTPException) as exc:
         await update_donor(db, 1, donor_data)
     assert exc.value.status_code == 409
     assert "updated by another process" in exc.value.detail
+    db.rollback.assert_called()
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_donor_not_found(mocker):
+    db = mocker.AsyncMock()
+    db.execute.side_effect = [
+        _scalar_result(mocker, None),
+        _scalar_result(mocker, None),
+    ]
+    donor_data = DonorUpdate(name="Bob", blood_group="O+", age=40, version=1)
+    with pytest.raises(HTTPException) as exc:
+        await update_donor(db, 99, donor_data)
+    assert exc.value.status_code == 404
 
 
 @pytest.mark.asyncio
 async def test_update_donor_exception(mocker):
     db = mocker.AsyncMock()
-    mocker.patch("app.service.donor_service.get_donor", side_effect=Exception("fail"))
+    db.execute.side_effect = Exception("fail")
     donor_data = DonorUpdate(
         name="Bob",
         blood_group="O+",
@@ -205,77 +427,72 @@ async def test_update_donor_exception(mocker):
         await update_donor(db, 1, donor_data)
 
 
+def test_update_requires_a_lock_token():
+    with pytest.raises(ValueError):
+        DonorUpdate(name="Bob", blood_group="O+", age=40)
+
+
 @pytest.mark.asyncio
 async def test_delete_donor_no_donations(mocker: MockerFixture):
     db = mocker.AsyncMock()
-    donor = Donor(id=1, name="A", blood_group="A+", age=25)
-    donor.donations = []
-    result = mocker.MagicMock()
-    result.scalar_one_or_none.return_value = donor
-    db.execute.return_value = result
-    db.delete = mocker.AsyncMock()
-    db.commit = mocker.AsyncMock()
-
-    mocker.patch(
-        "app.service.donor_service.get_donations_for_donor", return_value=False
-    )
+    db.execute.return_value = _scalar_result(mocker, 1)
 
     resp = await delete_donor(db, 1)
     assert resp == {"detail": "Donor deleted successfully"}
-    db.delete.assert_called_with(donor)
+    # One guarded DELETE ... RETURNING, no load of the donor or its donations
+    assert db.execute.call_count == 1
+    sql = str(db.execute.call_args.args[0])
+    assert sql.startswith("DELETE FROM donors")
+    assert "NOT (EXISTS" in sql and "RETURNING donors.id" in sql
     db.commit.assert_called()
 
 
 @pytest.mark.asyncio
 async def test_delete_donor_with_donations(mocker: MockerFixture):
     db = mocker.AsyncMock()
-    donor = Donor(id=1, name="A", blood_group="A+", age=25)
-    donor.donations = []
-    result = mocker.MagicMock()
-    result.scalar_one_or_none.return_value = donor
-    db.execute.return_value = result
-    db.delete = mocker.AsyncMock()
-    db.commit = mocker.AsyncMock()
-
-    mocker.patch("app.service.donor_service.get_donations_for_donor", return_value=True)
+    # Guard stops the DELETE, the follow-up probe finds the donor
+    db.execute.side_effect = [_scalar_result(mocker, None), _scalar_result(mocker, 1)]
 
     with pytest.raises(HTTPException) as exc:
         await delete_donor(db, 1)
     assert exc.value.status_code == 400
     assert "Cannot delete donor with existing donations" in exc.value.detail
+    db.rollback.assert_called()
+    db.commit.assert_not_called()
+
 
+@pytest.mark.asyncio
+async def test_delete_donor_not_found(mocker: MockerFixture):
+    db = mocker.AsyncMock()
+    db.execute.side_effect = [
+        _scalar_result(mocker, None),
+        _scalar_result(mocker, None),
+    ]
 
-# @pytest.mark.asyncio
-# async def test_delete_donor_with_donations1(mocker):
-#     db = mocker.AsyncMock()
-#     donor = Donor(id=1, name="A", blood_group="A+", age=25)
-#     donor.donations = [
-#         Donation(
-#             id=1,
-#             donor_id=1,
-#             date=datetime.date.today(),
-#             volume_ml=500,
-#             location="Test",
-#             updated_at=datetime.datetime.utcnow(),
-#         )
-#     ]
-#     result = mocker.MagicMock()
-#     result.scalar_one_or_none.return_value = donor
-#     db.execute.return_value = result
-#     with pytest.raises(HTTPException) as exc:
-#         await delete_donor(db, 1)
-#     assert exc.value.status_code == 400
-#     assert "Cannot delete donor with existing donations" in exc.value.detail
+    with pytest.raises(HTTPException) as exc:
+        await delete_donor(db, 1)
+    assert exc.value.status_code == 404
+    db.commit.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_delete_donor_exception(mocker):
     db = mocker.AsyncMock()
-    mocker.patch("app.service.donor_service.get_donor", side_effect=Exception("fail"))
+    db.execute.side_effect = Exception("fail")
     with pytest.raises(Exception):
         await delete_donor(db, 1)
 
 
+@pytest.mark.asyncio
+async def test_donor_has_donations(mocker):
+    db = mocker.AsyncMock()
+    result = mocker.MagicMock()
+    result.scalar.return_value = True
+    db.execute.return_value = result
+    assert await donor_has_donations(db, 1) is True
+    assert "EXISTS" in str(db.execute.call_args.args[0])
+
+
 @pytest.mark.asyncio
 async def test_get_total_donor_count(mocker):
     db = mocker.AsyncMock()
@@ -286,6 +503,24 @@ async def test_get_total_donor_count(mocker):
     assert total == 123
 
 
+@pytest.mark.asyncio
+async def test_get_cached_donor_count_reuses_value_until_invalidated(mocker):
+    invalidate_donor_count_cache()
+    db = mocker.AsyncMock()
+    result = mocker.MagicMock()
+    result.scalar_one.return_value = 7
+    db.execute.return_value = result
+
+    assert await get_cached_donor_count(db) == 7
+    assert await get_cached_donor_count(db) == 7
+    assert db.execute.call_count == 1
+
+    invalidate_donor_count_cache()
+    result.scalar_one.return_value = 8
+    assert await get_cached_donor_count(db) == 8
+    assert db.execute.call_count == 2
+
+
 # ========== DONATION TESTS ==========
 
 
@@ -378,23 +613,20 @@ async def test_get_donation_not_found_silent(mocker):
 @pytest.mark.asyncio
 async def test_update_donation_success(mocker):
     db = mocker.AsyncMock()
-    # Simulate the DB donation object with a different updated_at than provided
+    # The row as returned by UPDATE ... RETURNING
     db_donation = Donation(
         id=1,
         donor_id=1,
         date=datetime.date.today(),
-        volume_ml=400,
-        location="Bombay",
+        volume_ml=500,
+        location="Delhi",
         hemoglobin=14.5,
         pulse=72,
         blood_pressure="110/80",
-        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0),
+        version=3,
     )
+    db.execute.return_value = _scalar_result(mocker, db_donation)
 
-    # Patch get_donation to return the above object
-    mocker.patch("app.service.donor_service.get_donation", return_value=db_donation)
-
-    # The client provides a different updated_at (simulating a stale update)
     donation_obj = DonationUpdate(
         date=datetime.date.today(),
         volume_ml=500,
@@ -403,37 +635,26 @@ async def test_update_donation_success(mocker):
         hemoglobin=14.5,
         pulse=72,
         blood_pressure="110/80",
-        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0),
+        version=2,
     )
 
-    db.commit = mocker.AsyncMock()
-    db.refresh = mocker.AsyncMock()
     updated = await update_donation(db, 1, donation_obj)
     assert updated.location == "Delhi"  # type: ignore
+    assert db.execute.call_count == 1
+    assert str(db.execute.call_args.args[0]).startswith("UPDATE donations")
     db.commit.assert_called()
-    db.refresh.assert_called_with(db_donation)
+    db.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_update_donation_optimistic_lock(mocker):
     db = mocker.AsyncMock()
-    # Simulate the DB donation object with a different updated_at than provided
-    db_donation = Donation(
-        id=1,
-        donor_id=1,
-        date=datetime.date.today(),
-        volume_ml=400,
-        location="Bombay",
-        hemoglobin=14.5,
-        pulse=72,
-        blood_pressure="110/80",
-        updated_at=datetime.datetime(2024, 7, 7, 18, 0, 0),  # Old timestamp
-    )
-
-    # Patch get_donation to return the above object
-    mocker.patch("app.service.donor_service.get_donation", return_value=db_donation)
+    # The stale version matches no row, but the donation exists
+    db.execute.side_effect = [
+        _scalar_result(mocker, None),
+        _scalar_result(mocker, 1),
+    ]
 
-    # The client provides a different updated_at (simulating a stale update)
     donation_in = DonationUpdate(
         date=datetime.date.today(),
         volume_ml=400,
@@ -442,7 +663,7 @@ async def test_update_donation_optimistic_lock(mocker):
         hemoglobin=14.5,
         pulse=72,
         blood_pressure="110/80",
-        updated_at=datetime.datetime(2024, 7, 7, 19, 0, 0),  # Newer timestamp
+        version=1,
     )
 
     with pytest.raises(HTTPException) as exc:
@@ -454,9 +675,7 @@ async def test_update_donation_optimistic_lock(mocker):
 @pytest.mark.asyncio
 async def test_update_donation_exception(mocker):
     db = mocker.AsyncMock()
-    mocker.patch(
-        "app.service.donor_service.get_donation", side_effect=Exception("fail")
-    )
+    db.execute.side_effect = Exception("fail")
     donation_in = DonationUpdate(
         date=datetime.date.today(),
         volume_ml=400,
@@ -472,30 +691,46 @@ async def test_update_donation_exception(mocker):
 
 
 @pytest.mark.asyncio
-async def test_delete_donation_success(mocker):
+async def test_get_donation_page_seeks_on_keyset(mocker):
     db = mocker.AsyncMock()
-    donation = Donation(
-        id=2,
-        donor_id=2,
-        date=datetime.date.today(),
-        volume_ml=450,
-        location="Test",
-        updated_at=datetime.datetime.utcnow(),
+    db.execute.return_value = _scalars_result(mocker, [])
+    await get_donation_page(
+        db,
+        1,
+        limit=5,
+        after_date=datetime.date(2024, 3, 10),
+        after_id=7,
+        date_from=datetime.date(2024, 1, 1),
     )
-    mocker.patch("app.service.donor_service.get_donation", return_value=donation)
-    db.delete = mocker.AsyncMock()
-    db.commit = mocker.AsyncMock()
+    sql = str(db.execute.call_args.args[0])
+    assert "(donations.date, donations.id) < (" in sql
+    assert "ORDER BY donations.date DESC, donations.id DESC" in sql
+
+
+@pytest.mark.asyncio
+async def test_delete_donation_success(mocker):
+    db = mocker.AsyncMock()
+    db.execute.return_value = _scalar_result(mocker, 2)
     resp = await delete_donation(db, 2)
     assert resp == {"detail": "Donation deleted successfully"}
-    db.delete.assert_called_with(donation)
+    assert db.execute.call_count == 1
+    assert str(db.execute.call_args.args[0]).startswith("DELETE FROM donations")
     db.commit.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_delete_donation_not_found(mocker):
+    db = mocker.AsyncMock()
+    db.execute.return_value = _scalar_result(mocker, None)
+    with pytest.raises(HTTPException) as exc:
+        await delete_donation(db, 2)
+    assert exc.value.status_code == 404
+    db.commit.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_delete_donation_exception(mocker):
     db = mocker.AsyncMock()
-    mocker.patch(
-        "app.service.donor_service.get_donation", side_effect=Exception("fail")
-    )
+    db.execute.side_effect = Exception("fail")
     with pytest.raises(Exception):
         await delete_donation(db, 2)
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.service.loader import BatchLoader, session_loader
+
+
+def _recording_batch_fn(calls):
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        return {key: key * 10 for key in keys if key > 0}
+
+    return batch_fn
+
+
+@pytest.mark.asyncio
+async def test_loads_in_one_tick_are_batched_and_deduplicated():
+    calls = []
+    loader = BatchLoader(_recording_batch_fn(calls))
+
+    values = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+    assert values == [10, 20, 10]
+    assert calls == [[1, 2]]
+
+    assert await loader.load_many([3, -1]) == [30, None]
+    assert calls == [[1, 2], [3, -1]]
+    assert loader.batches == 2 and loader.loads == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    async def failing(keys):
+        raise RuntimeError("boom")
+
+    loader = BatchLoader(failing)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_break_the_batch():
+    calls = []
+    loader = BatchLoader(_recording_batch_fn(calls))
+    cancelled = loader.load(1)
+    kept = loader.load(2)
+    cancelled.cancel()
+    assert await kept == 20
+    assert calls == [[2]]
+
+
+def test_session_loader_is_scoped_to_the_session():
+    class Session:
+        def __init__(self):
+            self.info = {}
+
+    async def batch_fn(db, keys):
+        return {}
+
+    first, second = Session(), Session()
+    assert session_loader(first, batch_fn) is session_loader(first, batch_fn)
+    assert session_loader(first, batch_fn) is not session_loader(second, batch_fn)
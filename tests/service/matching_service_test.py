@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+
+from app.api.v1.schemas.donor_schema import VALID_BLOOD_GROUPS
+from app.db.models.donor_models import Donor
+from app.service.matching_service import (
+    BLOOD_GROUPS,
+    compatible_donor_groups,
+    find_matching_donors,
+    is_compatible,
+)
+
+
+def test_blood_groups_cover_schema_groups():
+    assert set(BLOOD_GROUPS) == VALID_BLOOD_GROUPS
+
+
+def test_universal_donor_and_recipient():
+    assert all(is_compatible("O-", recipient) for recipient in BLOOD_GROUPS)
+    assert set(compatible_donor_groups("AB+")) == VALID_BLOOD_GROUPS
+    assert compatible_donor_groups("O-") == ("O-",)
+
+
+@pytest.mark.parametrize(
+    "recipient, donors",
+    [
+        ("A+", {"O-", "O+", "A-", "A+"}),
+        ("A-", {"O-", "A-"}),
+        ("B+", {"O-", "O+", "B-", "B+"}),
+        ("AB-", {"O-", "A-", "B-", "AB-"}),
+        ("O+", {"O-", "O+"}),
+    ],
+)
+def test_compatible_donor_groups(recipient, donors):
+    assert set(compatible_donor_groups(recipient)) == donors
+    assert not is_compatible("AB+", recipient)
+
+
+@pytest.mark.asyncio
+async def test_find_matching_donors_merges_groups_by_rest(mocker):
+    a_neg_old = Donor(id=3, blood_group="A-", last_donated=datetime.date(2023, 1, 1))
+    o_neg_never = Donor(id=9, blood_group="O-", last_donated=None)
+    o_neg_old = Donor(id=4, blood_group="O-", last_donated=datetime.date(2023, 1, 1))
+    per_group = {"O-": [o_neg_never, o_neg_old], "A-": [a_neg_old]}
+
+    db = mocker.AsyncMock()
+    queried = []
+
+    async def execute(query):
+        group = query.whereclause.clauses[0].right.value
+        queried.append(group)
+        result = mocker.MagicMock()
+        result.scalars.return_value.all.return_value = per_group[group]
+        return result
+
+    db.execute.side_effect = execute
+    matches = await find_matching_donors(db, "A-", units=2)
+    assert queried == ["O-", "A-"]
+    # Ties on last_donated prefer the exact group match
+    assert matches == [o_neg_never, a_neg_old]
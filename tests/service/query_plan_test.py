@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db.query_audit import StatementRecorder, explain
+from app.db.session import Base
+from app.service.donor_service import get_eligible_donors
+from app.service.matching_service import find_matching_donors
+
+
+@pytest_asyncio.fixture
+async def plan_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'plan.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _query_plans(engine, run):
+    """Run ``run(db)`` and return the EXPLAIN QUERY PLAN of each statement."""
+    with StatementRecorder(engine.sync_engine) as recorder:
+        async with AsyncSession(engine) as db:
+            await run(db)
+    return [
+        " | ".join(await explain(engine, statement, parameters))
+        for statement, parameters in recorder.statements
+    ]
+
+
+def _assert_index_seek(plan, index):
+    assert index in plan, plan
+    assert "SCAN donors" not in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_eligible_donor_queries_seek_composite_index(plan_engine):
+    async def run(db):
+        # Null phase followed by the dated phase, then a dated-phase cursor
+        await get_eligible_donors(db, "O-", limit=10)
+        await get_eligible_donors(
+            db,
+            "O-",
+            limit=10,
+            after_last_donated=datetime.date(2024, 1, 1),
+            after_id=5,
+        )
+
+    plans = await _query_plans(plan_engine, run)
+    assert len(plans) == 3
+    for plan in plans:
+        _assert_index_seek(plan, "ix_donors_blood_group_last_donated")
+
+
+@pytest.mark.asyncio
+async def test_matching_runs_one_index_seek_per_compatible_group(plan_engine):
+    plans = await _query_plans(
+        plan_engine, lambda db: find_matching_donors(db, "A+", units=5)
+    )
+    assert len(plans) == 4
+    for plan in plans:
+        _assert_index_seek(plan, "ix_donors_blood_group_last_donated")
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.service.singleflight import SingleFlight
+
+
+def _slow(calls, result="value", gate=None):
+    async def fn():
+        calls.append(1)
+        await (gate.wait() if gate else asyncio.sleep(0.01))
+        return result
+
+    return fn
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+    results = await asyncio.gather(*(flight.do("k", _slow(calls)) for _ in range(5)))
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert flight.stats("k") == {
+        "calls": 5,
+        "executions": 1,
+        "shared": 4,
+        "errors": 0,
+        "takeovers": 0,
+    }
+    assert flight.stats()["in_flight"] == 0
+
+    # Once finished, the next call executes again
+    await flight.do("k", _slow(calls))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats("k")["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_leaves_the_call_running():
+    flight = SingleFlight("test")
+    calls, gate = [], asyncio.Event()
+    leader = asyncio.create_task(flight.do("k", _slow(calls, gate=gate)))
+    follower = asyncio.create_task(flight.do("k", _slow(calls, gate=gate)))
+    await asyncio.sleep(0)
+    follower.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+    assert await leader == "value"
+    assert follower.cancelled()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight("test")
+    calls, gate = [], asyncio.Event()
+    leader = asyncio.create_task(flight.do("k", _slow(calls, "first", gate)))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", _slow(calls, "second")))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "second"
+    assert len(calls) == 2
+    assert flight.stats("k")["takeovers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_fresh_execution():
+    flight = SingleFlight("test")
+    calls, gate = [], asyncio.Event()
+    stale = asyncio.create_task(flight.do("k", _slow(calls, "old", gate)))
+    await asyncio.sleep(0)
+    flight.forget("k")
+    fresh = asyncio.create_task(flight.do("k", _slow(calls, "new")))
+    await asyncio.sleep(0)
+    gate.set()
+    assert (await stale, await fresh) == ("old", "new")
+
+
+def test_per_key_stats_are_bounded():
+    flight = SingleFlight("test", max_tracked_keys=2)
+
+    async def run():
+        for key in ("a", "b", "c"):
+            await flight.do(key, _slow([]))
+
+    asyncio.run(run())
+    assert flight.stats("a")["calls"] == 0
+    assert flight.stats("c")["calls"] == 1
+    assert flight.stats()["calls"] == 3
@@ -0,0 +1,150 @@
+import asyncio
+import datetime
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.schemas import DonationCreate, DonationUpdate
+from app.db.models import Donation, Donor
+from app.db.session import Base
+from app.service import donor_service
+from app.service.write_queue import GroupCommitWriter
+
+
+def _donation(donor_id: int, location: str = "Drive") -> DonationCreate:
+    return DonationCreate(
+        date=datetime.date(2025, 1, 1),
+        volume_ml=450,
+        location=location,
+        hemoglobin=None,
+        pulse=None,
+        blood_pressure=None,
+        donor_id=donor_id,
+    )
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Donor).values(name="A", blood_group="O-", age=30))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _count(session_factory) -> int:
+    async with session_factory() as db:
+        return (await db.execute(select(func.count()).select_from(Donation))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_commits(session_factory):
+    writer = GroupCommitWriter(session_factory, max_batch=8, max_delay=0.01)
+    donations = await asyncio.gather(
+        *(
+            writer.submit(
+                lambda db, i=i: donor_service._insert_donation(
+                    db, 1, _donation(1, f"Drive {i}")
+                )
+            )
+            for i in range(20)
+        )
+    )
+    assert [d.location for d in donations] == [f"Drive {i}" for i in range(20)]
+    assert len({d.id for d in donations}) == 20
+    assert writer.stats.writes == 20
+    assert writer.stats.batches == 3 and writer.stats.largest_batch == 8
+    assert await _count(session_factory) == 20
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_affect_its_batch(session_factory):
+    writer = GroupCommitWriter(session_factory, max_delay=0.01)
+
+    def create(donor_id):
+        return writer.submit(
+            lambda db: donor_service._insert_donation(db, donor_id, _donation(donor_id))
+        )
+
+    def update(donation_id, version):
+        return writer.submit(
+            lambda db: donor_service._apply_locked_update(
+                db,
+                Donation,
+                donation_id,
+                DonationUpdate(**_donation(1, "Moved").model_dump(), version=version),
+                "Donation",
+            )
+        )
+
+    first = await create(1)
+    results = await asyncio.gather(
+        create(1),
+        create(999),  # no such donor
+        update(first.id, 1),
+        update(first.id, 1),  # stale once the previous update commits
+        update(12345, 1),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], Donation)
+    assert isinstance(results[1], IntegrityError)
+    assert results[2].location == "Moved" and results[2].version == 2
+    assert results[3].status_code == 409
+    assert results[4].status_code == 404
+    assert writer.stats.batches == 2 and writer.stats.failed_writes == 3
+    assert await _count(session_factory) == 2
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_commit_failure_reaches_every_caller(mocker):
+    db = mocker.AsyncMock()
+    db.commit.side_effect = RuntimeError("disk full")
+    factory = mocker.MagicMock()
+    factory.return_value.__aenter__.return_value = db
+    writer = GroupCommitWriter(factory, max_delay=0.01)
+
+    async def op(session):
+        return "ok"
+
+    results = await asyncio.gather(
+        writer.submit(op), writer.submit(op), return_exceptions=True
+    )
+    assert [str(r) for r in results] == ["disk full", "disk full"]
+    assert writer.stats.failed_commits == 1
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_close_commits_queued_writes(session_factory):
+    writer = GroupCommitWriter(session_factory, max_delay=1.0)
+    pending = asyncio.ensure_future(
+        writer.submit(lambda db: donor_service._insert_donation(db, 1, _donation(1)))
+    )
+    await asyncio.sleep(0)
+    await writer.close()
+    assert (await pending).id == 1
+    assert await _count(session_factory) == 1
+
+
+@pytest.mark.asyncio
+async def test_donation_service_routes_through_writer(session_factory, monkeypatch):
+    writer = GroupCommitWriter(session_factory, max_delay=0.001)
+    monkeypatch.setattr(donor_service, "donation_writer", writer)
+
+    donation = await donor_service.create_donation(None, 1, _donation(1))
+    assert donation.id == 1 and donation.version == 1
+
+    update = DonationUpdate(**_donation(1, "Moved").model_dump(), version=1)
+    updated = await donor_service.update_donation(None, donation.id, update)
+    assert updated.location == "Moved" and updated.version == 2
+    with pytest.raises(HTTPException) as exc:
+        await donor_service.update_donation(None, donation.id, update)
+    assert exc.value.status_code == 409
+    await writer.close()